@@ -0,0 +1,122 @@
+"""
+Greedy Agent
+------------
+
+A very cheap baseline: plays the move with the best static evaluation one
+ply ahead, without searching replies. Static exchange evaluation (SEE)
+stands in for the opponent's recaptures, so the agent doesn't drop pieces
+to a one-move reply, and moves that mate are always taken.
+
+Decisions are cached by Zobrist key of the position (least recently used
+dropped first), so positions seen before, e.g. common openings across many
+sessions, are answered with a dictionary lookup.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+
+import chess
+
+from chess_ai.core.player import Player
+from chess_ai.search.evaluation import MATE_SCORE, make_evaluator
+from chess_ai.search.position import Position
+from chess_ai.search.see import SEE_VALUES, see
+
+################
+# GREEDY AGENT #
+################
+
+def _material_gain(board: Position, move: chess.Move) -> int:
+    """What 'move' wins on the spot (captured piece, promotion), in SEE values."""
+    gain = 0
+    victim = board.piece_type_at(move.to_square)
+    if victim:
+        gain = SEE_VALUES[victim]
+    elif board.is_en_passant(move):
+        gain = SEE_VALUES[chess.PAWN]
+    if move.promotion:
+        gain += SEE_VALUES[move.promotion] - SEE_VALUES[chess.PAWN]
+    return gain
+
+class GreedyAgent(Player):
+    """One-ply evaluation plus SEE, with a per-position decision cache."""
+
+    def __init__(
+        self,
+        evaluator: str = "material",
+        use_see: bool = True,
+        cache_size: int = 2**16,
+    ):
+        """
+        Parameters
+        ----------
+        evaluator : str
+            Static evaluation: "material" or "tapered".
+        use_see : bool
+            Whether to charge each move what the opponent's best exchange
+            on its target square would cost.
+        cache_size : int
+            Number of positions whose chosen move is remembered.
+        """
+        self.evaluator = make_evaluator(evaluator)
+        self.use_see = use_see
+        self.cache_size = cache_size
+        self.cache: OrderedDict[int, chess.Move] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def cache_stats(self) -> dict[str, int | float]:
+        probes = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / probes if probes else 0.0,
+            "cached": len(self.cache),
+        }
+
+    def choose_move(self, game):
+        """Best move by one-ply evaluation (None if there are no legal moves)."""
+        position = Position.from_board(game.board)
+        key = position.key
+        cache = self.cache
+
+        move = cache.get(key)
+        if move is not None and position.is_legal(move):
+            cache.move_to_end(key)
+            self.hits += 1
+            return move
+
+        self.misses += 1
+        move = self._best_move(position)
+        if move is not None:
+            cache[key] = move
+            if len(cache) > self.cache_size:
+                cache.popitem(last=False)
+        return move
+
+    def _best_move(self, board: Position) -> chess.Move | None:
+        evaluator = self.evaluator
+        evaluator.reset(board)
+
+        best_move = None
+        best_score = None
+        for move in list(board.generate_legal_moves()):
+            penalty = 0
+            if self.use_see:
+                penalty = min(0, see(board, move) - _material_gain(board, move))
+
+            evaluator.push(board, move)
+            if next(board.generate_legal_moves(), None) is not None:
+                score = -evaluator.evaluate(board) + penalty
+            elif board.is_check():
+                score = MATE_SCORE
+            else:
+                score = 0  # stalemate
+            evaluator.pop(board)
+
+            if best_score is None or score > best_score:
+                best_move, best_score = move, score
+                if score == MATE_SCORE:
+                    break
+        return best_move
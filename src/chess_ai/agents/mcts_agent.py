@@ -0,0 +1,246 @@
+"""
+Monte Carlo Tree Search Agent
+-----------------------------
+
+Chooses moves by sampling games instead of searching every line: each
+playout walks down the tree by UCT (the best mix of average result and
+exploration bonus), adds the children of the node it ends on, plays the
+game out from there with a rollout policy and credits the result to every
+node on the way back up. The most visited root move is played.
+
+The tree lives in flat numpy arrays indexed by node number (NodePool, see
+chess_ai.search.mcts): visit counts, result sums, the move leading to the
+node and the range of its children, which are always allocated as one
+contiguous block. That keeps a node at a few dozen bytes, and lets UCT
+score all children of a node with one vectorized expression.
+
+Between moves of the same game the subtree of the position actually
+reached (after our move and the opponent's reply) is kept, compacted to
+the front of a fresh pool, so earlier playouts aren't wasted.
+
+With workers > 1 the playouts run in a process pool (see
+chess_ai.search.mcts_parallel), either on one tree in shared memory with
+virtual loss, or on one tree per worker with the root statistics merged.
+"""
+
+from __future__ import annotations
+
+import random
+import time
+
+import chess
+
+from chess_ai.core.moves import decode_move
+from chess_ai.core.player import Player
+from chess_ai.search.evaluation import make_evaluator
+from chess_ai.search.mcts import ROLLOUT_POLICIES, NodePool, playout
+from chess_ai.search.mcts_parallel import PARALLEL_MODES
+from chess_ai.search.position import Position
+from chess_ai.search.transposition import position_key
+
+##############
+# MCTS AGENT #
+##############
+
+class MonteCarloTreeSearchAgent(Player):
+    """
+    UCT Monte Carlo tree search over a flat-array tree (see NodePool), with
+    a pluggable rollout policy and a playout and/or time budget per move.
+
+    Call close() to shut the worker pool down (workers > 1) when the agent
+    is no longer needed.
+    """
+
+    def __init__(
+        self,
+        playouts: int | None = 2000,
+        time_limit_ms: int | None = None,
+        exploration: float = 1.4,
+        rollout: str = "random",
+        rollout_depth: int = 20,
+        evaluator: str = "material",
+        max_nodes: int = 2**20,
+        reuse_tree: bool = True,
+        seed: int | None = None,
+        workers: int = 1,
+        parallel: str = "tree",
+        virtual_loss: float = 1.0,
+    ):
+        """
+        Parameters
+        ----------
+        playouts : int or None
+            Playouts per move (None: only the time limit applies).
+        time_limit_ms : int or None
+            Wall-clock budget per move, in milliseconds.
+        exploration : float
+            UCT exploration constant (higher: wider, shallower trees).
+        rollout : str
+            Rollout policy: "random", "captures" (prefer captures and
+            promotions) or "eval" (score the leaf without playing on).
+        rollout_depth : int
+            Plies a rollout plays before the evaluation decides its result.
+        evaluator : str
+            Evaluation used when a rollout is cut off: "material" or "tapered".
+        max_nodes : int
+            Node pool limit; once full, leaves are rolled out without
+            being expanded.
+        reuse_tree : bool
+            Whether to keep the subtree of the new position between moves.
+        seed : int or None
+            Seed for the rollouts' random number generator.
+        workers : int
+            Number of playout processes. 1 runs playouts in-process.
+        parallel : str
+            Multi-process mode when workers > 1: "tree" (one shared tree)
+            or "root" (one tree per worker, root statistics merged; no
+            tree reuse).
+        virtual_loss : float
+            Lost visits a tree-parallel playout puts on its path while
+            running, to keep concurrent playouts apart.
+        """
+        if playouts is None and time_limit_ms is None:
+            raise ValueError("MCTS needs a playout or time budget")
+        if playouts is not None and playouts <= 0:
+            raise ValueError(f"playouts must be positive, got {playouts}")
+        if parallel not in PARALLEL_MODES:
+            raise KeyError(
+                f"Unknown parallel mode '{parallel}'. "
+                f"Available modes: {list(PARALLEL_MODES.keys())}"
+            )
+        if rollout not in ROLLOUT_POLICIES:
+            raise KeyError(
+                f"Unknown rollout policy '{rollout}'. "
+                f"Available policies: {list(ROLLOUT_POLICIES.keys())}"
+            )
+        self.playouts = playouts
+        self.time_limit_ms = time_limit_ms
+        self.exploration = exploration
+        self.rollout = ROLLOUT_POLICIES[rollout]
+        self.rollout_depth = rollout_depth
+        self.evaluator = make_evaluator(evaluator)
+        self.max_nodes = max_nodes
+        self.reuse_tree = reuse_tree
+        self.rng = random.Random(seed)
+        self.workers = max(1, workers)
+        self.parallel = parallel
+        self._pool = None
+
+        # What a worker process needs to run the same playouts
+        self.settings = {
+            "exploration": exploration,
+            "rollout": rollout,
+            "rollout_depth": rollout_depth,
+            "evaluator": evaluator,
+            "max_nodes": max_nodes,
+            "virtual_loss": virtual_loss,
+        }
+
+        self.pool: NodePool | None = None
+        self._root_key: int | None = None   # position the pool's root stands for
+        self._root_ply = 0                  # its length of the game's move stack
+
+        # Filled in by every choose_move call
+        self.last_playouts = 0
+        self.reused_visits = 0  # root visits carried over from the previous move
+        self.elapsed_ms = 0.0
+
+    def close(self) -> None:
+        """Shut down the worker pool, if one was started."""
+        if self._pool is not None:
+            self._pool.close()
+            self._pool = None
+            self.pool = None  # may live in the pool's shared memory
+
+    def choose_move(self, game):
+        """
+        Run playouts from the current position and return the most visited
+        move (None if there are no legal moves). At least one playout runs,
+        however short the time limit.
+        """
+        board = game.board
+        if board.is_game_over():
+            return None
+
+        start = time.perf_counter()
+        if self.workers > 1 and self.parallel == "root":
+            pool = NodePool(max_nodes=self.max_nodes)
+        else:
+            pool = self._reuse(board)
+        self.reused_visits = int(pool.visits[0])
+
+        if self.workers > 1:
+            if self._pool is None:
+                self._pool = PARALLEL_MODES[self.parallel](self.workers, self.max_nodes)
+            pool, done = self._pool.search(
+                board, pool, self.settings, self.playouts, self.time_limit_ms,
+                self.rng.randrange(2**32),
+            )
+        else:
+            deadline = None
+            if self.time_limit_ms is not None:
+                deadline = start + self.time_limit_ms / 1000
+
+            position = Position.from_board(board)
+            self.evaluator.reset(position)
+            done = 0
+            while self.playouts is None or done < self.playouts:
+                if done and deadline is not None and time.perf_counter() >= deadline:
+                    break
+                playout(
+                    pool, position, self.evaluator, self.rng,
+                    self.exploration, self.rollout, self.rollout_depth,
+                )
+                done += 1
+
+        self.last_playouts = done
+        self.elapsed_ms = (time.perf_counter() - start) * 1000
+        self.pool = pool
+        self._root_key = position_key(board)
+        self._root_ply = len(board.move_stack)
+
+        best = max(pool.children(0), key=lambda child: pool.visits[child])
+        return decode_move(int(pool.move[best]))
+
+    def root_stats(self) -> list[tuple[chess.Move, int, float]]:
+        """(move, visits, mean result) of every root child, most visited first."""
+        pool = self.pool
+        if pool is None:
+            return []
+        rows = [
+            (decode_move(int(pool.move[c])), int(pool.visits[c]),
+             pool.value[c] / pool.visits[c] if pool.visits[c] else 0.0)
+            for c in pool.children(0)
+        ]
+        return sorted(rows, key=lambda row: -row[1])
+
+    def _reuse(self, board: chess.Board) -> NodePool:
+        """
+        The subtree of the previous search for 'board', if the game went on
+        from the last searched position; otherwise a fresh pool.
+        """
+        pool = self.pool
+        played = board.move_stack[self._root_ply:]
+        if (
+            not self.reuse_tree
+            or pool is None
+            or len(board.move_stack) < self._root_ply
+            or len(played) > 2
+        ):
+            return NodePool(max_nodes=self.max_nodes)
+
+        previous = board.copy()
+        for _ in played:
+            previous.pop()
+        if position_key(previous) != self._root_key:
+            return NodePool(max_nodes=self.max_nodes)
+
+        node = 0
+        for move in played:
+            node = pool.child_for(node, move)
+            if node is None:
+                return NodePool(max_nodes=self.max_nodes)
+        if pool.first_child[node] >= 0 and not pool.child_count[node]:
+            # Expanded as a drawn leaf (see playout), searched afresh as a root
+            return NodePool(max_nodes=self.max_nodes)
+        return pool.subtree(node) if node else pool
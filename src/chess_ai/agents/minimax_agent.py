@@ -1,50 +1,205 @@
+import logging
 import math
+import os
+import time
+from typing import Callable, NamedTuple
+
 import chess
 
 from chess_ai.core.player import Player
+from chess_ai.search.book import OpeningBook
+from chess_ai.search.evaluation import (
+    MATE_SCORE,
+    PIECE_VALUES,
+    IncrementalEvaluator,
+    child_bitboards,
+    evaluate_board,
+    make_evaluator,
+)
+from chess_ai.search.movegen import noisy_moves, staged_moves
+from chess_ai.search.ordering import MoveOrderer, mvv_lva
+from chess_ai.search.parallel import PARALLEL_MODES, LazySMP
+from chess_ai.search.position import Position
+from chess_ai.search.see import see
+from chess_ai.search.tablebase import TablebaseProber, tb_score
+from chess_ai.search.transposition import (
+    EXACT,
+    LOWER,
+    UPPER,
+    TranspositionTable,
+    position_key,
+)
+
+###############
+# CORE SEARCH #
+###############
+
+MAX_PLY = 64  # hard cap on search depth (sizes the PV table)
+QUIESCENCE_MAX_PLY = 16  # hard cap on capture sequences
+DELTA_MARGIN = 200  # slack for positional gains in delta pruning
+STOP_POLL_NODES = 256  # how often an external stop signal is checked
+ASPIRATION_MAX = 1000  # aspiration windows wider than this open up fully
 
-############################
-# BASIC EVALUATION HELPERS #
-############################
+# Selective search
+NULL_MOVE_MIN_DEPTH = 3  # null-move pruning only this far from the horizon
+LMR_MIN_DEPTH = 3  # late move reductions only this far from the horizon
+LMR_MIN_MOVES = 3  # moves searched at full depth before reducing
+FUTILITY_MARGINS = (0, 200, 500)  # by depth: quiet moves can't gain more
+RAZOR_MARGINS = (0, 300, 550)  # by depth: hopeless nodes drop to quiescence
 
-# Centipawn values (standard-ish)
-PIECE_VALUES = {
-    chess.PAWN:   100,
-    chess.KNIGHT: 320,
-    chess.BISHOP: 330,
-    chess.ROOK:   500,
-    chess.QUEEN:  900,
-    chess.KING:   0,   # king value handled via mate, not material
-}
+# Scores beyond this are "mate in N": MATE_SCORE minus the ply of the mate
+MATE_THRESHOLD = MATE_SCORE - 2 * MAX_PLY
 
-MATE_SCORE = 100_000 # "infinite" score in Centipawns
+logger = logging.getLogger(__name__)
 
-def evaluate_board(board: chess.Board) -> int:
+class SearchAborted(Exception):
+    """Raised inside the search when its time or node budget runs out."""
+
+class SearchContext:
     """
-    Evaluation from the perspective of the side to move.
-    Positive = good for the side to move.
-    Negative = good for the opponent.
+    Mutable state shared by every node of one search:
+    - the incremental evaluator tracking the searched board (and whether
+      depth-1 nodes score their children in one batch),
+    - the transposition table and move orderer (both optional),
+    - node counters (main search and quiescence) and time/node budget,
+    - how many beta cutoffs there were, and how many of them came from the
+      first move searched (a measure of move ordering quality),
+    - principal variation (PV) bookkeeping,
+    - whether non-PV moves get a null-window search first (PVS), and how
+      often those searches (and aspiration windows) had to be redone,
+    - which selective-search techniques are on (null-move pruning, late
+      move reductions, futility pruning and razoring) and how often each
+      one fired,
+    - whether moves are generated in stages (see chess_ai.search.movegen),
+    - the endgame tablebase prober (optional) and how often it settled a node.
+
+    Budgets are only enforced while 'can_abort' is set, so the caller can
+    guarantee that at least one iteration runs to completion. 'should_stop'
+    is an optional external stop signal (e.g. from another process), polled
+    every STOP_POLL_NODES nodes.
     """
 
-    # Only treat checkmate specially
-    if board.is_checkmate():
-        # side to move is checkmated → terrible
-        return -MATE_SCORE
-
-    # Otherwise, just use material (even if it's stalemate-ish/illegal)
-    score = 0
-    for piece_type, value in PIECE_VALUES.items():
-        score += value * (
-            len(board.pieces(piece_type, chess.WHITE))
-            - len(board.pieces(piece_type, chess.BLACK))
-        )
+    # Search statistics besides nodes and qnodes, copied onto the agent
+    COUNTERS = (
+        "null_window_searches",
+        "pvs_researches",
+        "aspiration_researches",
+        "null_move_cutoffs",
+        "reduced_searches",
+        "lmr_researches",
+        "futility_prunes",
+        "razor_cutoffs",
+        "beta_cutoffs",
+        "first_move_cutoffs",
+        "tb_hits",
+    )
 
-    # Normalize for side to move
-    return score if board.turn == chess.WHITE else -score
+    def __init__(
+        self,
+        tt: TranspositionTable | None = None,
+        deadline: float | None = None,
+        node_limit: int | None = None,
+        orderer: MoveOrderer | None = None,
+        evaluator: IncrementalEvaluator | None = None,
+        batch_leaves: bool = False,
+        should_stop: Callable[[], bool] | None = None,
+        pvs: bool = False,
+        null_move: bool = False,
+        lmr: bool = False,
+        futility: bool = False,
+        staged: bool = False,
+        tablebase: TablebaseProber | None = None,
+    ):
+        self.tt = tt
+        self.orderer = orderer
+        self.evaluator = evaluator or IncrementalEvaluator()
+        self.batch_leaves = batch_leaves
+        self.deadline = deadline      # time.perf_counter() value, or None
+        self.node_limit = node_limit
+        self.should_stop = should_stop
+        self.can_abort = False
+        self.nodes = 0
+        self.qnodes = 0
 
-###############
-# CORE SEARCH #
-###############
+        self.pvs = pvs
+        self.null_move = null_move
+        self.lmr = lmr
+        self.futility = futility
+        self.staged = staged
+        self.tablebase = tablebase
+        for name in self.COUNTERS:
+            setattr(self, name, 0)
+
+        # Triangular PV table: pv[ply] is the best line found from 'ply' on
+        self.pv: list[list[chess.Move]] = [[] for _ in range(MAX_PLY + 1)]
+        # PV of the previous iteration, used to order moves along it
+        self.prev_pv: list[chess.Move] = []
+        self.follow_pv = False
+
+    def count_node(self) -> None:
+        """Count a visited node and abort the search if the budget is spent."""
+        self.nodes += 1
+        if self.can_abort:
+            self._check_budget()
+
+    def count_qnode(self) -> None:
+        """Count a visited quiescence node and abort if the budget is spent."""
+        self.qnodes += 1
+        if self.can_abort:
+            self._check_budget()
+
+    def _check_budget(self) -> None:
+        # The node budget covers both kinds of nodes
+        if (
+            self.node_limit is not None
+            and self.nodes + self.qnodes >= self.node_limit
+        ):
+            raise SearchAborted
+        if self.deadline is not None and time.perf_counter() >= self.deadline:
+            raise SearchAborted
+        if (
+            self.should_stop is not None
+            and not (self.nodes + self.qnodes) % STOP_POLL_NODES
+            and self.should_stop()
+        ):
+            raise SearchAborted
+
+    @classmethod
+    def for_board(cls, board: chess.Board) -> "SearchContext":
+        """Default context with its evaluator synced to 'board'."""
+        ctx = cls()
+        ctx.evaluator.reset(board)
+        return ctx
+
+    def pv_hint(self, ply: int) -> chess.Move | None:
+        """Previous iteration's move at 'ply', while still walking along that PV."""
+        if self.follow_pv and ply < len(self.prev_pv):
+            return self.prev_pv[ply]
+        self.follow_pv = False
+        return None
+
+def _is_draw(board: chess.Board) -> bool:
+    """Draws the search scores as 0 without looking at the moves."""
+    return (
+        board.halfmove_clock >= 100
+        or board.is_insufficient_material()
+        or board.is_repetition(3)
+    )
+
+def _value_to_tt(value: float, ply: int) -> float:
+    """Mate scores are stored relative to the stored node, not the root."""
+    if value >= MATE_THRESHOLD:
+        return value + ply
+    if value <= -MATE_THRESHOLD:
+        return value - ply
+    return value
+
+def _value_from_tt(value: float, ply: int) -> float:
+    if value >= MATE_THRESHOLD:
+        return value - ply
+    if value <= -MATE_THRESHOLD:
+        return value + ply
+    return value
 
 def negamax(
     board: chess.Board,
@@ -53,84 +208,450 @@ def negamax(
     beta: int,
     use_alpha_beta: bool,
     use_quiescence: bool,
+    ctx: SearchContext | None = None,
+    ply: int = 0,
 ) -> int:
     """
     Negamax search with optional alpha-beta pruning.
 
+    If the context holds a transposition table, positions already searched
+    to at least 'depth' are answered from it (within the current window).
+    If it holds a move orderer, moves are searched hash move (or previous
+    PV move) first, then captures, promotions, killers and history order;
+    otherwise in generator order. With ctx.staged the moves come from
+    staged_moves(), so a cutoff by an early move skips generating the
+    quiet moves.
+
+    With ctx.pvs (principal variation search), every move after the first
+    is searched with a null window (alpha, alpha + 1) that only proves it
+    is no better than alpha; it is searched again with the full window
+    when it turns out better.
+
+    Selective search, each enabled on the context:
+    - null-move pruning: if passing the move still fails high on a reduced
+      search, so will a real move (not in check, not with only king and
+      pawns, where passing may be the best move: zugzwang),
+    - late move reductions: late quiet moves are searched shallower first,
+      and again at full depth only if they beat alpha,
+    - futility pruning: near the horizon, quiet moves are skipped when the
+      static evaluation is too far below alpha for them to catch up,
+    - razoring: near the horizon, hopeless nodes are settled by a
+      quiescence search (only with use_quiescence).
+
+    With a tablebase on the context, positions right after a capture or
+    pawn move with few enough pieces are scored from the WDL tables.
+
+    Leaves are scored by the context's incremental evaluator, except that
+    a leaf in check with no evasions is mate. Otherwise checkmate and
+    stalemate are discovered when a node has no legal moves; mates score MATE_SCORE minus the distance from the root, so shorter
+    mates are preferred.
+
+    Raises SearchAborted if the context's budget runs out.
+
     Returns an evaluation from the perspective of the side to move
     at 'board'.
     """
+    if ctx is None:
+        ctx = SearchContext.for_board(board)
+
+    ctx.count_node()
+    ctx.pv[ply] = []
 
-    # Depth or terminal node -> static evaluation
-    if depth == 0 or board.is_game_over():
-        if use_quiescence and not board.is_game_over():
-            return quiescence(board, alpha, beta)
-        return evaluate_board(board)
+    if ply and _is_draw(board):
+        return 0
+
+    # Horizon -> static evaluation
+    if depth <= 0 or ply >= MAX_PLY:
+        if use_quiescence:
+            return quiescence(board, alpha, beta, ctx, ply)
+        # Mated at the horizon (only positions in check need the move test)
+        if board.is_check() and next(board.generate_legal_moves(), None) is None:
+            return -MATE_SCORE + ply
+        return ctx.evaluator.evaluate(board)
+
+    alpha_orig = alpha
+    hash_move = None
+    tt = ctx.tt
+
+    if tt is not None:
+        key = position_key(board)
+        entry = tt.probe(key)
+        if entry is not None:
+            hash_move = entry.move
+            if entry.depth >= depth and not ctx.follow_pv:
+                value = _value_from_tt(entry.value, ply)
+                if entry.flag == EXACT:
+                    return value
+                # Bounds are only meaningful when the window is respected
+                if use_alpha_beta:
+                    if entry.flag == LOWER and value >= beta:
+                        return value
+                    if entry.flag == UPPER and value <= alpha:
+                        return value
+
+    prober = ctx.tablebase
+    if prober is not None and board.halfmove_clock == 0 and prober.can_probe(board):
+        wdl = prober.probe_wdl(board)
+        if wdl is not None:
+            ctx.tb_hits += 1
+            return tb_score(wdl, ply)
 
     best_value = -math.inf
+    best_move = None
 
-    for move in board.legal_moves:
-        board.push(move)
-        value = -negamax(
+    in_check = board.is_check()
+    orderer = ctx.orderer
+    evaluator = ctx.evaluator
+
+    # Selective search: only in quiet positions away from mate scores,
+    # and not while re-walking the previous PV
+    futile = False
+    if (
+        use_alpha_beta
+        and ply
+        and not in_check
+        and not ctx.follow_pv
+        and -MATE_THRESHOLD < alpha
+        and beta < MATE_THRESHOLD
+    ):
+        static_eval = evaluator.evaluate(board)
+
+        if (
+            ctx.null_move
+            and depth >= NULL_MOVE_MIN_DEPTH
+            and static_eval >= beta
+            and board.peek()  # no two null moves in a row
+            and board.occupied_co[board.turn] & ~(board.pawns | board.kings)
+        ):
+            reduction = 3 if depth >= 6 else 2
+            evaluator.push(board, chess.Move.null())
+            value = -negamax(
+                board,
+                depth - 1 - reduction,
+                -beta,
+                -beta + 1,
+                use_alpha_beta,
+                use_quiescence,
+                ctx,
+                ply + 1,
+            )
+            evaluator.pop(board)
+            if value >= beta:
+                ctx.null_move_cutoffs += 1
+                return beta
+
+        if depth < len(FUTILITY_MARGINS):
+            if (
+                ctx.futility
+                and use_quiescence
+                and static_eval + RAZOR_MARGINS[depth] <= alpha
+            ):
+                value = quiescence(board, alpha, alpha + 1, ctx, ply)
+                if value <= alpha:
+                    ctx.razor_cutoffs += 1
+                    return value
+            futile = ctx.futility and static_eval + FUTILITY_MARGINS[depth] <= alpha
+
+    batch = ctx.batch_leaves and depth == 1 and not use_quiescence and board.halfmove_clock < 99
+
+    if orderer is not None and ctx.staged and not batch:
+        moves = staged_moves(board, orderer, ply, ctx.pv_hint(ply) or hash_move)
+    else:
+        moves = list(board.legal_moves)
+        if batch and moves:
+            best_value, best_move = _search_frontier(board, moves, ctx, ply)
+            if use_alpha_beta and best_value >= beta and orderer is not None:
+                orderer.record_cutoff(board, best_move, depth, ply)
+            if tt is not None:
+                flag = _tt_flag(best_value, alpha_orig, beta, use_alpha_beta)
+                tt.store(key, depth, flag, _value_to_tt(best_value, ply), best_move)
+            return best_value
+        if orderer is not None:
+            moves = orderer.order(board, moves, ply, ctx.pv_hint(ply) or hash_move)
+
+    for i, move in enumerate(moves):
+        quiet = not move.promotion and not board.is_capture(move)
+        evaluator.push(board, move)
+
+        reduction = 0
+        if quiet and i and not in_check and not board.is_check():
+            if futile:
+                evaluator.pop(board)
+                ctx.futility_prunes += 1
+                continue
+            if ctx.lmr and depth >= LMR_MIN_DEPTH and i >= LMR_MIN_MOVES:
+                reduction = 2 if depth >= 6 and i >= 2 * LMR_MIN_MOVES else 1
+
+        value = _search_child(
             board,
             depth - 1,
-            -beta,
-            -alpha,
+            alpha,
+            beta,
             use_alpha_beta,
             use_quiescence,
+            ctx,
+            ply + 1,
+            i,
+            reduction,
         )
-        board.pop()
+        evaluator.pop(board)
+        # Only the first move searched can lie on the previous PV
+        ctx.follow_pv = False
 
         if value > best_value:
             best_value = value
+            best_move = move
+            ctx.pv[ply] = [move] + ctx.pv[ply + 1]
 
         if use_alpha_beta:
             if value > alpha:
                 alpha = value
             if alpha >= beta:
+                ctx.beta_cutoffs += 1
+                if not i:
+                    ctx.first_move_cutoffs += 1
+                if orderer is not None:
+                    orderer.record_cutoff(board, move, depth, ply)
                 break  # alpha-beta cutoff
 
+    if best_move is None:
+        # No legal moves: checkmate or stalemate
+        return -MATE_SCORE + ply if in_check else 0
+
+    if tt is not None:
+        flag = _tt_flag(best_value, alpha_orig, beta, use_alpha_beta)
+        tt.store(key, depth, flag, _value_to_tt(best_value, ply), best_move)
+
     return best_value
 
+def _search_child(
+    board: chess.Board,
+    depth: int,
+    alpha: float,
+    beta: float,
+    use_alpha_beta: bool,
+    use_quiescence: bool,
+    ctx: SearchContext,
+    ply: int,
+    index: int,
+    reduction: int = 0,
+) -> float:
+    """
+    Score the move just pushed on 'board' (the 'index'-th move searched at
+    its parent) from the parent's perspective, within the parent's window.
 
-def quiescence(board: chess.Board, alpha: int, beta: int) -> int:
+    A move with a 'reduction' is first searched that many plies shallower
+    with a null window, and only searched normally if it beats alpha.
     """
-    Simple quiescence search stub.
+    if reduction and use_alpha_beta:
+        ctx.reduced_searches += 1
+        value = -negamax(
+            board,
+            depth - reduction,
+            -alpha - 1,
+            -alpha,
+            use_alpha_beta,
+            use_quiescence,
+            ctx,
+            ply,
+        )
+        if value <= alpha:
+            return value
+        ctx.lmr_researches += 1
+
+    if index and ctx.pvs and use_alpha_beta and beta - alpha > 1:
+        ctx.null_window_searches += 1
+        value = -negamax(
+            board, depth, -alpha - 1, -alpha, use_alpha_beta, use_quiescence, ctx, ply
+        )
+        if not alpha < value < beta:
+            return value
+        ctx.pvs_researches += 1
+
+    return -negamax(
+        board, depth, -beta, -alpha, use_alpha_beta, use_quiescence, ctx, ply
+    )
+
+def _tt_flag(value: float, alpha_orig: float, beta: float, use_alpha_beta: bool) -> int:
+    """Which kind of bound 'value' is, given the window it was searched with."""
+    if not use_alpha_beta:
+        return EXACT  # nothing was pruned
+    if value <= alpha_orig:
+        return UPPER
+    if value >= beta:
+        return LOWER
+    return EXACT
+
+def _search_frontier(
+    board: chess.Board,
+    moves: list[chess.Move],
+    ctx: SearchContext,
+    ply: int,
+) -> tuple[int, chess.Move]:
+    """
+    Depth-1 node with batched leaf evaluation: every child is scored in one
+    evaluate_batch call on bitboards derived from the parent, without
+    pushing the moves.
+
+    All children are scored, so the result is exact even when alpha-beta
+    would have cut off. Unlike the move-by-move path, repetitions at the
+    leaves are not detected (the caller skips this path near the
+    fifty-move limit).
+    """
+    ctx.nodes += len(moves)
+    ctx.follow_pv = False
+
+    scores = ctx.evaluator.evaluate_batch(child_bitboards(board, moves))
+    # Children have the opponent to move: negate White-positive scores for
+    # White's moves, keep them for Black's
+    if board.turn == chess.WHITE:
+        best = int(scores.argmax())
+        best_value = int(scores[best])
+    else:
+        best = int(scores.argmin())
+        best_value = -int(scores[best])
+
+    best_move = moves[best]
+    ctx.pv[ply] = [best_move]
+    return best_value, best_move
+
+def quiescence(
+    board: chess.Board,
+    alpha: int,
+    beta: int,
+    ctx: SearchContext | None = None,
+    ply: int = 0,
+    qply: int = 0,
+) -> int:
+    """
+    Capture-only search run at the horizon, so the static evaluation is
+    only ever taken in quiet positions.
+
+    - stand pat: the side to move may decline every capture,
+    - only captures and promotions are searched (all evasions when in check),
+    - captures that lose material by static exchange evaluation are skipped,
+    - delta pruning: skip captures that can't lift the score to alpha even
+      if the captured piece comes for free,
+    - the capture sequence is cut off after QUIESCENCE_MAX_PLY plies.
 
-    For now, this is extremely basic: it just evaluates the current board.
-    Later, you can extend it to:
-      - stand pat
-      - consider only capture moves
-      - extend noisy positions
+    Nodes are counted in ctx.qnodes, separately from main-search nodes.
     """
+    if ctx is None:
+        ctx = SearchContext.for_board(board)
+    ctx.count_qnode()
 
-    stand_pat = evaluate_board(board)
+    evaluator = ctx.evaluator
+    in_check = board.is_check()
 
-    if stand_pat >= beta:
-        return beta
-    if stand_pat > alpha:
-        alpha = stand_pat
+    if in_check:
+        # No standing pat in check: every evasion has to be tried
+        moves = list(board.legal_moves)
+        if not moves:
+            return -MATE_SCORE + ply
+        if qply >= QUIESCENCE_MAX_PLY:
+            return evaluator.evaluate(board)
+        stand_pat = -math.inf
+    else:
+        stand_pat = evaluator.evaluate(board)
+        if stand_pat >= beta:
+            return beta
+        if stand_pat > alpha:
+            alpha = stand_pat
+        if qply >= QUIESCENCE_MAX_PLY:
+            return alpha
+        moves = noisy_moves(board)
+
+    moves.sort(key=lambda m: mvv_lva(board, m), reverse=True)
+
+    for move in moves:
+        if not in_check:
+            victim = board.piece_type_at(move.to_square)
+            gain = PIECE_VALUES[victim] if victim else 0
+            if board.is_en_passant(move):
+                gain = PIECE_VALUES[chess.PAWN]
+            if move.promotion:
+                gain += PIECE_VALUES[move.promotion] - PIECE_VALUES[chess.PAWN]
+
+            if stand_pat + gain + DELTA_MARGIN <= alpha:
+                continue  # delta pruning
+            if gain and see(board, move) < 0:
+                continue  # losing exchange
+
+        evaluator.push(board, move)
+        score = -quiescence(board, -beta, -alpha, ctx, ply + 1, qply + 1)
+        evaluator.pop(board)
+
+        if score >= beta:
+            return beta
+        if score > alpha:
+            alpha = score
 
-    # Basic stub: we don't yet search captures, but the structure is here.
-    # You can later add:
-    #   for move in board.legal_moves:
-    #       if board.is_capture(move):
-    #           ...
-    #
-    # For now, just return the static eval.
     return alpha
 
 #################
 # MINIMAX AGENT #
 #################
 
+class SearchStats(NamedTuple):
+    """What one MinimaxAgent.search() call did."""
+    value: float | None     # score of the chosen move, side to move's view
+    depth: int              # deepest completed iteration
+    nodes: int
+    qnodes: int
+    elapsed_ms: float
+    tt_hit_rate: float      # probes that found an entry, this search only
+    first_move_cutoff_rate: float  # beta cutoffs caused by the first move tried
+    pv: tuple[chess.Move, ...]
+    book: bool = False      # the move came from the opening book, unsearched
+    tablebase: bool = False  # the move came from the tablebases, unsearched
+
+    @property
+    def nps(self) -> float:
+        """Nodes (main search plus quiescence) per second."""
+        return (self.nodes + self.qnodes) / self.elapsed_ms * 1000 if self.elapsed_ms else 0.0
+
+    def as_dict(self) -> dict:
+        """JSON-friendly copy (moves as UCI strings), e.g. for structured logs."""
+        return {
+            **self._asdict(),
+            "nps": self.nps,
+            "pv": [move.uci() for move in self.pv],
+        }
+
 class MinimaxAgent(Player):
     """
     Classical search-based agent using negamax with optional alpha-beta
     pruning and quiescence search.
 
-    The evaluation is purely material-based for now and is always
-    from the perspective of the side to move.
+    The evaluation is material-only by default, or tapered piece-square
+    tables with evaluator="tapered", and is always from the perspective of
+    the side to move.
+
+    Search results are cached in a transposition table that lives as long
+    as the agent, so positions seen on earlier moves are reused too.
+
+    Moves are found by iterative deepening (depth 1, 2, ...), each iteration
+    searching the previous iteration's principal variation first (when move
+    ordering is on). With a
+    time or node budget the agent keeps deepening until the budget runs out
+    and plays the best move of the last completed iteration. From the
+    second iteration on the root is searched with an aspiration window
+    around the previous score, widened and re-searched when the score falls
+    outside it.
+
+    With workers > 1 the search runs in a process pool (see
+    chess_ai.search.parallel), either Lazy SMP style (every worker searches
+    the same root, sharing a transposition table in shared memory) or by
+    splitting the root moves across workers. Call close() to shut the pool
+    down when the agent is no longer needed.
+
+    With an opening book, book positions are answered from the book
+    without searching; with Syzygy tablebases, so are endgames covered by
+    them (and the search scores positions it reaches in them).
+
+    search() returns the move together with a SearchStats summary (also
+    kept as last_stats, logged at DEBUG level on this module's logger and
+    passed to the optional on_search callback).
     """
 
     def __init__(
@@ -138,20 +659,239 @@ class MinimaxAgent(Player):
         depth: int = 2,
         use_alpha_beta: bool = True,
         use_quiescence: bool = False,
+        use_transposition_table: bool = True,
+        tt_size: int = 2**18,
+        time_limit_ms: int | None = None,
+        node_limit: int | None = None,
+        max_depth: int = MAX_PLY,
+        use_move_ordering: bool = True,
+        evaluator: str = "material",
+        batch_leaf_eval: bool = False,
+        workers: int = 1,
+        parallel: str = "lazy_smp",
+        use_pvs: bool = True,
+        aspiration_window: int | None = 50,
+        use_null_move: bool = True,
+        use_lmr: bool = True,
+        use_futility: bool = True,
+        use_bitboard_position: bool = True,
+        use_staged_movegen: bool = True,
+        on_search: Callable[[SearchStats], None] | None = None,
+        book: str | None = None,
+        book_weighted: bool = True,
+        tablebase: str | TablebaseProber | None = None,
+        tablebase_pieces: int | None = None,
+        tablebase_cache: int = 2**16,
     ):
         """
         Parameters
         ----------
         depth : int
-            Search depth in plies (half-moves).
+            Search depth in plies (half-moves). Ignored when a time or
+            node budget is given.
         use_alpha_beta : bool
             Whether to enable alpha-beta pruning.
         use_quiescence : bool
-            Whether to use the (very simple) quiescence stub at depth=0.
+            Whether to resolve captures with a quiescence search at depth=0.
+        use_transposition_table : bool
+            Whether to cache search results by Zobrist hash.
+        tt_size : int
+            Maximum number of transposition table entries (rounded down
+            to a power of two).
+        time_limit_ms : int or None
+            Wall-clock budget per move, in milliseconds.
+        node_limit : int or None
+            Budget of searched nodes per move.
+        max_depth : int
+            Deepest iteration to try when a budget is given.
+        use_move_ordering : bool
+            Whether to sort moves (hash/PV move, MVV-LVA captures,
+            promotions, killers, history) instead of using generator order.
+        evaluator : str
+            Leaf evaluation: "material" or "tapered" (middlegame/endgame
+            piece-square tables).
+        batch_leaf_eval : bool
+            Whether depth-1 nodes score all their children with one
+            vectorized evaluation instead of pushing each move (only
+            without quiescence, which needs to search the children).
+        workers : int
+            Number of search processes. 1 searches in-process.
+        parallel : str
+            Multi-process mode when workers > 1: "lazy_smp" or "root_split".
+        use_pvs : bool
+            Whether to use principal variation search (null-window searches
+            for every move but the first; needs alpha-beta).
+        aspiration_window : int or None
+            Half-width of the root window around the previous iteration's
+            score, in centipawns. None searches every iteration with a full
+            window.
+        use_null_move : bool
+            Whether to prune nodes where passing still fails high
+            (null-move pruning; needs alpha-beta).
+        use_lmr : bool
+            Whether to search late quiet moves with reduced depth first
+            (late move reductions; needs alpha-beta).
+        use_futility : bool
+            Whether to skip quiet moves near the horizon that can't reach
+            alpha (futility pruning) and, with quiescence, settle hopeless
+            nodes there by quiescence search (razoring). Needs alpha-beta.
+        use_bitboard_position : bool
+            Whether to search on a lean Position (integer bitboards,
+            make/unmake, incremental Zobrist key) converted from the game
+            board once per move, instead of a copy of the chess.Board.
+        use_staged_movegen : bool
+            Whether nodes generate their moves in stages (hash move,
+            captures, killers, quiets) as the search asks for them, instead
+            of all at once (needs move ordering).
+        on_search : callable or None
+            Called with the SearchStats of every search, e.g. to feed a
+            monitoring system.
+        book : str or None
+            Path of a Polyglot opening book (see chess_ai.search.book) to
+            play from before searching.
+        book_weighted : bool
+            Whether to pick among book moves at random in proportion to
+            their weights, instead of always the most played one.
+        tablebase : str, TablebaseProber or None
+            Directory of Syzygy tablebase files (or a prober over them;
+            with workers > 1 only a directory, which each worker opens).
+        tablebase_pieces : int or None
+            Only probe positions with at most this many pieces (default:
+            the largest tables found).
+        tablebase_cache : int
+            Number of WDL probe results to keep (least recently used are
+            dropped first).
         """
+        if tablebase is not None and not isinstance(tablebase, (str, os.PathLike)):
+            if workers > 1:
+                raise ValueError(
+                    "With workers > 1, pass the tablebase directory so each "
+                    "worker process can open its own prober"
+                )
+        elif tablebase is not None:
+            tablebase = os.fspath(tablebase)
+
+        # Settings a worker process needs to rebuild an equivalent agent
+        self.search_kwargs = {
+            "depth": depth,
+            "use_alpha_beta": use_alpha_beta,
+            "use_quiescence": use_quiescence,
+            "time_limit_ms": time_limit_ms,
+            "node_limit": node_limit,
+            "max_depth": max_depth,
+            "use_move_ordering": use_move_ordering,
+            "evaluator": evaluator,
+            "batch_leaf_eval": batch_leaf_eval,
+            "use_pvs": use_pvs,
+            "aspiration_window": aspiration_window,
+            "use_null_move": use_null_move,
+            "use_lmr": use_lmr,
+            "use_futility": use_futility,
+            "use_bitboard_position": use_bitboard_position,
+            "use_staged_movegen": use_staged_movegen,
+            "tablebase": tablebase,
+            "tablebase_pieces": tablebase_pieces,
+            "tablebase_cache": tablebase_cache,
+        }
+
         self.depth = depth
         self.use_alpha_beta = use_alpha_beta
         self.use_quiescence = use_quiescence
+        self.workers = max(1, workers)
+        if parallel not in PARALLEL_MODES:
+            raise KeyError(
+                f"Unknown parallel mode '{parallel}'. "
+                f"Available modes: {list(PARALLEL_MODES.keys())}"
+            )
+        self.parallel = parallel
+        self.tt_size = tt_size
+        self.tt = None
+        if use_transposition_table and self.workers == 1:
+            self.tt = TranspositionTable(tt_size)
+        self._pool = None
+        self.time_limit_ms = time_limit_ms
+        self.node_limit = node_limit
+        self.max_depth = min(max_depth, MAX_PLY)
+        self.orderer = MoveOrderer(MAX_PLY) if use_move_ordering else None
+        self.evaluator = make_evaluator(evaluator)
+        self.batch_leaf_eval = batch_leaf_eval
+        self.use_pvs = use_pvs
+        self.aspiration_window = aspiration_window if use_alpha_beta else None
+        self.use_null_move = use_null_move
+        self.use_lmr = use_lmr
+        self.use_futility = use_futility
+        self.use_bitboard_position = use_bitboard_position
+        self.use_staged_movegen = use_staged_movegen
+        self.on_search = on_search
+        self.book = OpeningBook(book) if book is not None else None
+        self.book_weighted = book_weighted
+        if isinstance(tablebase, TablebaseProber) or tablebase is None:
+            self.tablebase = tablebase
+        else:
+            self.tablebase = TablebaseProber(tablebase, tablebase_pieces, tablebase_cache)
+
+        # Filled in by every choose_move call
+        self.last_stats: SearchStats | None = None
+        self.completed_depth = 0
+        # One entry per completed iteration: depth, nodes and qnodes so
+        # far, and milliseconds since the search started
+        self.iterations: list[dict[str, int | float]] = []
+        self.pv: list[chess.Move] = []
+        self.nodes = 0
+        self.qnodes = 0
+        for name in SearchContext.COUNTERS:
+            setattr(self, name, 0)
+
+    def tt_stats(self) -> dict[str, int | float]:
+        """
+        Transposition table counters (hits, misses, collisions, stores,
+        hit_rate, used, capacity). Empty if the table is disabled.
+        """
+        return self.tt.stats() if self.tt is not None else {}
+
+    def research_stats(self) -> dict[str, int | float]:
+        """
+        How often the last search had to redo work: null-window searches
+        and how many of them were re-searched with a full window (and
+        the rate), aspiration window failures at the root, and reduced
+        (late move) searches that had to be repeated at full depth.
+        """
+        return {
+            "null_window_searches": self.null_window_searches,
+            "pvs_researches": self.pvs_researches,
+            "pvs_research_rate": (
+                self.pvs_researches / self.null_window_searches
+                if self.null_window_searches else 0.0
+            ),
+            "aspiration_researches": self.aspiration_researches,
+            "reduced_searches": self.reduced_searches,
+            "lmr_researches": self.lmr_researches,
+        }
+
+    def pruning_stats(self) -> dict[str, int]:
+        """How often each forward-pruning technique cut the last search short."""
+        return {
+            "null_move_cutoffs": self.null_move_cutoffs,
+            "futility_prunes": self.futility_prunes,
+            "razor_cutoffs": self.razor_cutoffs,
+        }
+
+    def close(self) -> None:
+        """Shut down the worker pool, if one was started, and close the book and tablebases."""
+        if self._pool is not None:
+            self._pool.close()
+            self._pool = None
+        if self.book is not None:
+            self.book.close()
+            self.book = None
+        if self.tablebase is not None:
+            self.tablebase.close()
+            self.tablebase = None
+
+    @property
+    def time_managed(self) -> bool:
+        """True if the search is bounded by a time or node budget rather than depth."""
+        return self.time_limit_ms is not None or self.node_limit is not None
 
     def choose_move(self, game):
         """
@@ -162,40 +902,337 @@ class MinimaxAgent(Player):
         move : chess.Move or None
             move: the chosen move (or None if no legal moves)
         """
+        move, _ = self.search(game)
+        return move
+
+    def search(self, game) -> tuple[chess.Move | None, SearchStats]:
+        """
+        Search the current position like choose_move, and also return a
+        SearchStats summary of the search.
+        """
+        start = time.perf_counter()
         board = game.board
+        tt_probes = (self.tt.hits, self.tt.misses) if self.tt is not None else (0, 0)
 
         legal_moves = list(board.legal_moves)
-        if not legal_moves:
-            # No legal moves (checkmate or stalemate)
-            # Evaluate the position directly.
-            value = evaluate_board(board)
-            return None, value
+        book_move = tb_root = None
+        if legal_moves and self.book is not None:
+            book_move = self.book.choose(board, self.book_weighted)
+        if legal_moves and book_move is None and self.tablebase is not None:
+            tb_root = self.tablebase.root_move(board)
+
+        if not legal_moves or book_move is not None or tb_root is not None:
+            # No legal moves (checkmate or stalemate): evaluate the position
+            # directly. Book or tablebase move: play it without searching.
+            if tb_root is not None:
+                move, value = tb_root[0], tb_score(tb_root[1])
+            else:
+                move = book_move
+                value = None if book_move is not None else evaluate_board(board)
+            self.completed_depth = self.nodes = self.qnodes = 0
+            self.pv = [move] if move is not None else []
+            for name in SearchContext.COUNTERS:
+                setattr(self, name, 0)
+        elif self.workers > 1:
+            if self._pool is None:
+                if self.parallel == "lazy_smp":
+                    self._pool = LazySMP(self.workers, self.tt_size)
+                else:
+                    self._pool = PARALLEL_MODES[self.parallel](self.workers)
+                self.tt = self._pool.tt
+            result = self._pool.search(board, self.search_kwargs)
+            move, value = result.move, result.value
+            self.completed_depth = result.depth
+            self.nodes = result.nodes
+            self.qnodes = result.qnodes
+            self.pv = list(result.pv)
+            self.beta_cutoffs = result.beta_cutoffs
+            self.first_move_cutoffs = result.first_move_cutoffs
+        else:
+            if self.tt is not None:
+                self.tt.new_search()
+            move, value = self.iterative_deepening(self.prepare_board(board), legal_moves)
+
+        stats = self._search_stats(value, start, tt_probes)._replace(
+            book=book_move is not None,
+            tablebase=tb_root is not None,
+        )
+        self.last_stats = stats
+        logger.debug("search %s", stats.as_dict())
+        if self.on_search is not None:
+            self.on_search(stats)
+        return move, stats
+
+    def _search_stats(
+        self,
+        value: float | None,
+        start: float,
+        tt_probes: tuple[int, int],
+    ) -> SearchStats:
+        """Summary of the search that started at 'start' (TT counters then: 'tt_probes')."""
+        hits = misses = 0
+        if self.tt is not None:
+            hits = self.tt.hits - tt_probes[0]
+            misses = self.tt.misses - tt_probes[1]
+        return SearchStats(
+            value=value,
+            depth=self.completed_depth,
+            nodes=self.nodes,
+            qnodes=self.qnodes,
+            elapsed_ms=(time.perf_counter() - start) * 1000,
+            tt_hit_rate=hits / (hits + misses) if hits + misses else 0.0,
+            first_move_cutoff_rate=(
+                self.first_move_cutoffs / self.beta_cutoffs if self.beta_cutoffs else 0.0
+            ),
+            pv=tuple(self.pv),
+        )
+
+    def prepare_board(self, board: chess.Board) -> chess.Board | Position:
+        """
+        Private copy of 'board' for the search to work on (an aborted
+        iteration leaves moves pushed): a Position, or a chess.Board copy
+        with use_bitboard_position=False.
+        """
+        if self.use_bitboard_position:
+            return Position.from_board(board)
+        return board.copy()
+
+    def iterative_deepening(
+        self,
+        board: chess.Board,
+        legal_moves: list[chess.Move],
+        start_depth: int = 1,
+        max_depth: int | None = None,
+        complete_first: bool = True,
+        should_stop: Callable[[], bool] | None = None,
+    ) -> tuple[chess.Move | None, float | None]:
+        """
+        Search 'board' (which may be modified if the search aborts) one
+        depth at a time from 'start_depth', until 'max_depth' (default: the
+        agent's depth, or max_depth with a budget) or the budget runs out.
+
+        If 'complete_first' is set the first iteration ignores the budget,
+        so there is always a move to return; otherwise (None, None) comes
+        back when no iteration finished.
+
+        Returns the best move and score of the last completed iteration and
+        records completed_depth, its PV, nodes and qnodes on the agent.
+        """
+        start = time.perf_counter()
+        deadline = None
+        if self.time_limit_ms is not None:
+            deadline = start + self.time_limit_ms / 1000
+
+        tt = self.tt
+        orderer = self.orderer
+        root_first = None
+        if tt is not None:
+            entry = tt.probe(position_key(board))
+            if entry is not None:
+                root_first = entry.move
+
+        ctx = self._make_context(board, deadline, should_stop)
+        if max_depth is None:
+            max_depth = self.max_depth if self.time_managed else self.depth
 
         best_move = None
-        best_value = -math.inf
+        best_value = None
+        self.completed_depth = 0
+        self.iterations = []
 
-        alpha = -math.inf
-        beta = math.inf
+        for depth in range(start_depth, max(max_depth, start_depth) + 1):
+            # The first iteration may be made to complete, so there is a move to play
+            ctx.can_abort = depth > start_depth or not complete_first
+            try:
+                value, move = self._aspiration_search(
+                    board, legal_moves, depth, ctx, best_value, root_first
+                )
+            except SearchAborted:
+                break
 
-        for move in legal_moves:
-            board.push(move)
+            best_move = move
+            best_value = value
+            self.completed_depth = depth
+            self.iterations.append({
+                "depth": depth,
+                "nodes": ctx.nodes,
+                "qnodes": ctx.qnodes,
+                "elapsed_ms": (time.perf_counter() - start) * 1000,
+            })
+            ctx.prev_pv = ctx.pv[0]
+            # Next iteration starts with this one's best move
+            root_first = move
+
+            if deadline is not None:
+                # A deeper iteration takes several times longer than this
+                # one, so don't start it once half the budget is gone.
+                if time.perf_counter() - start >= (deadline - start) / 2:
+                    break
+            if abs(value) >= MATE_THRESHOLD:
+                break  # forced mate found, deeper search won't change it
+
+        self.pv = list(ctx.prev_pv)
+        self._record_counters(ctx)
+        return best_move, best_value
+
+    def _aspiration_search(
+        self,
+        board: chess.Board,
+        legal_moves: list[chess.Move],
+        depth: int,
+        ctx: SearchContext,
+        guess: float | None,
+        root_first: chess.Move | None,
+    ) -> tuple[float, chess.Move]:
+        """
+        One iteration searched with a window of +-aspiration_window around
+        'guess' (the previous iteration's score). When the score lands
+        outside it, that side of the window is widened (four times as far
+        each time, fully past ASPIRATION_MAX) and the root searched again.
+        """
+        alpha, beta = -math.inf, math.inf
+        delta = self.aspiration_window
+        if delta and guess is not None and abs(guess) < MATE_THRESHOLD:
+            alpha, beta = guess - delta, guess + delta
+
+        while True:
+            if ctx.orderer is not None:
+                legal_moves = ctx.orderer.order(board, legal_moves, 0, root_first)
+            value, move = self._search_root(board, legal_moves, depth, ctx, alpha, beta)
+            if alpha < value < beta:
+                return value, move
+
+            ctx.aspiration_researches += 1
+            delta *= 4
+            if value <= alpha:
+                alpha = value - delta if delta <= ASPIRATION_MAX else -math.inf
+            else:
+                beta = value + delta if delta <= ASPIRATION_MAX else math.inf
+                root_first = move  # the move that failed high goes first
+
+    def _record_counters(self, ctx: SearchContext) -> None:
+        self.nodes = ctx.nodes
+        self.qnodes = ctx.qnodes
+        for name in SearchContext.COUNTERS:
+            setattr(self, name, getattr(ctx, name))
+
+    def search_root_move(
+        self,
+        board: chess.Board,
+        move: chess.Move,
+        depth: int,
+        alpha: float = -math.inf,
+        deadline: float | None = None,
+    ) -> float | None:
+        """
+        Score one root move to 'depth' against the lower bound 'alpha'
+        (a score <= alpha only means "no better than alpha").
+
+        Returns None if 'deadline' (a time.perf_counter() value) passes
+        first. Records nodes and qnodes on the agent.
+        """
+        ctx = self._make_context(board, deadline)
+        ctx.can_abort = deadline is not None
+
+        ctx.count_node()
+        ctx.evaluator.push(board, move)
+        try:
             value = -negamax(
                 board,
-                self.depth - 1,
-                -beta,
+                depth - 1,
+                -math.inf,
                 -alpha,
                 self.use_alpha_beta,
                 self.use_quiescence,
+                ctx,
+                1,
             )
-            board.pop()
+        except SearchAborted:
+            value = None
+        finally:
+            self._record_counters(ctx)
+
+        return value
+
+    def _make_context(
+        self,
+        board: chess.Board,
+        deadline: float | None = None,
+        should_stop: Callable[[], bool] | None = None,
+    ) -> SearchContext:
+        """Fresh search context for 'board' using the agent's tables and settings."""
+        if self.orderer is not None:
+            self.orderer.new_search()
+
+        ctx = SearchContext(
+            tt=self.tt,
+            deadline=deadline,
+            node_limit=self.node_limit,
+            orderer=self.orderer,
+            evaluator=self.evaluator,
+            batch_leaves=self.batch_leaf_eval,
+            should_stop=should_stop,
+            pvs=self.use_pvs,
+            null_move=self.use_null_move,
+            lmr=self.use_lmr,
+            futility=self.use_futility,
+            staged=self.use_staged_movegen,
+            tablebase=self.tablebase,
+        )
+        ctx.evaluator.reset(board)
+        return ctx
+
+    def _search_root(
+        self,
+        board: chess.Board,
+        legal_moves: list[chess.Move],
+        depth: int,
+        ctx: SearchContext,
+        alpha: float = -math.inf,
+        beta: float = math.inf,
+    ) -> tuple[float, chess.Move]:
+        """
+        One fixed-depth iteration over the root moves, in the given order,
+        within the window (alpha, beta). A score at or outside the window is
+        only a bound.
+        """
+        ctx.count_node()
+        ctx.follow_pv = bool(ctx.prev_pv) and ctx.orderer is not None
 
-            print("DEBUG:", move.uci(), value)  # <--- add this temporarily
+        best_move = None
+        best_value = -math.inf
+        alpha_orig = alpha
+
+        evaluator = ctx.evaluator
+        for i, move in enumerate(legal_moves):
+            evaluator.push(board, move)
+            value = _search_child(
+                board,
+                depth - 1,
+                alpha,
+                beta,
+                self.use_alpha_beta,
+                self.use_quiescence,
+                ctx,
+                1,
+                i,
+            )
+            evaluator.pop(board)
+            ctx.follow_pv = False
 
             if value > best_value:
                 best_value = value
                 best_move = move
+                ctx.pv[0] = [move] + ctx.pv[1]
 
-            if self.use_alpha_beta and value > alpha:
-                alpha = value
+            if self.use_alpha_beta:
+                if value > alpha:
+                    alpha = value
+                if alpha >= beta:
+                    break  # fail high: the aspiration window is re-opened
+
+        if ctx.tt is not None:
+            flag = _tt_flag(best_value, alpha_orig, beta, self.use_alpha_beta)
+            ctx.tt.store(position_key(board), depth, flag, best_value, best_move)
 
-        return best_move
\ No newline at end of file
+        return best_value, best_move
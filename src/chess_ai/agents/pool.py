@@ -0,0 +1,173 @@
+"""
+Agent Pool
+----------
+
+Reusable agent instances, one set per configuration (registry name plus
+constructor kwargs).
+
+Building an agent can be expensive (transposition tables, opening books,
+worker processes), and what it builds is worth keeping warm between moves.
+Instead of one agent per request, or one shared agent that can only run one
+search at a time, callers lease an agent for a configuration, use it
+exclusively, and hand it back for the next request to reuse.
+
+A lease can also carry a budget (search depth, time, nodes or playouts).
+The budget is set on the leased instance for the duration of the lease
+and undone afterwards, so callers with different budgets share the same
+instances, and the same tables, instead of each budget building its own.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Callable, Iterator, NamedTuple
+
+from chess_ai.core.player import Player
+from .registry import get_agent
+
+# Agent attributes a lease may set for its duration
+BUDGETS = ("depth", "max_depth", "time_limit_ms", "node_limit", "playouts")
+
+class AgentConfig(NamedTuple):
+    """What to lease: a registry name, constructor kwargs and a budget."""
+
+    name: str
+    kwargs: dict | None = None
+    budget: dict | None = None
+
+    @property
+    def key(self) -> tuple:
+        """Instances are shared by configs with the same name and kwargs."""
+        return (self.name, tuple(sorted((self.kwargs or {}).items())))
+
+def _apply_budget(agent: Player, budget: dict) -> dict:
+    """
+    Set 'budget' on 'agent' and return the values it replaced. Budgets the
+    agent doesn't have are skipped (a random agent has no depth).
+    """
+    for name in budget:
+        if name not in BUDGETS:
+            raise KeyError(f"Unknown budget '{name}'. Available budgets: {list(BUDGETS)}")
+
+    previous = {}
+    search_kwargs = getattr(agent, "search_kwargs", None)
+    for name, value in budget.items():
+        if not hasattr(agent, name):
+            continue
+        previous[name] = getattr(agent, name)
+        setattr(agent, name, value)
+        # Settings handed to parallel search workers
+        if search_kwargs is not None and name in search_kwargs:
+            search_kwargs[name] = value
+    return previous
+
+def _close(agent: Player) -> None:
+    close = getattr(agent, "close", None)
+    if close is not None:
+        close()
+
+class AgentPool:
+    """
+    Idle agents per configuration, handed out one lease at a time.
+
+    A lease takes an idle instance of its configuration or builds a new one
+    with 'factory'; there is no limit on instances in use. On release, at
+    most 'max_idle' instances per configuration are kept, and idle
+    instances of all but the 'max_configs' most recently used
+    configurations are closed.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[..., Player] = get_agent,
+        max_idle: int = 4,
+        max_configs: int = 16,
+    ):
+        self.factory = factory
+        self.max_idle = max(1, max_idle)
+        self.max_configs = max(1, max_configs)
+
+        self._idle: OrderedDict[tuple, list[Player]] = OrderedDict()  # least recently used first
+        self._lock = threading.Lock()
+        self._closed = False
+        self.leased = 0
+
+        # Counters, see stats()
+        self.created = 0
+        self.reused = 0
+        self.discarded = 0
+
+    def acquire(self, config: AgentConfig) -> Player:
+        """An agent for 'config' (without its budget), now leased to the caller."""
+        key = config.key
+        with self._lock:
+            idle = self._idle.get(key)
+            agent = idle.pop() if idle else None
+            self.leased += 1
+            if agent is not None:
+                self.reused += 1
+                return agent
+            self.created += 1
+        try:
+            return self.factory(config.name, **(config.kwargs or {}))
+        except BaseException:
+            with self._lock:
+                self.leased -= 1
+                self.created -= 1
+            raise
+
+    def release(self, config: AgentConfig, agent: Player) -> None:
+        """Hand a leased agent back for reuse."""
+        key = config.key
+        discard = []
+        with self._lock:
+            self.leased -= 1
+            idle = self._idle.setdefault(key, [])
+            self._idle.move_to_end(key)
+            if len(idle) < self.max_idle and not self._closed:
+                idle.append(agent)
+            else:
+                discard.append(agent)
+            while len(self._idle) > self.max_configs:
+                _, agents = self._idle.popitem(last=False)
+                discard.extend(agents)
+            self.discarded += len(discard)
+        for extra in discard:
+            _close(extra)
+
+    @contextmanager
+    def lease(self, config: AgentConfig) -> Iterator[Player]:
+        """
+        with pool.lease(AgentConfig("minimax", {"depth": 3}, {"time_limit_ms": 500})) as agent:
+            move = agent.choose_move(game)
+        """
+        agent = self.acquire(config)
+        previous = {}
+        try:
+            previous = _apply_budget(agent, config.budget or {})
+            yield agent
+        finally:
+            _apply_budget(agent, previous)
+            self.release(config, agent)
+
+    def stats(self) -> dict[str, object]:
+        with self._lock:
+            return {
+                "configs": len(self._idle),
+                "idle": sum(len(agents) for agents in self._idle.values()),
+                "leased": self.leased,
+                "created": self.created,
+                "reused": self.reused,
+                "discarded": self.discarded,
+            }
+
+    def close(self) -> None:
+        """Close every idle agent (agents out on lease are closed on release)."""
+        with self._lock:
+            agents = [agent for idle in self._idle.values() for agent in idle]
+            self._idle.clear()
+            self._closed = True
+        for agent in agents:
+            _close(agent)
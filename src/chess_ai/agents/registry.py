@@ -16,15 +16,14 @@ agents trivial.
 
 from .random_agent import RandomAgent
 from .minimax_agent import MinimaxAgent
-# Later:
-# from .greedy_agent import GreedyAgent
-# from .mcts_agent import MonteCarloTreeSearchAgent
+from .mcts_agent import MonteCarloTreeSearchAgent
+from .greedy_agent import GreedyAgent
 
 AGENTS = {
     "random": RandomAgent,
     "minimax": MinimaxAgent,
-    # "greedy": GreedyAgent,
-    # "mcts": MonteCarloTreeSearchAgent,
+    "mcts": MonteCarloTreeSearchAgent,
+    "greedy": GreedyAgent,
 }
 
 def get_agent(name: str, **kwargs):
@@ -40,6 +39,7 @@ def get_agent(name: str, **kwargs):
         Any configuration parameters for that agent.
         For example:
             get_agent("minimax", depth=3, use_alpha_beta=True)
+            get_agent("minimax", depth=3, book="book.bin")
 
     Returns
     -------
@@ -0,0 +1,29 @@
+"""
+Move Codes
+----------
+
+Moves packed into 16 bits: from | to << 6 | promotion << 12. Used wherever
+moves are stored in bulk: MCTS node pools, shared transposition table
+entries and compact stored games.
+
+Code 0 is the null move (a1a1, which no legal move is), and also what None
+encodes to.
+"""
+
+from __future__ import annotations
+
+import chess
+
+# Decoded moves by code; at most 64 * 64 * 5 entries
+_DECODED: dict[int, chess.Move] = {}
+
+def encode_move(move: chess.Move | None) -> int:
+    if move is None:
+        return 0
+    return move.from_square | move.to_square << 6 | (move.promotion or 0) << 12
+
+def decode_move(code: int) -> chess.Move:
+    move = _DECODED.get(code)
+    if move is None:
+        move = _DECODED[code] = chess.Move(code & 0x3F, (code >> 6) & 0x3F, (code >> 12) or None)
+    return move
@@ -0,0 +1,134 @@
+"""
+Attack Tables
+-------------
+
+Precomputed attack bitboards for move generation and attack detection:
+
+- KNIGHT_ATTACKS[square], KING_ATTACKS[square],
+- PAWN_ATTACKS[color][square] (the squares a pawn of 'color' captures on),
+- sliding pieces: ROOK_ATTACKS[square] and BISHOP_ATTACKS[square] map the
+  relevant occupancy (the blockers on the piece's lines, board edges
+  excluded: ROOK_MASKS / BISHOP_MASKS) to the attacked squares, so a rook's
+  attacks are one lookup: ROOK_ATTACKS[sq][occupied & ROOK_MASKS[sq]],
+- BETWEEN[a][b] (squares strictly between two aligned squares) and
+  LINE[a][b] (the whole line through them), for pins and check evasions.
+
+Sliding lookups use the same relevant-occupancy masks as magic bitboards,
+but index a dict instead of multiplying by a magic number: in CPython the
+64-bit multiply is a bignum operation and the dict lookup is several times
+faster, with the same table size.
+
+All tables are built once at import from ray walks.
+"""
+
+from __future__ import annotations
+
+import chess
+
+_KNIGHT_STEPS = ((1, 2), (2, 1), (2, -1), (1, -2), (-1, -2), (-2, -1), (-2, 1), (-1, 2))
+_KING_STEPS = ((1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0), (-1, -1), (0, -1), (1, -1))
+_ROOK_DIRECTIONS = ((1, 0), (-1, 0), (0, 1), (0, -1))
+_BISHOP_DIRECTIONS = ((1, 1), (1, -1), (-1, 1), (-1, -1))
+
+def _square(file: int, rank: int) -> int | None:
+    if 0 <= file < 8 and 0 <= rank < 8:
+        return rank * 8 + file
+    return None
+
+def _step_attacks(square: int, steps) -> chess.Bitboard:
+    file, rank = square & 7, square >> 3
+    mask = 0
+    for df, dr in steps:
+        target = _square(file + df, rank + dr)
+        if target is not None:
+            mask |= 1 << target
+    return mask
+
+def _slide(square: int, occupied: chess.Bitboard, directions) -> chess.Bitboard:
+    """Squares reached from 'square' along 'directions', stopping at blockers."""
+    file, rank = square & 7, square >> 3
+    mask = 0
+    for df, dr in directions:
+        f, r = file + df, rank + dr
+        while 0 <= f < 8 and 0 <= r < 8:
+            bit = 1 << (r * 8 + f)
+            mask |= bit
+            if occupied & bit:
+                break
+            f += df
+            r += dr
+    return mask
+
+def _relevant_mask(square: int, directions) -> chess.Bitboard:
+    """Squares whose occupancy changes the attacks (each ray minus its last square)."""
+    file, rank = square & 7, square >> 3
+    mask = 0
+    for df, dr in directions:
+        f, r = file + df, rank + dr
+        while 0 <= f + df < 8 and 0 <= r + dr < 8:
+            mask |= 1 << (r * 8 + f)
+            f += df
+            r += dr
+    return mask
+
+def _subsets(mask: chess.Bitboard):
+    """Every subset of the bits of 'mask' (carry-rippler)."""
+    subset = 0
+    while True:
+        yield subset
+        subset = (subset - mask) & mask
+        if not subset:
+            return
+
+def _slider_table(directions) -> tuple[list[chess.Bitboard], list[dict[chess.Bitboard, chess.Bitboard]]]:
+    masks = []
+    tables = []
+    for square in chess.SQUARES:
+        mask = _relevant_mask(square, directions)
+        masks.append(mask)
+        tables.append({
+            occupancy: _slide(square, occupancy, directions)
+            for occupancy in _subsets(mask)
+        })
+    return masks, tables
+
+KNIGHT_ATTACKS = [_step_attacks(sq, _KNIGHT_STEPS) for sq in chess.SQUARES]
+KING_ATTACKS = [_step_attacks(sq, _KING_STEPS) for sq in chess.SQUARES]
+PAWN_ATTACKS = [
+    [_step_attacks(sq, ((-1, -1), (1, -1))) for sq in chess.SQUARES],  # BLACK
+    [_step_attacks(sq, ((-1, 1), (1, 1))) for sq in chess.SQUARES],    # WHITE
+]
+
+ROOK_MASKS, ROOK_ATTACKS = _slider_table(_ROOK_DIRECTIONS)
+BISHOP_MASKS, BISHOP_ATTACKS = _slider_table(_BISHOP_DIRECTIONS)
+
+# Attacks on an empty board, for finding pieces that could pin or check
+ROOK_RAYS = [ROOK_ATTACKS[sq][0] for sq in chess.SQUARES]
+BISHOP_RAYS = [BISHOP_ATTACKS[sq][0] for sq in chess.SQUARES]
+
+def _line_tables() -> tuple[list[list[chess.Bitboard]], list[list[chess.Bitboard]]]:
+    between = [[0] * 64 for _ in chess.SQUARES]
+    line = [[0] * 64 for _ in chess.SQUARES]
+    for a in chess.SQUARES:
+        for directions, rays in ((_ROOK_DIRECTIONS, ROOK_RAYS), (_BISHOP_DIRECTIONS, BISHOP_RAYS)):
+            for b in chess.SQUARES:
+                if a == b or not rays[a] & (1 << b):
+                    continue
+                blockers = (1 << a) | (1 << b)
+                between[a][b] = _slide(a, 1 << b, directions) & _slide(b, 1 << a, directions)
+                line[a][b] = (rays[a] & rays[b]) | blockers
+    return between, line
+
+BETWEEN, LINE = _line_tables()
+
+def rook_attacks(square: chess.Square, occupied: chess.Bitboard) -> chess.Bitboard:
+    return ROOK_ATTACKS[square][occupied & ROOK_MASKS[square]]
+
+def bishop_attacks(square: chess.Square, occupied: chess.Bitboard) -> chess.Bitboard:
+    return BISHOP_ATTACKS[square][occupied & BISHOP_MASKS[square]]
+
+def queen_attacks(square: chess.Square, occupied: chess.Bitboard) -> chess.Bitboard:
+    return (
+        ROOK_ATTACKS[square][occupied & ROOK_MASKS[square]]
+        | BISHOP_ATTACKS[square][occupied & BISHOP_MASKS[square]]
+    )
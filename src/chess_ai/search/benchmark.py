@@ -0,0 +1,359 @@
+"""
+Benchmarks
+----------
+
+Reproducible speed measurements for the move generator and MinimaxAgent:
+
+- perft: legal move tree sizes of the standard perft positions, on both
+  chess.Board and Position, checked against the known counts,
+- search: every position of BENCH_FENS (middlegames and endgames) searched
+  to a fixed depth with each agent configuration, reporting total nodes
+  (main search plus quiescence), nodes per second, the mean time to
+  complete each depth and the effective branching factor (geometric mean
+  of how many times more nodes each iteration took than the previous one).
+
+Results are plain dicts, written as JSON. compare() checks a run against a
+saved baseline and lists every metric that got worse by more than a
+threshold.
+
+    python -m chess_ai.search.benchmark --output bench.json
+    python -m chess_ai.search.benchmark --baseline bench.json
+
+The second form exits with status 1 if anything regressed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import platform
+import sys
+import time
+from typing import NamedTuple
+
+import chess
+
+from chess_ai.agents.minimax_agent import MinimaxAgent
+from chess_ai.search.position import Position
+
+# (name, FEN, known node counts for depth 1, 2, ...)
+PERFT_POSITIONS = [
+    ("start", chess.STARTING_FEN, [20, 400, 8902, 197281]),
+    ("kiwipete", "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1", [48, 2039, 97862]),
+    ("endgame", "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1", [14, 191, 2812, 43238]),
+    ("promotions", "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1", [6, 264, 9467, 422333]),
+    ("talkchess", "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8", [44, 1486, 62379]),
+    ("symmetric", "r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10", [46, 2079, 89890]),
+]
+
+# Search benchmark positions: tactical middlegames (Bratko-Kopec and
+# others), quiet middlegames, then endgames
+BENCH_FENS = [
+    "1k1r4/pp1b1R2/3q2pp/4p3/2B5/4Q3/PPP2B2/2K5 b - - 0 1",
+    "3r1k2/4npp1/1ppr3p/p6P/P2PPPP1/1NR5/5K2/2R5 w - - 0 1",
+    "2q1rr1k/3bbnnp/p2p1pp1/2pPp3/PpP1P1P1/1P2BNNP/2BQ1PRK/7R b - - 0 1",
+    "rnbqkb1r/p3pppp/1p6/2ppP3/3N4/2P5/PPP1QPPP/R1B1KB1R w KQkq - 0 1",
+    "r1b2rk1/2q1b1pp/p2ppn2/1p6/3QP3/1BN1B3/PPP3PP/R4RK1 w - - 0 1",
+    "2r3k1/pppR1pp1/4p3/4P1P1/5P2/1P4K1/P1P5/8 w - - 0 1",
+    "1nk1r1r1/pp2n1pp/4p3/q2pPp1N/b1pP1P2/B1P2R2/2P1B1PP/R2Q2K1 w - - 0 1",
+    "4b3/p3kp2/6p1/3pP2p/2pP1P2/4K1P1/P3N2P/8 w - - 0 1",
+    "2kr1bnr/pbpq4/2n1pp2/3p3p/3P1P1B/2N2N1Q/PPP3PP/2KR1B1R w - - 0 1",
+    "3rr1k1/pp3pp1/1qn2np1/8/3p4/PP1R1P2/2P1NQPP/R1B3K1 b - - 0 1",
+    "2r1nrk1/p2q1ppp/bp1p4/n1pPp3/P1P1P3/2PBB1N1/4QPPP/R4RK1 w - - 0 1",
+    "r3r1k1/ppqb1ppp/8/4p1NQ/8/2P5/PP3PPP/R3R1K1 b - - 0 1",
+    "r2q1rk1/4bppp/p2p4/2pP4/3pP3/3Q4/PP1B1PPP/R3R1K1 w - - 0 1",
+    "rnb2r1k/pp2p2p/2pp2p1/q2P1p2/8/1Pb2NP1/PB2PPBP/R2Q1RK1 w - - 0 1",
+    "2r3k1/1p2q1pp/2b1pr2/p1pp4/6Q1/1P1PP1R1/P1PN2PP/5RK1 w - - 0 1",
+    "r1bqkb1r/4npp1/p1p4p/1p1pP1B1/8/1B6/PPPN1PPP/R2Q1RK1 w kq - 0 1",
+    "r2q1rk1/1ppnbppp/p2p1nb1/3Pp3/2P1P1P1/2N2N1P/PPB1QP2/R1B2RK1 b - - 0 1",
+    "r1bq1rk1/pp2ppbp/2np2p1/2n5/P3PP2/N1P2N2/1PB3PP/R1B1QRK1 b - - 0 1",
+    "3rr3/2pq2pk/p2p1pnp/8/2QBPP2/1P6/P5PP/4RRK1 b - - 0 1",
+    "r4k2/pb2bp1r/1p1qp2p/3pNp2/3P1P2/2N3P1/PPP1Q2P/2KRR3 w - - 0 1",
+    "3rn2k/ppb2rpp/2ppqp2/5N2/2P1P3/1P5Q/PB3PPP/3RR1K1 w - - 0 1",
+    "2r2rk1/1bqnbpp1/1p1ppn1p/pP6/N1P1P3/P2B1N1P/1B2QPP1/R2R2K1 b - - 0 1",
+    "r1bqk2r/pp2bppp/2p5/3pP3/P2Q1P2/2N1B3/1PP3PP/R4RK1 b kq - 0 1",
+    "r2qnrnk/p2b2b1/1p1p2pp/2pPpp2/1PP1P3/PRNBB3/3QNPPP/5RK1 w - - 0 1",
+    "r1bq1rk1/pp2bppp/2n1pn2/3p4/2PP4/2N1PN2/PP1QBPPP/R3KB1R w KQ - 0 9",
+    "r2qr1k1/1b1nbppp/p2p1n2/1p2p3/4P3/P1NB1N1P/1PP1QPP1/R1B2RK1 w - - 0 13",
+    "r1b2rk1/ppq1bppp/2n1pn2/2pp4/3P4/2PBPN2/PP1N1PPP/R2QK2R w KQ - 0 9",
+    "rn1qkb1r/pp3ppp/2p1pn2/3p1b2/2PP4/1QN1P3/PP3PPP/R1B1KBNR w KQkq - 0 6",
+    "r2q1rk1/pp1nbppp/2p1pn2/3p4/2PP1B2/2N1PN2/PP3PPP/R2QKB1R w KQ - 0 8",
+    "r1bqr1k1/pp1n1pbp/2pp1np1/4p3/2PPP3/2N1BP2/PP1QN1PP/R3KB1R w KQ - 0 10",
+    "2rq1rk1/pb1nbppp/1p2pn2/2pp4/2PP4/1PN1PN2/PB2BPPP/2RQ1RK1 w - - 0 12",
+    "r4rk1/1bqnbppp/p2ppn2/1p6/3NPP2/P1N1B3/1PPQB1PP/R4R1K w - - 0 13",
+    "8/8/4k3/8/2p5/8/B2K4/8 w - - 0 1",
+    "8/5pk1/6p1/7p/7P/6P1/5PK1/8 w - - 0 1",
+    "8/8/1p4kp/p1p5/P1P5/1P4KP/8/8 w - - 0 1",
+    "6k1/5ppp/8/8/8/8/5PPP/3R2K1 w - - 0 1",
+    "8/5k2/8/3R4/8/8/3r1K2/8 w - - 0 1",
+    "8/8/8/3k4/8/3K4/3P4/8 w - - 0 1",
+    "8/p4k2/1p3pp1/2p4p/2P2P1P/1P4P1/P5K1/8 w - - 0 1",
+    "4k3/8/8/8/8/8/4P3/4K2R w K - 0 1",
+    "8/3k4/3p4/p2P1p2/P2P1P2/8/8/4K3 w - - 0 1",
+    "2k5/8/1K6/8/8/8/8/1Q6 w - - 0 1",
+    "8/8/8/8/4k3/8/5R2/4K3 w - - 0 1",
+    "6k1/8/6K1/8/8/8/8/3N1B2 w - - 0 1",
+    "8/2kp4/8/K7/8/8/2P5/8 w - - 0 1",
+    "r7/5pk1/6p1/8/8/6P1/R4PK1/8 w - - 0 1",
+    "8/6pk/8/4N3/8/1b6/6PP/6K1 b - - 0 1",
+    "5rk1/5ppp/8/8/8/8/1Q3PPP/6K1 w - - 0 1",
+    "8/8/3qk3/8/8/3QK3/8/8 w - - 0 1",
+    "2r3k1/5ppp/8/8/8/8/5PPP/2R3K1 b - - 0 1",
+    "3b4/8/5k2/8/2B5/4K3/4P3/8 w - - 0 1",
+    "8/1pp2k2/p2p4/3P1pp1/PP3P2/6P1/5K2/8 b - - 0 1",
+]
+
+# Agent configurations by name (MinimaxAgent keyword arguments; depth is
+# set by the benchmark)
+CONFIGS = {
+    "alpha_beta": {
+        "use_transposition_table": False,
+        "use_move_ordering": False,
+        "use_pvs": False,
+        "aspiration_window": None,
+        "use_null_move": False,
+        "use_lmr": False,
+        "use_futility": False,
+        "use_bitboard_position": False,
+    },
+    "default": {},
+    "quiescence": {"use_quiescence": True},
+    "tapered": {"use_quiescence": True, "evaluator": "tapered"},
+}
+
+#########
+# PERFT #
+#########
+
+def perft(board: chess.Board | Position, depth: int) -> int:
+    """Number of leaf nodes of the legal move tree 'depth' plies deep."""
+    if depth == 0:
+        return 1
+    moves = list(board.legal_moves)
+    if depth == 1:
+        return len(moves)
+    nodes = 0
+    for move in moves:
+        board.push(move)
+        nodes += perft(board, depth - 1)
+        board.pop()
+    return nodes
+
+def run_perft(max_depth: int = 3) -> list[dict]:
+    """Perft of every PERFT_POSITIONS entry up to 'max_depth' on both board types."""
+    rows = []
+    for name, fen, counts in PERFT_POSITIONS:
+        depth = min(max_depth, len(counts))
+        for board_type, make in (("board", chess.Board), ("position", _position)):
+            board = make(fen)
+            start = time.perf_counter()
+            nodes = perft(board, depth)
+            seconds = time.perf_counter() - start
+            rows.append({
+                "name": name,
+                "board": board_type,
+                "depth": depth,
+                "nodes": nodes,
+                "expected": counts[depth - 1],
+                "ok": nodes == counts[depth - 1],
+                "seconds": seconds,
+                "nps": nodes / seconds if seconds else 0.0,
+            })
+    return rows
+
+def _position(fen: str) -> Position:
+    return Position.from_board(chess.Board(fen))
+
+##########
+# SEARCH #
+##########
+
+def search_position(fen: str, config: dict, depth: int) -> dict:
+    """Search 'fen' to 'depth' with a fresh agent and record each iteration."""
+    agent = MinimaxAgent(depth=depth, **config)
+    board = chess.Board(fen)
+
+    start = time.perf_counter()
+    agent.iterative_deepening(agent.prepare_board(board), list(board.legal_moves))
+    seconds = time.perf_counter() - start
+
+    return {
+        "fen": fen,
+        "nodes": agent.nodes + agent.qnodes,
+        "seconds": seconds,
+        "iterations": agent.iterations,
+    }
+
+def branching_factor(iterations: list[dict]) -> float | None:
+    """Geometric mean of the node growth between consecutive iterations."""
+    totals = [it["nodes"] + it["qnodes"] for it in iterations]
+    per_iteration = [b - a for a, b in zip([0] + totals, totals)]
+    ratios = [b / a for a, b in zip(per_iteration, per_iteration[1:]) if a > 0 and b > 0]
+    if not ratios:
+        return None
+    return math.exp(sum(map(math.log, ratios)) / len(ratios))
+
+def run_search(config: dict, depth: int, fens: list[str] = BENCH_FENS) -> dict:
+    """Search every FEN with one configuration and summarize."""
+    rows = [search_position(fen, config, depth) for fen in fens]
+
+    nodes = sum(r["nodes"] for r in rows)
+    seconds = sum(r["seconds"] for r in rows)
+
+    time_to_depth = {}
+    for d in range(1, depth + 1):
+        times = [it["elapsed_ms"] for r in rows for it in r["iterations"] if it["depth"] == d]
+        if times:
+            time_to_depth[str(d)] = sum(times) / len(times)
+
+    factors = [f for f in (branching_factor(r["iterations"]) for r in rows) if f]
+    return {
+        "config": config,
+        "depth": depth,
+        "positions": len(rows),
+        "nodes": nodes,
+        "seconds": seconds,
+        "nps": nodes / seconds if seconds else 0.0,
+        "time_to_depth_ms": time_to_depth,
+        "branching_factor": (
+            math.exp(sum(map(math.log, factors)) / len(factors)) if factors else None
+        ),
+        "per_position": rows,
+    }
+
+def run_benchmark(
+    configs: list[str] = ("default", "tapered"),
+    depth: int = 4,
+    perft_depth: int = 3,
+    fens: list[str] = BENCH_FENS,
+) -> dict:
+    """Perft plus a search benchmark per configuration name (see CONFIGS)."""
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "depth": depth,
+            "perft_depth": perft_depth,
+        },
+        "perft": run_perft(perft_depth) if perft_depth else [],
+        "search": {name: run_search(CONFIGS[name], depth, fens) for name in configs},
+    }
+
+###############
+# REGRESSIONS #
+###############
+
+class Regression(NamedTuple):
+    metric: str      # e.g. "search.default.nps"
+    baseline: float
+    current: float
+
+    @property
+    def change(self) -> float:
+        """Relative change from the baseline (+0.25 = 25% higher)."""
+        return (self.current - self.baseline) / self.baseline if self.baseline else math.inf
+
+    def __str__(self) -> str:
+        return f"{self.metric}: {self.baseline:.6g} -> {self.current:.6g} ({self.change:+.1%})"
+
+def compare(results: dict, baseline: dict, threshold: float = 0.10) -> list[Regression]:
+    """
+    Metrics in 'results' that are worse than in 'baseline' by more than
+    'threshold' (relative): fewer nodes per second, or more nodes, a
+    longer time to depth or a higher branching factor at the same depth.
+    A wrong perft count is always a regression. Entries missing from
+    either side are skipped.
+    """
+    regressions = []
+
+    def check(metric, old, new, higher_is_better):
+        if old is None or new is None or not old:
+            return
+        change = (new - old) / old
+        if (-change if higher_is_better else change) > threshold:
+            regressions.append(Regression(metric, old, new))
+
+    old_perft = {(r["name"], r["board"], r["depth"]): r for r in baseline.get("perft", [])}
+    for row in results.get("perft", []):
+        name = f"perft.{row['name']}.{row['board']}"
+        if not row["ok"]:
+            regressions.append(Regression(f"{name}.nodes", row["expected"], row["nodes"]))
+        old = old_perft.get((row["name"], row["board"], row["depth"]))
+        if old is not None:
+            check(f"{name}.nps", old["nps"], row["nps"], True)
+
+    for name, summary in results.get("search", {}).items():
+        old = baseline.get("search", {}).get(name)
+        if old is None or old["depth"] != summary["depth"] or old["positions"] != summary["positions"]:
+            continue
+        prefix = f"search.{name}"
+        check(f"{prefix}.nps", old["nps"], summary["nps"], True)
+        check(f"{prefix}.nodes", old["nodes"], summary["nodes"], False)
+        check(f"{prefix}.branching_factor", old["branching_factor"], summary["branching_factor"], False)
+        for d, ms in summary["time_to_depth_ms"].items():
+            check(f"{prefix}.time_to_depth_ms.{d}", old["time_to_depth_ms"].get(d), ms, False)
+
+    return regressions
+
+#######
+# CLI #
+#######
+
+def _print_results(results: dict) -> None:
+    if results["perft"]:
+        print(f"{'perft':<12} {'board':<9} {'depth':>5} {'nodes':>9} {'ok':>3} {'nodes/s':>10}")
+        for r in results["perft"]:
+            print(
+                f"{r['name']:<12} {r['board']:<9} {r['depth']:>5} {r['nodes']:>9} "
+                f"{'yes' if r['ok'] else 'NO':>3} {r['nps']:>10.0f}"
+            )
+        print()
+
+    print(f"{'config':<12} {'depth':>5} {'nodes':>10} {'nodes/s':>10} {'ebf':>5}  time to depth (ms)")
+    for name, s in results["search"].items():
+        ttd = " ".join(f"{d}:{ms:.0f}" for d, ms in s["time_to_depth_ms"].items())
+        ebf = f"{s['branching_factor']:.2f}" if s["branching_factor"] else "-"
+        print(f"{name:<12} {s['depth']:>5} {s['nodes']:>10} {s['nps']:>10.0f} {ebf:>5}  {ttd}")
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m chess_ai.search.benchmark")
+    parser.add_argument("--config", action="append", choices=sorted(CONFIGS),
+                        help="agent configuration to benchmark (repeatable; default: default, tapered)")
+    parser.add_argument("--depth", type=int, default=4, help="search depth (default 4)")
+    parser.add_argument("--perft-depth", type=int, default=3, help="perft depth, 0 to skip (default 3)")
+    parser.add_argument("--positions", type=int, default=None, help="only the first N benchmark FENs")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare against this JSON file")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="relative change counted as a regression (default 0.10)")
+    args = parser.parse_args(argv)
+
+    results = run_benchmark(
+        configs=args.config or ["default", "tapered"],
+        depth=args.depth,
+        perft_depth=args.perft_depth,
+        fens=BENCH_FENS[:args.positions],
+    )
+    _print_results(results)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        print()
+        if regressions:
+            print(f"{len(regressions)} regression(s) against {args.baseline}:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print(f"No regressions against {args.baseline}.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
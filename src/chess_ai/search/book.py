@@ -0,0 +1,221 @@
+"""
+Opening Book
+------------
+
+Known opening moves, looked up by position instead of searched.
+
+Books use the Polyglot format, so books built here work in other engines
+and GUIs and existing Polyglot books work here. A book is a file of 16-byte
+big-endian entries sorted by position key:
+
+    key (u64)  Zobrist hash of the position (chess.polyglot.zobrist_hash)
+    move (u16) to square | from square << 6 | promotion piece << 12
+               (castling is encoded as the king capturing its own rook)
+    weight (u16), learn (u32)
+
+build_book() collects the first plies of every game in a PGN collection and
+writes one entry per (position, move), weighted by how often the move was
+played. OpeningBook memory-maps a book file and finds a position's entries
+by binary search, so opening a large book costs nothing up front and a
+lookup touches a few pages.
+
+    python -m chess_ai.search.book games.pgn book.bin [--max-ply N] [--min-games N]
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import random
+import struct
+from collections import Counter
+from typing import IO, Iterable, NamedTuple
+
+import chess
+import chess.pgn
+import chess.polyglot
+
+from chess_ai.search.transposition import position_key
+
+ENTRY = struct.Struct(">QHHI")
+MAX_WEIGHT = 0xFFFF
+
+class BookEntry(NamedTuple):
+    move: chess.Move
+    weight: int
+    learn: int
+
+##############
+# MOVE CODES #
+##############
+
+def encode_move(board: chess.Board, move: chess.Move) -> int:
+    """Polyglot move code of 'move' (legal in 'board')."""
+    to_square = move.to_square
+    if board.is_castling(move):
+        # King takes own rook: e1g1 -> e1h1
+        rank = chess.square_rank(move.from_square)
+        file = 7 if board.is_kingside_castling(move) else 0
+        to_square = chess.square(file, rank)
+    promotion = move.promotion - 1 if move.promotion else 0
+    return to_square | move.from_square << 6 | promotion << 12
+
+def decode_move(board: chess.Board, code: int) -> chess.Move:
+    """The move of 'board' a Polyglot move code stands for (may be illegal)."""
+    to_square = code & 0x3F
+    from_square = (code >> 6) & 0x3F
+    promotion = (code >> 12) & 0x7
+    if (
+        board.kings & chess.BB_SQUARES[from_square]
+        and board.rooks & board.occupied_co[board.turn] & chess.BB_SQUARES[to_square]
+    ):
+        # King takes own rook -> castling
+        file = 6 if to_square > from_square else 2
+        to_square = chess.square(file, chess.square_rank(from_square))
+    return chess.Move(from_square, to_square, promotion + 1 if promotion else None)
+
+############
+# BUILDING #
+############
+
+def collect_moves(
+    pgn: IO[str],
+    max_ply: int = 20,
+    counts: Counter | None = None,
+) -> Counter:
+    """
+    Count (position key, move code) pairs over the first 'max_ply' plies of
+    every game in the open PGN file 'pgn' (added to 'counts' if given).
+    """
+    counts = Counter() if counts is None else counts
+    while (game := chess.pgn.read_game(pgn)) is not None:
+        board = game.board()
+        for ply, move in enumerate(game.mainline_moves()):
+            if ply >= max_ply:
+                break
+            counts[position_key(board), encode_move(board, move)] += 1
+            board.push(move)
+    return counts
+
+def write_book(path: str | os.PathLike, counts: Counter, min_games: int = 1) -> int:
+    """
+    Write 'counts' ((key, move code) -> games) as a sorted Polyglot book,
+    dropping moves played in fewer than 'min_games' games. Weights are
+    scaled down to fit 16 bits. Returns the number of entries written.
+    """
+    entries = sorted(
+        (key, code, count) for (key, code), count in counts.items() if count >= min_games
+    )
+    scale = max((count for _, _, count in entries), default=0) / MAX_WEIGHT
+    with open(path, "wb") as f:
+        for key, code, count in entries:
+            weight = max(1, round(count / scale)) if scale > 1 else count
+            f.write(ENTRY.pack(key, code, weight, 0))
+    return len(entries)
+
+def build_book(
+    pgn_paths: Iterable[str | os.PathLike],
+    path: str | os.PathLike,
+    max_ply: int = 20,
+    min_games: int = 1,
+) -> int:
+    """Build a Polyglot book at 'path' from PGN files. Returns the entry count."""
+    counts = Counter()
+    for pgn_path in pgn_paths:
+        with open(pgn_path, encoding="utf-8", errors="replace") as pgn:
+            collect_moves(pgn, max_ply, counts)
+    return write_book(path, counts, min_games)
+
+##########
+# LOOKUP #
+##########
+
+class OpeningBook:
+    """
+    Memory-mapped Polyglot book. Lookups binary-search the sorted entries;
+    close() (or a with block) releases the file.
+    """
+
+    def __init__(self, path: str | os.PathLike):
+        self.path = os.fspath(path)
+        with open(self.path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size % ENTRY.size:
+                raise ValueError(f"{self.path} is not a Polyglot book (size {size})")
+            # mmap can't map an empty file
+            self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        self._count = size // ENTRY.size
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __enter__(self) -> "OpeningBook":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        self._data = b""
+        self._count = 0
+
+    def _key_at(self, index: int) -> int:
+        return struct.unpack_from(">Q", self._data, index * ENTRY.size)[0]
+
+    def entries(self, board: chess.Board) -> list[BookEntry]:
+        """Legal book moves for 'board', in file order."""
+        key = position_key(board)
+
+        # Leftmost entry with this key
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key_at(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+
+        found = []
+        for index in range(lo, self._count):
+            entry_key, code, weight, learn = ENTRY.unpack_from(self._data, index * ENTRY.size)
+            if entry_key != key:
+                break
+            move = decode_move(board, code)
+            if board.is_legal(move):
+                found.append(BookEntry(move, weight, learn))
+        return found
+
+    def choose(
+        self,
+        board: chess.Board,
+        weighted: bool = True,
+        rng: random.Random | None = None,
+    ) -> chess.Move | None:
+        """
+        A book move for 'board', or None if the position isn't in the book:
+        picked at random in proportion to the weights, or the heaviest one
+        with weighted=False.
+        """
+        found = [entry for entry in self.entries(board) if entry.weight > 0]
+        if not found:
+            return None
+        if not weighted:
+            return max(found, key=lambda entry: entry.weight).move
+        rng = rng or random
+        return rng.choices(found, weights=[entry.weight for entry in found])[0].move
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python -m chess_ai.search.book")
+    parser.add_argument("pgn", nargs="+", help="PGN files to read")
+    parser.add_argument("output", help="book file to write")
+    parser.add_argument("--max-ply", type=int, default=20, help="plies per game to include (default 20)")
+    parser.add_argument("--min-games", type=int, default=1,
+                        help="drop moves played in fewer games (default 1)")
+    args = parser.parse_args()
+
+    written = build_book(args.pgn, args.output, args.max_ply, args.min_games)
+    print(f"Wrote {written} entries to {args.output}")
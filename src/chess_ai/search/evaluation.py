@@ -0,0 +1,373 @@
+"""
+Evaluation
+----------
+
+Static evaluation of positions, in centipawns.
+
+- evaluate_board: the original full-board evaluation (material + mate check).
+- IncrementalEvaluator: the same kind of score, kept up to date while the
+  search pushes and pops moves, so reading it at a leaf costs O(1).
+- TaperedEvaluator: middlegame and endgame piece-square scores, blended by
+  how much material is left on the board.
+- evaluate_batch (on either evaluator): scores many positions at once from
+  packed bitboards, with one NumPy product instead of a Python loop each.
+
+Incremental scores come from per-(colour, piece, square) tables. Plain
+material is simply a table that is flat across the board; piece-square
+bonuses slot into the same lookup without changing the update logic.
+Mate and stalemate are left to the search, which finds them anyway when a
+node has no legal moves.
+
+Tables are built once at import as flat NumPy arrays (see table_index);
+evaluators copy them into nested lists, which are faster to index one
+square at a time from Python.
+"""
+
+from __future__ import annotations
+
+from typing import Sequence
+
+import chess
+import numpy as np
+
+from chess_ai.search.pst import (
+    EG_PST,
+    EG_VALUES,
+    MG_PST,
+    MG_VALUES,
+    PHASE_WEIGHTS,
+    TOTAL_PHASE,
+)
+
+# Centipawn values (standard-ish)
+PIECE_VALUES = {
+    chess.PAWN:   100,
+    chess.KNIGHT: 320,
+    chess.BISHOP: 330,
+    chess.ROOK:   500,
+    chess.QUEEN:  900,
+    chess.KING:   0,   # king value handled via mate, not material
+}
+
+MATE_SCORE = 100_000 # "infinite" score in Centipawns
+
+def evaluate_board(board: chess.Board) -> int:
+    """
+    Evaluation from the perspective of the side to move.
+    Positive = good for the side to move.
+    Negative = good for the opponent.
+    """
+
+    # Only treat checkmate specially
+    if board.is_checkmate():
+        # side to move is checkmated → terrible
+        return -MATE_SCORE
+
+    # Otherwise, just use material (even if it's stalemate-ish/illegal)
+    score = 0
+    for piece_type, value in PIECE_VALUES.items():
+        score += value * (
+            len(board.pieces(piece_type, chess.WHITE))
+            - len(board.pieces(piece_type, chess.BLACK))
+        )
+
+    # Normalize for side to move
+    return score if board.turn == chess.WHITE else -score
+
+##########################
+# INCREMENTAL EVALUATION #
+##########################
+
+# Flat score tables: table[table_index(color, piece_type, square)] is the
+# White-positive contribution of that piece on that square. Piece types
+# start at 1, so index 0 of each colour's block is unused.
+TABLE_SIZE = 2 * 7 * 64
+
+def table_index(color: chess.Color, piece_type: chess.PieceType, square: chess.Square) -> int:
+    return (int(color) * 7 + piece_type) * 64 + square
+
+def build_tables(
+    piece_values: dict[chess.PieceType, int],
+    piece_square: dict[chess.PieceType, Sequence[int]] | None = None,
+) -> np.ndarray:
+    """
+    Combine piece values with optional piece-square bonuses into a flat
+    int32 array of TABLE_SIZE entries.
+
+    piece_square[piece_type] lists 64 bonuses from White's point of view,
+    indexed by python-chess square (a1 = 0, h8 = 63). Black uses the same
+    table mirrored vertically, with the sign flipped.
+    """
+    tables = np.zeros((2, 7, 64), dtype=np.int32)
+    mirror = [chess.square_mirror(square) for square in chess.SQUARES]
+
+    for piece_type in chess.PIECE_TYPES:
+        white = np.full(64, piece_values[piece_type], dtype=np.int32)
+        if piece_square and piece_type in piece_square:
+            white += np.asarray(piece_square[piece_type], dtype=np.int32)
+        tables[int(chess.WHITE), piece_type] = white
+        tables[int(chess.BLACK), piece_type] = -white[mirror]
+
+    return tables.reshape(TABLE_SIZE)
+
+MATERIAL_TABLES = build_tables(PIECE_VALUES)
+MG_TABLES = build_tables(MG_VALUES, MG_PST)
+EG_TABLES = build_tables(EG_VALUES, EG_PST)
+
+# Phase weight by piece type (index 0 unused)
+PHASE_BY_PIECE = np.array(
+    [0] + [PHASE_WEIGHTS[piece_type] for piece_type in chess.PIECE_TYPES],
+    dtype=np.int32,
+)
+
+def _nested(tables: np.ndarray) -> list[list[list[int]]]:
+    return tables.reshape(2, 7, 64).tolist()
+
+####################
+# BATCH EVALUATION #
+####################
+
+def board_bitboards(board: chess.Board) -> list[int]:
+    """The 14 piece masks of 'board' in table order (color, piece type)."""
+    masks = [0] * 14
+    for color in chess.COLORS:
+        for piece_type in chess.PIECE_TYPES:
+            masks[int(color) * 7 + piece_type] = board.pieces_mask(piece_type, color)
+    return masks
+
+def pack_bitboards(boards: Sequence[chess.Board]) -> np.ndarray:
+    """Pack positions as an (N, 2, 7) uint64 array for evaluate_batch."""
+    rows = [board_bitboards(board) for board in boards]
+    return np.array(rows, dtype=np.uint64).reshape(len(rows), 2, 7)
+
+def child_bitboards(board: chess.Board, moves: Sequence[chess.Move]) -> np.ndarray:
+    """
+    Packed bitboards of the positions after each of 'moves' (legal in
+    'board'), computed by editing the parent's masks instead of pushing
+    every move.
+    """
+    base = board_bitboards(board)
+    us = int(board.turn) * 7
+    them = 7 - us
+    piece_type_at = board.piece_type_at
+
+    rows = []
+    for move in moves:
+        masks = base[:]
+        from_sq = move.from_square
+        to_sq = move.to_square
+        piece_type = piece_type_at(from_sq)
+
+        if piece_type == chess.KING and board.is_castling(move):
+            rank = chess.square_rank(from_sq) * 8
+            if board.is_kingside_castling(move):
+                king_to, rook_from, rook_to = rank + 6, rank + 7, rank + 5
+            else:
+                king_to, rook_from, rook_to = rank + 2, rank, rank + 3
+            masks[us + chess.KING] ^= (1 << from_sq) | (1 << king_to)
+            masks[us + chess.ROOK] ^= (1 << rook_from) | (1 << rook_to)
+        else:
+            captured = piece_type_at(to_sq)
+            if captured is not None:
+                masks[them + captured] &= ~(1 << to_sq)
+            elif piece_type == chess.PAWN and to_sq == board.ep_square:
+                captured_sq = to_sq - 8 if board.turn == chess.WHITE else to_sq + 8
+                masks[them + chess.PAWN] &= ~(1 << captured_sq)
+            masks[us + piece_type] &= ~(1 << from_sq)
+            masks[us + (move.promotion or piece_type)] |= 1 << to_sq
+
+        rows.append(masks)
+
+    return np.array(rows, dtype=np.uint64).reshape(len(rows), 2, 7)
+
+def square_bits(bitboards: np.ndarray) -> np.ndarray:
+    """(N, 2, 7) uint64 bitboards -> (N, TABLE_SIZE) int32 0/1 occupancy."""
+    n = len(bitboards)
+    raw = np.ascontiguousarray(bitboards, dtype="<u8").view(np.uint8)
+    bits = np.unpackbits(raw.reshape(n, 14, 8), axis=2, bitorder="little")
+    return bits.reshape(n, TABLE_SIZE).astype(np.int32)
+
+class IncrementalEvaluator:
+    """
+    Running evaluation of one board.
+
+    Use push()/pop() instead of board.push()/board.pop() so the score
+    follows the board; each push records its score change on an undo stack.
+    """
+
+    def __init__(self, tables: np.ndarray = MATERIAL_TABLES):
+        self.table_array = tables
+        self.tables = _nested(tables)
+        self.score = 0  # White's point of view
+        self._undo: list[int] = []
+
+    def reset(self, board: chess.Board) -> None:
+        """Recompute the score of 'board' from scratch."""
+        tables = self.tables
+        score = 0
+        for square, piece in board.piece_map().items():
+            score += tables[piece.color][piece.piece_type][square]
+        self.score = score
+        self._undo.clear()
+
+    def evaluate(self, board: chess.Board) -> int:
+        """Score from the perspective of the side to move (mates not detected)."""
+        return self.score if board.turn == chess.WHITE else -self.score
+
+    def evaluate_batch(self, bitboards: np.ndarray) -> np.ndarray:
+        """
+        White-positive scores of N positions packed as (N, 2, 7) uint64
+        bitboards (see pack_bitboards / child_bitboards).
+        """
+        return square_bits(bitboards) @ self.table_array
+
+    def push(self, board: chess.Board, move: chess.Move) -> None:
+        """Play 'move' on 'board' and update the score."""
+        delta = self._delta(board, move) if move else 0
+        board.push(move)
+        self.score += delta
+        self._undo.append(delta)
+
+    def pop(self, board: chess.Board) -> chess.Move:
+        """Take back the last move on 'board' and restore the score."""
+        self.score -= self._undo.pop()
+        return board.pop()
+
+    def _delta(
+        self,
+        board: chess.Board,
+        move: chess.Move,
+        tables: list[list[list[int]]] | None = None,
+    ) -> int:
+        if tables is None:
+            tables = self.tables
+        turn = board.turn
+        mine = tables[turn]
+        from_sq = move.from_square
+        to_sq = move.to_square
+        piece_type = board.piece_type_at(from_sq)
+
+        if piece_type == chess.KING and board.is_castling(move):
+            rank = chess.square_rank(from_sq)
+            if board.is_kingside_castling(move):
+                king_to, rook_from, rook_to = 6, 7, 5
+            else:
+                king_to, rook_from, rook_to = 2, 0, 3
+            king_to = chess.square(king_to, rank)
+            rook_from = chess.square(rook_from, rank)
+            rook_to = chess.square(rook_to, rank)
+            rooks = mine[chess.ROOK]
+            kings = mine[chess.KING]
+            return (
+                kings[king_to] - kings[from_sq]
+                + rooks[rook_to] - rooks[rook_from]
+            )
+
+        moving = mine[piece_type]
+        delta = -moving[from_sq]
+        if move.promotion:
+            delta += mine[move.promotion][to_sq]
+        else:
+            delta += moving[to_sq]
+
+        theirs = tables[not turn]
+        captured = board.piece_type_at(to_sq)
+        if captured is not None:
+            delta -= theirs[captured][to_sq]
+        elif piece_type == chess.PAWN and to_sq == board.ep_square:
+            captured_sq = to_sq - 8 if turn == chess.WHITE else to_sq + 8
+            delta -= theirs[chess.PAWN][captured_sq]
+
+        return delta
+
+class TaperedEvaluator(IncrementalEvaluator):
+    """
+    Piece-square evaluation interpolated between middlegame and endgame
+    tables by game phase (sum of PHASE_WEIGHTS of the pieces on the board,
+    capped at TOTAL_PHASE):
+
+        score = (mg * phase + eg * (TOTAL_PHASE - phase)) // TOTAL_PHASE
+    """
+
+    def __init__(self, mg_tables: np.ndarray = MG_TABLES, eg_tables: np.ndarray = EG_TABLES):
+        super().__init__(mg_tables)
+        self.eg_array = eg_tables
+        self.eg_tables = _nested(eg_tables)
+        self.eg_score = 0
+        self.phase = 0
+        self._tapered_undo: list[tuple[int, int, int]] = []
+
+    def reset(self, board: chess.Board) -> None:
+        super().reset(board)
+        eg = self.eg_tables
+        eg_score = 0
+        phase = 0
+        for square, piece in board.piece_map().items():
+            eg_score += eg[piece.color][piece.piece_type][square]
+            phase += PHASE_WEIGHTS[piece.piece_type]
+        self.eg_score = eg_score
+        self.phase = phase
+        self._tapered_undo.clear()
+
+    def evaluate(self, board: chess.Board) -> int:
+        phase = min(self.phase, TOTAL_PHASE)
+        score = (
+            self.score * phase + self.eg_score * (TOTAL_PHASE - phase)
+        ) // TOTAL_PHASE
+        return score if board.turn == chess.WHITE else -score
+
+    def push(self, board: chess.Board, move: chess.Move) -> None:
+        if move:
+            mg = self._delta(board, move)
+            eg = self._delta(board, move, self.eg_tables)
+            phase = 0
+            captured = board.piece_type_at(move.to_square)
+            if captured is not None and board.color_at(move.to_square) != board.turn:
+                phase -= PHASE_WEIGHTS[captured]
+            if move.promotion:
+                phase += PHASE_WEIGHTS[move.promotion]
+        else:
+            mg = eg = phase = 0
+
+        board.push(move)
+        self.score += mg
+        self.eg_score += eg
+        self.phase += phase
+        self._tapered_undo.append((mg, eg, phase))
+
+    def evaluate_batch(self, bitboards: np.ndarray) -> np.ndarray:
+        bits = square_bits(bitboards)
+        mg = bits @ self.table_array
+        eg = bits @ self.eg_array
+        counts = bits.reshape(len(bits), 2, 7, 64).sum(axis=(1, 3))
+        phase = np.minimum(counts @ PHASE_BY_PIECE, TOTAL_PHASE)
+        return (mg * phase + eg * (TOTAL_PHASE - phase)) // TOTAL_PHASE
+
+    def pop(self, board: chess.Board) -> chess.Move:
+        mg, eg, phase = self._tapered_undo.pop()
+        self.score -= mg
+        self.eg_score -= eg
+        self.phase -= phase
+        return board.pop()
+
+# Evaluators selectable by name (MinimaxAgent's 'evaluator' parameter)
+EVALUATORS = {
+    "material": IncrementalEvaluator,
+    "tapered": TaperedEvaluator,
+}
+
+def make_evaluator(name: str) -> IncrementalEvaluator:
+    """
+    Construct an evaluator by name.
+
+    Raises
+    ------
+    KeyError
+        If the given name is not registered.
+    """
+    if name not in EVALUATORS:
+        raise KeyError(
+            f"Unknown evaluator '{name}'. "
+            f"Available evaluators: {list(EVALUATORS.keys())}"
+        )
+    return EVALUATORS[name]()
@@ -0,0 +1,387 @@
+"""
+Monte Carlo Tree Search
+-----------------------
+
+Building blocks of MonteCarloTreeSearchAgent, shared with its parallel
+modes (chess_ai.search.mcts_parallel):
+
+- NodePool: the tree in flat numpy arrays indexed by node number (visit
+  counts, result sums, the move leading to the node and the range of its
+  children, always allocated as one contiguous block). A node takes a few
+  dozen bytes, and UCT scores all children of a node in one vectorized
+  expression. SharedNodePool is the same tree in shared memory, for
+  several processes to search at once.
+- rollout policies, which play a game on from a leaf and report the result,
+- playout(): one selection / expansion / rollout / backpropagation cycle,
+  optionally with virtual loss, so concurrent playouts on a shared tree
+  spread out over different lines instead of all taking the same one.
+"""
+
+from __future__ import annotations
+
+import math
+import random
+from contextlib import nullcontext
+from multiprocessing import shared_memory
+from typing import Callable
+
+import chess
+import numpy as np
+
+from chess_ai.core.moves import decode_move, encode_move
+from chess_ai.search.evaluation import IncrementalEvaluator
+from chess_ai.search.position import MAX_UNDO, Position
+
+ROLLOUT_SCALE = 400  # centipawns for a ~73% expected result at a rollout cut-off
+
+#############
+# NODE POOL #
+#############
+
+class NodePool:
+    """
+    MCTS tree in parallel arrays. Node 0 is the root. A node's children
+    are the block first_child[n] .. first_child[n] + child_count[n];
+    first_child is -1 while the node is unexpanded (a node expanded with no
+    children is terminal). value[n] sums playout results (1 win, 0.5 draw,
+    0 loss) for the player who made the move leading to n.
+    """
+
+    def __init__(self, capacity: int = 4096, max_nodes: int = 2**20):
+        self.max_nodes = max_nodes
+        capacity = min(capacity, max_nodes)
+        self.visits = np.zeros(capacity, dtype=np.float64)
+        self.value = np.zeros(capacity, dtype=np.float64)
+        self.first_child = np.full(capacity, -1, dtype=np.int32)
+        self.child_count = np.zeros(capacity, dtype=np.int32)
+        self.move = np.zeros(capacity, dtype=np.uint16)
+        self.size = 1  # the root
+
+    @property
+    def capacity(self) -> int:
+        return len(self.visits)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the arrays."""
+        return sum(a.nbytes for a in (self.visits, self.value, self.first_child, self.child_count, self.move))
+
+    def _grow(self, needed: int) -> None:
+        capacity = self.capacity
+        while capacity < needed:
+            capacity *= 2
+        capacity = min(capacity, self.max_nodes)
+        extra = capacity - self.capacity
+        self.visits = np.concatenate([self.visits, np.zeros(extra)])
+        self.value = np.concatenate([self.value, np.zeros(extra)])
+        self.first_child = np.concatenate([self.first_child, np.full(extra, -1, dtype=np.int32)])
+        self.child_count = np.concatenate([self.child_count, np.zeros(extra, dtype=np.int32)])
+        self.move = np.concatenate([self.move, np.zeros(extra, dtype=np.uint16)])
+
+    def expand(self, node: int, moves: list[chess.Move]) -> bool:
+        """
+        Give 'node' one child per move. Returns False (leaving the node
+        unexpanded) if the pool is full.
+        """
+        start = self.size
+        end = start + len(moves)
+        if end > self.capacity:
+            if end > self.max_nodes:
+                return False
+            self._grow(end)
+        self.move[start:end] = [encode_move(m) for m in moves]
+        self.child_count[node] = len(moves)
+        self.first_child[node] = start  # last: readers of shared pools check it first
+        self.size = end
+        return True
+
+    def children(self, node: int) -> range:
+        first = self.first_child[node]
+        return range(first, first + self.child_count[node]) if first >= 0 else range(0)
+
+    def child_for(self, node: int, move: chess.Move) -> int | None:
+        """The child of 'node' reached by 'move', if the node is expanded."""
+        first = self.first_child[node]
+        if first < 0:
+            return None
+        block = self.move[first:first + self.child_count[node]]
+        found = np.flatnonzero(block == encode_move(move))
+        return int(first + found[0]) if len(found) else None
+
+    def select(self, node: int, exploration: float) -> int:
+        """UCT choice among the children of expanded 'node' (unvisited ones first)."""
+        first = self.first_child[node]
+        end = first + self.child_count[node]
+        visits = self.visits[first:end]
+        unvisited = np.flatnonzero(visits == 0)
+        if len(unvisited):
+            return int(first + unvisited[0])
+        scores = self.value[first:end] / visits + exploration * np.sqrt(
+            math.log(self.visits[node]) / visits
+        )
+        return int(first + np.argmax(scores))
+
+    def subtree(self, node: int) -> "NodePool":
+        """Copy of the subtree under 'node' (as the new root), in a fresh pool."""
+        pool = NodePool(max(4096, self.size), self.max_nodes)
+        pool.visits[0] = self.visits[node]
+        pool.value[0] = self.value[node]
+
+        queue = [(node, 0)]
+        size = 1
+        while queue:
+            old, new = queue.pop()
+            first, count = self.first_child[old], self.child_count[old]
+            if first < 0:
+                continue
+            pool.first_child[new] = size
+            pool.child_count[new] = count
+            block = slice(first, first + count)
+            target = slice(size, size + count)
+            pool.visits[target] = self.visits[block]
+            pool.value[target] = self.value[block]
+            pool.move[target] = self.move[block]
+            for i in np.flatnonzero(self.first_child[block] >= 0):
+                queue.append((first + int(i), size + int(i)))
+            size += count
+        pool.size = size
+        return pool
+
+class SharedNodePool(NodePool):
+    """
+    NodePool in a multiprocessing.shared_memory block, with a fixed
+    capacity of max_nodes, for several processes to search at once.
+
+    Create it in the parent with SharedNodePool(max_nodes) and open it in
+    workers with SharedNodePool.attach(name, max_nodes). The creator owns
+    the block and frees it with unlink(). Expansions must hold a lock
+    shared by all processes (see playout()); visit and result updates
+    don't, so concurrent playouts may now and then lose one.
+    """
+
+    _ARRAYS = (
+        ("visits", np.float64),
+        ("value", np.float64),
+        ("first_child", np.int32),
+        ("child_count", np.int32),
+        ("move", np.uint16),
+    )
+
+    def __init__(self, max_nodes: int = 2**20, name: str | None = None):
+        self.max_nodes = max_nodes
+        nbytes = 8 + sum(np.dtype(dtype).itemsize for _, dtype in self._ARRAYS) * max_nodes
+        if name is None:
+            self._shm = shared_memory.SharedMemory(create=True, size=nbytes)
+            self.owner = True
+        else:
+            self._shm = shared_memory.SharedMemory(name=name)
+            self.owner = False
+
+        buf = self._shm.buf
+        self._size = np.ndarray((1,), dtype=np.int64, buffer=buf)
+        offset = 8
+        for attr, dtype in self._ARRAYS:
+            setattr(self, attr, np.ndarray((max_nodes,), dtype=dtype, buffer=buf, offset=offset))
+            offset += np.dtype(dtype).itemsize * max_nodes
+
+        if self.owner:
+            self.visits.fill(0)
+            self.value.fill(0)
+            self.first_child.fill(-1)
+            self.child_count.fill(0)
+            self.move.fill(0)
+            self.size = 1
+
+    @classmethod
+    def attach(cls, name: str, max_nodes: int) -> "SharedNodePool":
+        """Open a pool created by another process."""
+        return cls(max_nodes, name=name)
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    @property
+    def size(self) -> int:
+        return int(self._size[0])
+
+    @size.setter
+    def size(self, value: int) -> None:
+        self._size[0] = value
+
+    def load(self, pool: NodePool) -> None:
+        """Replace the tree with a copy of 'pool' (e.g. a reused subtree)."""
+        used, size = self.size, min(pool.size, self.max_nodes)
+        for attr, _ in self._ARRAYS:
+            getattr(self, attr)[:size] = getattr(pool, attr)[:size]
+        if used > size:
+            self.visits[size:used] = 0
+            self.value[size:used] = 0
+            self.first_child[size:used] = -1
+            self.child_count[size:used] = 0
+            self.move[size:used] = 0
+        self.size = size
+
+    def close(self) -> None:
+        """Detach this process from the block."""
+        for attr, _ in self._ARRAYS:
+            setattr(self, attr, None)
+        self._size = None
+        self._shm.close()
+
+    def unlink(self) -> None:
+        """Detach and free the block (creator only)."""
+        self.close()
+        if self.owner:
+            self._shm.unlink()
+
+############
+# ROLLOUTS #
+############
+
+def _terminal_result(board: Position, moves: list[chess.Move]) -> float | None:
+    """Result for the side to move if the game is over, else None."""
+    if not moves:
+        return 0.0 if board.is_check() else 0.5
+    if board.halfmove_clock >= 100 or board.is_insufficient_material():
+        return 0.5
+    return None
+
+def _cutoff_result(board: Position, evaluator: IncrementalEvaluator) -> float:
+    """Expected result for the side to move from the static evaluation."""
+    return 1 / (1 + math.exp(-evaluator.evaluate(board) / ROLLOUT_SCALE))
+
+def _playout(
+    board: Position,
+    evaluator: IncrementalEvaluator,
+    rng: random.Random,
+    max_plies: int,
+    pick: Callable[[Position, random.Random], chess.Move | None],
+) -> float:
+    """
+    Play up to 'max_plies' moves chosen by 'pick' (None: no legal moves)
+    and take them back. Returns the result for the side to move at the start.
+    """
+    plies = 0
+    try:
+        while True:
+            if board.halfmove_clock >= 100 or board.is_insufficient_material():
+                result = 0.5
+            elif plies >= max_plies:
+                if next(board.generate_legal_moves(), None) is None:
+                    result = 0.0 if board.is_check() else 0.5
+                else:
+                    result = _cutoff_result(board, evaluator)
+            else:
+                move = pick(board, rng)
+                if move is not None:
+                    evaluator.push(board, move)
+                    plies += 1
+                    continue
+                result = 0.0 if board.is_check() else 0.5
+            # Back to the starting side's point of view
+            return result if plies % 2 == 0 else 1 - result
+    finally:
+        for _ in range(plies):
+            evaluator.pop(board)
+
+def _pick_random(board: Position, rng: random.Random) -> chess.Move | None:
+    return board.random_legal_move(rng)
+
+def _pick_capture(board: Position, rng: random.Random) -> chess.Move | None:
+    """A random capture or promotion if there is one, else any random move."""
+    moves = list(board.generate_legal_moves())
+    if not moves:
+        return None
+    noisy = [m for m in moves if m.promotion or board.is_capture(m)]
+    return rng.choice(noisy or moves)
+
+def random_rollout(board, evaluator, rng, max_plies):
+    """Uniformly random moves."""
+    return _playout(board, evaluator, rng, max_plies, _pick_random)
+
+def capture_rollout(board, evaluator, rng, max_plies):
+    """Random captures and promotions while there are any, random moves otherwise."""
+    return _playout(board, evaluator, rng, max_plies, _pick_capture)
+
+def eval_rollout(board, evaluator, rng, max_plies):
+    """No playout: the static evaluation of the leaf (game end still detected)."""
+    return _playout(board, evaluator, rng, 0, _pick_random)
+
+# Rollout policies selectable by name (the agent's 'rollout' parameter)
+ROLLOUT_POLICIES = {
+    "random": random_rollout,
+    "captures": capture_rollout,
+    "eval": eval_rollout,
+}
+
+############
+# PLAYOUTS #
+############
+
+def playout(
+    pool: NodePool,
+    board: Position,
+    evaluator: IncrementalEvaluator,
+    rng: random.Random,
+    exploration: float,
+    rollout: Callable[[Position, IncrementalEvaluator, random.Random, int], float],
+    rollout_depth: int,
+    virtual_loss: float = 0.0,
+    lock=None,
+) -> None:
+    """
+    One selection / expansion / rollout / backpropagation cycle from the
+    root of 'pool', which stands for 'board' (an evaluator-tracked Position,
+    left as it was found).
+
+    With 'virtual_loss', every node on the selected path counts that many
+    extra lost visits until the playout's result comes in, steering other
+    playouts running on the same tree elsewhere. 'lock' (shared trees)
+    guards node expansion.
+    """
+    max_tree_plies = MAX_UNDO - rollout_depth - 1
+
+    node = 0
+    path = [0]
+    if virtual_loss:
+        pool.visits[0] += virtual_loss
+    # Selection
+    while pool.first_child[node] >= 0 and pool.child_count[node] and len(path) < max_tree_plies:
+        node = pool.select(node, exploration)
+        if virtual_loss:
+            pool.visits[node] += virtual_loss
+        evaluator.push(board, decode_move(int(pool.move[node])))
+        path.append(node)
+
+    # Expansion: leaves get their children on their second visit
+    if pool.first_child[node] < 0 and (node == 0 or pool.visits[node] > virtual_loss):
+        moves = list(board.generate_legal_moves())
+        if node and _terminal_result(board, moves) is not None:
+            # Game over: expanded with no children. Not the root, whose
+            # moves are searched whenever there are any, e.g. once the
+            # 50-move rule could be claimed, but hasn't been
+            moves = []
+        # Shuffled, so unvisited children are tried in random order
+        rng.shuffle(moves)
+        with lock or nullcontext():
+            # Another process may have expanded it meanwhile
+            expanded = pool.first_child[node] < 0 and pool.expand(node, moves)
+        if expanded and moves:
+            node = int(pool.first_child[node])
+            if virtual_loss:
+                pool.visits[node] += virtual_loss
+            evaluator.push(board, moves[0])
+            path.append(node)
+
+    # Rollout, for the side to move at the leaf
+    result = rollout(board, evaluator, rng, rollout_depth)
+
+    # Backpropagation: each node is credited for the player who moved into it
+    visit = 1 - virtual_loss
+    for node in reversed(path):
+        result = 1 - result
+        pool.visits[node] += visit
+        pool.value[node] += result
+    for _ in range(len(path) - 1):
+        evaluator.pop(board)
@@ -0,0 +1,287 @@
+"""
+Parallel Monte Carlo Tree Search
+--------------------------------
+
+Multi-process playouts for MonteCarloTreeSearchAgent, in two flavours.
+
+Tree parallel: the tree is a SharedNodePool in shared memory and every
+worker runs playouts on it at the same time. Each playout puts a virtual
+loss on the nodes it walks through until its result is in, so concurrent
+playouts fan out over different lines instead of piling onto the current
+favourite; expanding a node takes a lock shared by all workers. The parent
+loads the tree to start from (the previous move's subtree, when reused)
+and reads the root statistics once the workers are done.
+
+Root parallel: every worker grows a tree of its own from the same root,
+with its own random seed, and the parent adds up the visits and results of
+the root moves over all trees. Nothing is shared while searching, so it
+scales without contention, but the trees share no knowledge below the root
+and aren't kept between moves.
+
+Process pools (and the shared tree) are created once per TreeParallel /
+RootParallel instance and reused across moves, so process start-up is only
+paid on the first one.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import random
+import time
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+
+import chess
+
+from chess_ai.core.moves import decode_move
+from chess_ai.search.evaluation import make_evaluator
+from chess_ai.search.mcts import ROLLOUT_POLICIES, NodePool, SharedNodePool, playout
+from chess_ai.search.position import Position
+
+##################
+# WORKER PROCESS #
+##################
+
+# Per-process state, set up by _init_tree_worker
+_worker_pool: SharedNodePool | None = None
+_worker_lock = None
+
+def _init_tree_worker(name: str, max_nodes: int, lock) -> None:
+    global _worker_pool, _worker_lock
+    _worker_pool = SharedNodePool.attach(name, max_nodes)
+    _worker_lock = lock
+
+def run_playouts(
+    pool: NodePool,
+    board: chess.Board,
+    settings: dict,
+    playouts: int | None,
+    time_limit_ms: float | None,
+    seed: int,
+    virtual_loss: float = 0.0,
+    lock=None,
+) -> int:
+    """
+    Playouts on 'pool' (whose root is 'board') until 'playouts' are done or
+    'time_limit_ms' has passed (at least one runs). 'settings' holds the agent's exploration,
+    rollout, rollout_depth and evaluator. Returns the number of playouts.
+    """
+    deadline = None
+    if time_limit_ms is not None:
+        deadline = time.perf_counter() + time_limit_ms / 1000
+
+    position = Position.from_board(board)
+    evaluator = make_evaluator(settings["evaluator"])
+    evaluator.reset(position)
+    rng = random.Random(seed)
+    rollout = ROLLOUT_POLICIES[settings["rollout"]]
+
+    done = 0
+    while playouts is None or done < playouts:
+        if done and deadline is not None and time.perf_counter() >= deadline:
+            break
+        playout(
+            pool, position, evaluator, rng,
+            settings["exploration"], rollout, settings["rollout_depth"],
+            virtual_loss, lock,
+        )
+        done += 1
+    return done
+
+def _tree_job(board, settings, playouts, time_limit_ms, seed) -> int:
+    return run_playouts(
+        _worker_pool, board, settings, playouts, time_limit_ms, seed,
+        settings["virtual_loss"], _worker_lock,
+    )
+
+def _root_job(board, settings, playouts, time_limit_ms, seed) -> dict:
+    pool = NodePool(max_nodes=settings["max_nodes"])
+    done = run_playouts(pool, board, settings, playouts, time_limit_ms, seed)
+    children = slice(pool.first_child[0], pool.first_child[0] + pool.child_count[0])
+    return {
+        "playouts": done,
+        "moves": pool.move[children].tolist(),
+        "visits": pool.visits[children].tolist(),
+        "value": pool.value[children].tolist(),
+    }
+
+def _shutdown(executor: ProcessPoolExecutor, pool: SharedNodePool | None) -> None:
+    executor.shutdown(wait=True, cancel_futures=True)
+    if pool is not None:
+        pool.unlink()
+
+def _shares(playouts: int | None, workers: int) -> list[int | None]:
+    """Split a playout budget as evenly as possible (None: no budget)."""
+    if playouts is None:
+        return [None] * workers
+    return [playouts // workers + (i < playouts % workers) for i in range(workers)]
+
+##################
+# PARENT PROCESS #
+##################
+
+class TreeParallel:
+    """Process pool plus shared node pool for tree-parallel MCTS."""
+
+    def __init__(self, workers: int, max_nodes: int = 2**20):
+        self.workers = workers
+        self.pool = SharedNodePool(max_nodes)
+
+        mp_context = multiprocessing.get_context()
+        self._executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=mp_context,
+            initializer=_init_tree_worker,
+            initargs=(self.pool.name, max_nodes, mp_context.Lock()),
+        )
+        self._finalizer = weakref.finalize(self, _shutdown, self._executor, self.pool)
+
+    def close(self) -> None:
+        """Stop the workers and free the shared tree."""
+        self._finalizer()
+
+    def search(
+        self,
+        board: chess.Board,
+        tree: NodePool,
+        settings: dict,
+        playouts: int | None,
+        time_limit_ms: float | None,
+        seed: int,
+    ) -> tuple[NodePool, int]:
+        """
+        Grow 'tree' (loaded into the shared pool unless it already is it)
+        with all workers. Returns the shared pool and the playouts done.
+        """
+        if tree is not self.pool:
+            self.pool.load(tree)
+        futures = [
+            self._executor.submit(_tree_job, board, settings, share, time_limit_ms, seed + i)
+            for i, share in enumerate(_shares(playouts, self.workers))
+        ]
+        return self.pool, sum(f.result() for f in futures)
+
+class RootParallel:
+    """Process pool for root-parallel MCTS (one tree per worker)."""
+
+    def __init__(self, workers: int, max_nodes: int = 2**20):
+        self.workers = workers
+        self.pool = None  # trees live in the workers
+
+        mp_context = multiprocessing.get_context()
+        self._executor = ProcessPoolExecutor(max_workers=workers, mp_context=mp_context)
+        self._finalizer = weakref.finalize(self, _shutdown, self._executor, None)
+
+    def close(self) -> None:
+        """Stop the workers."""
+        self._finalizer()
+
+    def search(
+        self,
+        board: chess.Board,
+        tree: NodePool,
+        settings: dict,
+        playouts: int | None,
+        time_limit_ms: float | None,
+        seed: int,
+    ) -> tuple[NodePool, int]:
+        """
+        Grow one tree per worker from 'board' ('tree' is not used) and
+        return a one-level tree with the root moves' merged statistics,
+        plus the playouts done.
+        """
+        futures = [
+            self._executor.submit(_root_job, board, settings, share, time_limit_ms, seed + i)
+            for i, share in enumerate(_shares(playouts, self.workers))
+        ]
+
+        merged: dict[int, list[float]] = {}
+        done = 0
+        for future in futures:
+            result = future.result()
+            done += result["playouts"]
+            for code, visits, value in zip(result["moves"], result["visits"], result["value"]):
+                totals = merged.setdefault(code, [0.0, 0.0])
+                totals[0] += visits
+                totals[1] += value
+
+        codes = list(merged)
+        pool = NodePool(capacity=len(codes) + 1)
+        pool.expand(0, [decode_move(code) for code in codes])
+        first = pool.first_child[0]
+        for i, code in enumerate(codes):
+            pool.visits[first + i], pool.value[first + i] = merged[code]
+        pool.visits[0] = done
+        return pool, done
+
+# Parallel modes selectable by name (MonteCarloTreeSearchAgent's 'parallel' parameter)
+PARALLEL_MODES = {
+    "tree": TreeParallel,
+    "root": RootParallel,
+}
+
+###############
+# BENCHMARKS  #
+###############
+
+def measure_scaling(
+    fen: str = chess.STARTING_FEN,
+    max_workers: int = 4,
+    time_limit_ms: int = 1000,
+    mode: str = "tree",
+    **agent_kwargs,
+) -> list[dict[str, float]]:
+    """
+    Run MCTS on 'fen' for a fixed time with 1..max_workers workers of
+    parallel mode 'mode' (a PARALLEL_MODES key; one worker searches
+    in-process) and report playouts, playouts/sec and the speedup over
+    one worker.
+
+    The first search of each agent is a warm-up (process start-up) and is
+    not measured.
+    """
+    from chess_ai.agents.mcts_agent import MonteCarloTreeSearchAgent
+    from chess_ai.core.game import ChessGame
+
+    rows = []
+    for workers in range(1, max_workers + 1):
+        agent = MonteCarloTreeSearchAgent(
+            playouts=None,
+            time_limit_ms=time_limit_ms,
+            workers=workers,
+            parallel=mode,
+            reuse_tree=False,
+            **agent_kwargs,
+        )
+        try:
+            agent.time_limit_ms = 50
+            agent.choose_move(ChessGame(board=chess.Board(fen)))
+            agent.time_limit_ms = time_limit_ms
+            agent.choose_move(ChessGame(board=chess.Board(fen)))
+        finally:
+            agent.close()
+
+        rows.append({
+            "workers": workers,
+            "playouts": agent.last_playouts,
+            "playouts_per_sec": agent.last_playouts / agent.elapsed_ms * 1000,
+        })
+
+    base = rows[0]["playouts_per_sec"] or 1.0
+    for row in rows:
+        row["speedup"] = row["playouts_per_sec"] / base
+    return rows
+
+if __name__ == "__main__":
+    # python -m chess_ai.search.mcts_parallel [MAX_WORKERS] [MODE] [ROLLOUT]
+    import sys
+
+    max_workers = int(sys.argv[1]) if len(sys.argv) > 1 else multiprocessing.cpu_count()
+    mode = sys.argv[2] if len(sys.argv) > 2 else "tree"
+    rollout = sys.argv[3] if len(sys.argv) > 3 else "random"
+    print(f"{'workers':>7} {'playouts':>9} {'playouts/s':>10} {'speedup':>7}")
+    for row in measure_scaling(max_workers=max_workers, mode=mode, rollout=rollout):
+        print(
+            f"{row['workers']:>7} {row['playouts']:>9} "
+            f"{row['playouts_per_sec']:>10.0f} {row['speedup']:>7.2f}"
+        )
@@ -0,0 +1,90 @@
+"""
+Staged Move Generation
+----------------------
+
+Most nodes of an alpha-beta search are cut off by one of their first moves,
+usually the hash move or a capture. Generating and sorting every legal move
+up front wastes the work spent on quiet moves that are never searched.
+
+staged_moves() hands out a node's moves in the same order as
+MoveOrderer.order(), but generates them in stages, each only when the
+search asks for a move past the previous one:
+
+1. the hash move, after a legality check (nothing generated yet),
+2. captures and promotions, MVV-LVA order,
+3. the killer moves for this ply, after a legality check,
+4. the remaining quiet moves, in history order.
+
+Works on chess.Board and on Position.
+"""
+
+from __future__ import annotations
+
+from typing import Iterator
+
+import chess
+
+from chess_ai.search.ordering import MoveOrderer
+
+def noisy_moves(board: chess.Board) -> list[chess.Move]:
+    """Legal captures plus quiet promotions."""
+    moves = list(board.generate_legal_captures())
+
+    if board.turn == chess.WHITE:
+        from_mask, to_mask = chess.BB_RANK_7, chess.BB_RANK_8
+    else:
+        from_mask, to_mask = chess.BB_RANK_2, chess.BB_RANK_1
+    from_mask &= board.pawns & board.occupied_co[board.turn]
+    if from_mask:
+        moves.extend(
+            board.generate_legal_moves(from_mask, to_mask & ~board.occupied)
+        )
+
+    return moves
+
+def quiet_moves(board: chess.Board) -> list[chess.Move]:
+    """Legal moves that are neither captures nor promotions (castling included)."""
+    return [
+        move
+        for move in board.generate_legal_moves(chess.BB_ALL, ~board.occupied_co[not board.turn])
+        if not move.promotion and not board.is_en_passant(move)
+    ]
+
+def _is_quiet(board: chess.Board, move: chess.Move) -> bool:
+    return not move.promotion and not board.is_capture(move)
+
+def staged_moves(
+    board: chess.Board,
+    orderer: MoveOrderer,
+    ply: int,
+    hash_move: chess.Move | None = None,
+) -> Iterator[chess.Move]:
+    """
+    Yield the legal moves of 'board', best first, generating each stage
+    lazily. The caller may push and pop moves between iterations as long
+    as 'board' is back to the same position when it asks for the next one.
+    """
+    if hash_move and board.is_legal(hash_move):
+        yield hash_move
+    else:
+        hash_move = None
+
+    for move in orderer.order(board, noisy_moves(board), ply):
+        if move != hash_move:
+            yield move
+
+    killers = orderer.killers[ply] if ply <= orderer.max_ply else (None, None)
+    searched = [hash_move]
+    for killer in killers:
+        if (
+            killer
+            and killer not in searched
+            and _is_quiet(board, killer)
+            and board.is_legal(killer)
+        ):
+            searched.append(killer)
+            yield killer
+
+    for move in orderer.order(board, quiet_moves(board), ply):
+        if move not in searched:
+            yield move
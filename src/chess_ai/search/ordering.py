@@ -0,0 +1,126 @@
+"""
+Move Ordering
+-------------
+
+Alpha-beta prunes the most when the best move is searched first. This module
+sorts the legal moves of a node so the likeliest good moves come first:
+
+1. the hash move (from the transposition table or the previous PV),
+2. captures, most valuable victim / least valuable attacker (MVV-LVA) first,
+3. quiet promotions, queen first,
+4. the two killer moves for this ply (quiet moves that caused a beta cutoff
+   in a sibling node),
+5. remaining quiet moves by their history score (butterfly table indexed
+   by side, from-square and to-square, bumped on every quiet cutoff).
+"""
+
+from __future__ import annotations
+
+import chess
+
+# Score bands, far enough apart that a band never overlaps the next one
+HASH_MOVE_SCORE = 1_000_000_000
+CAPTURE_SCORE = 100_000_000
+PROMOTION_SCORE = 90_000_000
+KILLER_SCORES = (80_000_000, 79_000_000)
+HISTORY_MAX = 50_000_000  # history is halved when any entry passes this
+
+def mvv_lva(board: chess.Board, move: chess.Move) -> int:
+    """
+    Capture ordering key: victim value first, then cheapest attacker.
+    Returns -1 for non-captures.
+    """
+    victim = board.piece_type_at(move.to_square)
+    if victim is None:
+        if not board.is_en_passant(move):
+            return -1
+        victim = chess.PAWN
+    return victim * 16 - board.piece_type_at(move.from_square)
+
+class MoveOrderer:
+    """
+    Killer and history tables for one agent, plus the sorting logic.
+
+    The tables carry over between iterations of the same search (that is the
+    point) and are aged between searches with new_search().
+    """
+
+    def __init__(self, max_ply: int = 64):
+        self.max_ply = max_ply
+        self.killers: list[list[chess.Move | None]] = [
+            [None, None] for _ in range(max_ply + 1)
+        ]
+        # history[color][from_square * 64 + to_square]
+        self.history: list[list[int]] = [[0] * 4096, [0] * 4096]
+
+    def new_search(self) -> None:
+        """Forget killers (positions changed) and halve the history scores."""
+        for slot in self.killers:
+            slot[0] = slot[1] = None
+        for table in self.history:
+            for i, value in enumerate(table):
+                if value:
+                    table[i] = value >> 1
+
+    def order(
+        self,
+        board: chess.Board,
+        moves: list[chess.Move],
+        ply: int,
+        hash_move: chess.Move | None = None,
+    ) -> list[chess.Move]:
+        """Return 'moves' (legal in 'board') sorted best-first."""
+        killers = self.killers[ply] if ply <= self.max_ply else (None, None)
+        history = self.history[board.turn]
+
+        def score(move: chess.Move) -> int:
+            if move == hash_move:
+                return HASH_MOVE_SCORE
+
+            capture = mvv_lva(board, move)
+            if capture >= 0:
+                s = CAPTURE_SCORE + capture
+                if move.promotion:
+                    s += move.promotion
+                return s
+
+            if move.promotion:
+                return PROMOTION_SCORE + move.promotion
+
+            if move == killers[0]:
+                return KILLER_SCORES[0]
+            if move == killers[1]:
+                return KILLER_SCORES[1]
+
+            return history[move.from_square * 64 + move.to_square]
+
+        return sorted(moves, key=score, reverse=True)
+
+    def record_cutoff(
+        self,
+        board: chess.Board,
+        move: chess.Move,
+        depth: int,
+        ply: int,
+    ) -> None:
+        """
+        Note that 'move' caused a beta cutoff at 'board' (before the move
+        is pushed). Only quiet moves are remembered; captures and promotions
+        are already ordered well.
+        """
+        if move.promotion or board.is_capture(move):
+            return
+
+        if ply <= self.max_ply:
+            slot = self.killers[ply]
+            if slot[0] != move:
+                slot[1] = slot[0]
+                slot[0] = move
+
+        table = self.history[board.turn]
+        index = move.from_square * 64 + move.to_square
+        table[index] += depth * depth
+        if table[index] > HISTORY_MAX:
+            for t in self.history:
+                for i, value in enumerate(t):
+                    t[i] = value >> 1
@@ -0,0 +1,416 @@
+"""
+Parallel Search
+---------------
+
+Multi-process search for MinimaxAgent, in two flavours.
+
+Lazy SMP: every worker process runs its own iterative deepening on the same
+root position. The workers don't divide the tree explicitly; they share one
+transposition table in shared memory, so whatever one of them has searched
+the others can reuse, and staggered start depths keep them from walking the
+tree in lock-step. The main worker (index 0) always completes its first
+iteration; when it finishes, the helpers are told to stop and the deepest
+completed result wins (the main worker's on ties).
+
+Root split: the parent runs iterative deepening and hands the root moves of
+each iteration to the pool, one job per move. The first move is searched
+alone to establish a score; the others then run in parallel against a
+shared alpha bound (a multiprocessing.Value), so every job prunes against
+the best score any worker has found so far. Each worker keeps its own
+transposition table. The result has the serial search's score; among moves
+tied on it, the first in legal move order is played, so searching the same
+position again plays the same move, though not always the one a serial
+search picks from the tie.
+
+Process pools (and the shared table) are created once per LazySMP/RootSplit
+instance and reused across searches, so process start-up is only paid on
+the first move.
+"""
+
+from __future__ import annotations
+
+import math
+import multiprocessing
+import time
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from typing import NamedTuple
+
+import chess
+
+from chess_ai.search.ordering import MoveOrderer
+from chess_ai.search.shared_tt import SharedTranspositionTable
+
+##################
+# WORKER PROCESS #
+##################
+
+# Per-process state, set up by _init_worker / _init_root_split_worker
+_worker_tt: SharedTranspositionTable | None = None
+_worker_stop = None
+_worker_alpha = None
+_worker_agents: dict = {}
+
+# Search budgets, set on a worker's agent for each job rather than keying
+# its agent, so searches with different budgets share one agent and table
+_BUDGET_KWARGS = ("depth", "max_depth", "time_limit_ms", "node_limit")
+
+def _init_worker(tt_name: str, tt_size: int, stop_event) -> None:
+    global _worker_tt, _worker_stop
+    _worker_tt = SharedTranspositionTable.attach(tt_name, tt_size)
+    _worker_stop = stop_event
+    _worker_agents.clear()
+
+def _init_root_split_worker(shared_alpha) -> None:
+    global _worker_alpha
+    _worker_alpha = shared_alpha
+    _worker_agents.clear()
+
+def _worker_agent(agent_kwargs: dict):
+    """
+    One agent per configuration and process, so killers, history and (for
+    root split) the transposition table persist between jobs. The budget
+    in 'agent_kwargs' is set on the agent for the job at hand.
+    """
+    from chess_ai.agents.minimax_agent import MinimaxAgent
+
+    key = tuple(sorted(
+        (name, value) for name, value in agent_kwargs.items() if name not in _BUDGET_KWARGS
+    ))
+    agent = _worker_agents.get(key)
+    if agent is None:
+        if _worker_tt is not None:
+            agent = MinimaxAgent(**agent_kwargs, use_transposition_table=False)
+            agent.tt = _worker_tt
+        else:
+            agent = MinimaxAgent(**agent_kwargs)
+        _worker_agents[key] = agent
+    for name in _BUDGET_KWARGS:
+        if name in agent_kwargs:
+            setattr(agent, name, agent_kwargs[name])
+    return agent
+
+def _lazy_smp_job(
+    board: chess.Board,
+    agent_kwargs: dict,
+    generation: int,
+    start_depth: int,
+    depth_offset: int,
+    helper: bool,
+) -> dict:
+    agent = _worker_agent(agent_kwargs)
+    tt = _worker_tt
+    tt.generation = generation
+    tt.reset_stats()
+
+    max_depth = agent.max_depth if agent.time_managed else agent.depth
+    move, value = agent.iterative_deepening(
+        agent.prepare_board(board),
+        list(board.legal_moves),
+        start_depth=start_depth,
+        max_depth=max_depth + depth_offset,
+        complete_first=not helper,
+        should_stop=_worker_stop.is_set if helper else None,
+    )
+
+    return {
+        "move": move.uci() if move is not None else None,
+        "value": value,
+        "depth": agent.completed_depth,
+        "pv": [m.uci() for m in agent.pv],
+        "nodes": agent.nodes,
+        "qnodes": agent.qnodes,
+        "cutoffs": (agent.beta_cutoffs, agent.first_move_cutoffs),
+        "tt": (tt.hits, tt.misses, tt.collisions, tt.stores),
+    }
+
+def _root_split_job(
+    board: chess.Board,
+    move: chess.Move,
+    depth: int,
+    agent_kwargs: dict,
+    time_left_ms: float | None,
+) -> dict:
+    agent = _worker_agent(agent_kwargs)
+    shared_alpha = _worker_alpha
+
+    deadline = None
+    if time_left_ms is not None:
+        deadline = time.perf_counter() + time_left_ms / 1000
+
+    # Searched just below the shared bound, so a move that ties the best
+    # score so far comes back exact and the parent can break the tie
+    alpha = math.nextafter(shared_alpha.value, -math.inf)
+    value = agent.search_root_move(agent.prepare_board(board), move, depth, alpha, deadline)
+
+    if value is not None and value > shared_alpha.value:
+        with shared_alpha.get_lock():
+            if value > shared_alpha.value:
+                shared_alpha.value = value
+
+    return {
+        "move": move.uci(),
+        "value": value,
+        # A score at or below the bound it was searched against is only an upper bound
+        "exact": value is not None and value > alpha,
+        "nodes": agent.nodes,
+        "qnodes": agent.qnodes,
+        "cutoffs": (agent.beta_cutoffs, agent.first_move_cutoffs),
+    }
+
+def _shutdown(pool: ProcessPoolExecutor, tt: SharedTranspositionTable | None) -> None:
+    pool.shutdown(wait=True, cancel_futures=True)
+    if tt is not None:
+        tt.unlink()
+
+##################
+# PARENT PROCESS #
+##################
+
+class ParallelResult(NamedTuple):
+    move: chess.Move | None
+    value: float | None
+    depth: int
+    nodes: int
+    qnodes: int
+    elapsed: float
+    pv: tuple[chess.Move, ...] = ()
+    beta_cutoffs: int = 0
+    first_move_cutoffs: int = 0  # beta cutoffs by the first move searched
+
+    @property
+    def nps(self) -> float:
+        """Nodes (main search plus quiescence) per second, over all workers."""
+        return (self.nodes + self.qnodes) / self.elapsed if self.elapsed else 0.0
+
+class LazySMP:
+    """Process pool plus shared transposition table for Lazy SMP searches."""
+
+    def __init__(self, workers: int, tt_size: int = 2**18):
+        self.workers = workers
+        self.tt = SharedTranspositionTable(tt_size)
+
+        mp_context = multiprocessing.get_context()
+        self._stop = mp_context.Event()
+        self._pool = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=mp_context,
+            initializer=_init_worker,
+            initargs=(self.tt.name, tt_size, self._stop),
+        )
+        self._finalizer = weakref.finalize(self, _shutdown, self._pool, self.tt)
+
+    def close(self) -> None:
+        """Stop the workers and free the shared table."""
+        self._finalizer()
+
+    def search(self, board: chess.Board, agent_kwargs: dict) -> ParallelResult:
+        """
+        Search 'board' with every worker and return the deepest completed
+        result. 'agent_kwargs' configure the workers' MinimaxAgents.
+        """
+        start = time.perf_counter()
+        self.tt.new_search()
+        self._stop.clear()
+
+        futures = [
+            self._pool.submit(
+                _lazy_smp_job,
+                board,
+                agent_kwargs,
+                self.tt.generation,
+                1 + i % 2,   # odd helpers skip depth 1 ...
+                i % 2,       # ... and aim one ply deeper
+                i > 0,
+            )
+            for i in range(self.workers)
+        ]
+
+        results = [futures[0].result()]
+        self._stop.set()
+        results.extend(f.result() for f in futures[1:])
+        elapsed = time.perf_counter() - start
+
+        best = results[0]
+        for result in results[1:]:
+            if result["move"] is not None and result["depth"] > best["depth"]:
+                best = result
+
+        for result in results:
+            hits, misses, collisions, stores = result["tt"]
+            self.tt.hits += hits
+            self.tt.misses += misses
+            self.tt.collisions += collisions
+            self.tt.stores += stores
+
+        return ParallelResult(
+            move=chess.Move.from_uci(best["move"]) if best["move"] else None,
+            value=best["value"],
+            depth=best["depth"],
+            nodes=sum(r["nodes"] for r in results),
+            qnodes=sum(r["qnodes"] for r in results),
+            elapsed=elapsed,
+            pv=tuple(chess.Move.from_uci(m) for m in best["pv"]),
+            beta_cutoffs=sum(r["cutoffs"][0] for r in results),
+            first_move_cutoffs=sum(r["cutoffs"][1] for r in results),
+        )
+
+class RootSplit:
+    """Process pool plus shared alpha bound for root-split searches."""
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self.tt = None  # each worker has its own
+
+        mp_context = multiprocessing.get_context()
+        self._alpha = mp_context.Value("d", -math.inf)
+        self._pool = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=mp_context,
+            initializer=_init_root_split_worker,
+            initargs=(self._alpha,),
+        )
+        self._orderer = MoveOrderer()
+        self._finalizer = weakref.finalize(self, _shutdown, self._pool, None)
+
+    def close(self) -> None:
+        """Stop the workers."""
+        self._finalizer()
+
+    def search(self, board: chess.Board, agent_kwargs: dict) -> ParallelResult:
+        """
+        Iterative deepening over 'board' with each iteration's root moves
+        split across the pool. 'agent_kwargs' configure the workers'
+        MinimaxAgents (depth, budget, search features).
+
+        The node budget, if any, is checked between iterations.
+        """
+        start = time.perf_counter()
+        time_limit_ms = agent_kwargs.get("time_limit_ms")
+        node_limit = agent_kwargs.get("node_limit")
+        time_managed = time_limit_ms is not None or node_limit is not None
+        max_depth = agent_kwargs.get("max_depth", 64) if time_managed else agent_kwargs.get("depth", 2)
+
+        moves = list(board.legal_moves)
+        # Tied moves are decided by this fixed order, not the search order:
+        # the search order follows earlier iterations, whose results depend
+        # on what each worker's table held
+        root_order = {move: i for i, move in enumerate(moves)}
+        best_move, best_value, completed = moves[0], None, 0
+        nodes = qnodes = cutoffs = first_move_cutoffs = 0
+
+        for depth in range(1, max(max_depth, 1) + 1):
+            time_left_ms = None
+            if time_limit_ms is not None and depth > 1:
+                # The first iteration always completes, so there is a move to play
+                time_left_ms = time_limit_ms - (time.perf_counter() - start) * 1000
+                if time_left_ms <= 0:
+                    break
+
+            moves = self._orderer.order(board, moves, 0, best_move if completed else None)
+            self._alpha.value = -math.inf
+
+            def submit(move):
+                return self._pool.submit(
+                    _root_split_job, board, move, depth, agent_kwargs, time_left_ms
+                )
+
+            # Search the first (likely best) move alone to get a bound
+            results = [submit(moves[0]).result()]
+            if results[0]["value"] is not None:
+                results.extend(f.result() for f in [submit(m) for m in moves[1:]])
+
+            nodes += sum(r["nodes"] for r in results)
+            qnodes += sum(r["qnodes"] for r in results)
+            cutoffs += sum(r["cutoffs"][0] for r in results)
+            first_move_cutoffs += sum(r["cutoffs"][1] for r in results)
+            if len(results) < len(moves) or any(r["value"] is None for r in results):
+                break  # ran out of time mid-iteration
+
+            # Highest score, earliest in legal move order on ties
+            best = max(
+                (r for r in results if r["exact"]),
+                key=lambda r: (r["value"], -root_order[chess.Move.from_uci(r["move"])]),
+            )
+            best_move = chess.Move.from_uci(best["move"])
+            best_value = best["value"]
+            completed = depth
+
+            if time_limit_ms is not None:
+                if (time.perf_counter() - start) * 1000 >= time_limit_ms / 2:
+                    break
+            if node_limit is not None and nodes + qnodes >= node_limit:
+                break
+
+        return ParallelResult(
+            move=best_move,
+            value=best_value,
+            depth=completed,
+            nodes=nodes,
+            qnodes=qnodes,
+            elapsed=time.perf_counter() - start,
+            pv=(best_move,) if completed else (),
+            beta_cutoffs=cutoffs,
+            first_move_cutoffs=first_move_cutoffs,
+        )
+
+# Parallel modes selectable by name (MinimaxAgent's 'parallel' parameter)
+PARALLEL_MODES = {
+    "lazy_smp": LazySMP,
+    "root_split": RootSplit,
+}
+
+###############
+# BENCHMARKS  #
+###############
+
+def measure_scaling(
+    fen: str = chess.STARTING_FEN,
+    max_workers: int = 4,
+    time_limit_ms: int = 1000,
+    mode: str = "lazy_smp",
+    **agent_kwargs,
+) -> list[dict[str, float]]:
+    """
+    Search 'fen' for a fixed time with 1..max_workers workers of parallel
+    mode 'mode' (a PARALLEL_MODES key) and report
+    total nodes, nodes/sec and depth reached for each worker count.
+
+    The first search of each pool is a warm-up (process start-up) and is
+    not measured.
+    """
+    agent_kwargs = {"time_limit_ms": time_limit_ms, **agent_kwargs}
+    rows = []
+
+    for workers in range(1, max_workers + 1):
+        pool = PARALLEL_MODES[mode](workers)
+        try:
+            pool.search(chess.Board(fen), {**agent_kwargs, "time_limit_ms": 50})
+            result = pool.search(chess.Board(fen), agent_kwargs)
+        finally:
+            pool.close()
+
+        rows.append({
+            "workers": workers,
+            "nodes": result.nodes + result.qnodes,
+            "nps": result.nps,
+            "depth": result.depth,
+        })
+
+    base = rows[0]["nps"] or 1.0
+    for row in rows:
+        row["speedup"] = row["nps"] / base
+    return rows
+
+if __name__ == "__main__":
+    # python -m chess_ai.search.parallel [MAX_WORKERS] [MODE]
+    import sys
+
+    max_workers = int(sys.argv[1]) if len(sys.argv) > 1 else multiprocessing.cpu_count()
+    mode = sys.argv[2] if len(sys.argv) > 2 else "lazy_smp"
+    print(f"{'workers':>7} {'nodes':>10} {'nodes/s':>10} {'depth':>5} {'speedup':>7}")
+    for row in measure_scaling(max_workers=max_workers, mode=mode):
+        print(
+            f"{row['workers']:>7} {row['nodes']:>10} {row['nps']:>10.0f} "
+            f"{row['depth']:>5} {row['speedup']:>7.2f}"
+        )
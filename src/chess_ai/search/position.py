@@ -0,0 +1,836 @@
+"""
+Search Position
+---------------
+
+A lean position class for the search hot path. It duck-types the part of
+chess.Board the search, evaluators, move ordering and SEE use (turn,
+piece bitboards, legal move generation, push/pop, check, capture and draw
+tests), so all of them run unchanged on either.
+
+Compared to chess.Board it keeps:
+- integer bitboards per piece type and color, plus a 64-entry mailbox so
+  piece_type_at() is a list lookup, with attacks from the precomputed
+  tables in chess_ai.search.attacks,
+- the Polyglot Zobrist key, updated incrementally on every push/pop
+  (equal to chess.polyglot.zobrist_hash of the same position),
+- a fixed-size undo array instead of a move stack of board snapshots, and
+  the keys of earlier positions for repetition checks.
+
+Only standard chess is supported (no Chess960). Moves are chess.Move
+objects, shared between positions, so they can be stored in the
+transposition table and compared with python-chess moves.
+
+Build one from a board with Position.from_board(board) and turn it back
+with to_board().
+"""
+
+from __future__ import annotations
+
+import random
+from typing import Iterator
+
+import chess
+import chess.polyglot
+from chess import BB_ALL, BB_SQUARES, msb, scan_reversed
+
+from chess_ai.search.attacks import (
+    BETWEEN,
+    BISHOP_ATTACKS,
+    BISHOP_MASKS,
+    BISHOP_RAYS,
+    KING_ATTACKS,
+    KNIGHT_ATTACKS,
+    LINE,
+    PAWN_ATTACKS,
+    ROOK_ATTACKS,
+    ROOK_MASKS,
+    ROOK_RAYS,
+)
+
+MAX_UNDO = 256  # deepest line of moves a position can have pushed
+
+############
+# ZOBRIST  #
+############
+
+_RANDOM = chess.polyglot.POLYGLOT_RANDOM_ARRAY
+
+# PIECE_KEYS[color][piece_type][square]
+PIECE_KEYS = [
+    [
+        [_RANDOM[64 * ((piece_type - 1) * 2 + color) + square] for square in chess.SQUARES]
+        if piece_type else [0] * 64
+        for piece_type in range(7)
+    ]
+    for color in (chess.BLACK, chess.WHITE)
+]
+TURN_KEY = _RANDOM[780]
+EP_KEYS = [_RANDOM[772 + file] for file in range(8)]
+
+_CASTLING_SQUARES = ((chess.H1, 768), (chess.A1, 769), (chess.H8, 770), (chess.A8, 771))
+_CASTLING_KEYS: dict[int, int] = {}
+
+def castling_key(castling_rights: chess.Bitboard) -> int:
+    """Zobrist contribution of the castling rights (a mask of rook squares)."""
+    key = _CASTLING_KEYS.get(castling_rights)
+    if key is None:
+        key = 0
+        for square, index in _CASTLING_SQUARES:
+            if castling_rights & BB_SQUARES[square]:
+                key ^= _RANDOM[index]
+        _CASTLING_KEYS[castling_rights] = key
+    return key
+
+# Castling rights lost when a move touches a square (king or rook squares)
+_CASTLING_MASK = [BB_ALL] * 64
+_CASTLING_MASK[chess.E1] = ~(chess.BB_A1 | chess.BB_H1)
+_CASTLING_MASK[chess.E8] = ~(chess.BB_A8 | chess.BB_H8)
+for _square in (chess.A1, chess.H1, chess.A8, chess.H8):
+    _CASTLING_MASK[_square] = ~BB_SQUARES[_square]
+
+#########
+# MOVES #
+#########
+
+# One shared chess.Move per (from, to) and per promotion, so move
+# generation doesn't allocate
+_MOVES = [[chess.Move(f, t) for t in chess.SQUARES] for f in chess.SQUARES]
+_PROMOTIONS = {
+    (f, t): tuple(chess.Move(f, t, p) for p in (chess.QUEEN, chess.ROOK, chess.BISHOP, chess.KNIGHT))
+    for f in chess.SQUARES
+    for t in chess.SQUARES
+    if abs(f - t) in (7, 8, 9) and chess.square_rank(t) in (0, 7)
+}
+
+_BACKRANK = (chess.BB_RANK_8, chess.BB_RANK_1)
+
+class Position:
+    """
+    Search-only chess position with integer bitboards and make/unmake.
+
+    push() expects a legal move (or a null move); pop() takes back the last
+    pushed one. At most MAX_UNDO moves can be pushed at a time.
+    """
+
+    __slots__ = (
+        "_by_type",
+        "_mailbox",
+        "occupied_co",
+        "occupied",
+        "turn",
+        "castling_rights",
+        "ep_square",
+        "halfmove_clock",
+        "fullmove_number",
+        "key",
+        "_undo",
+        "_ply",
+        "_keys",
+        "_base",
+    )
+
+    def __init__(self) -> None:
+        self._by_type = [0] * 7        # indexed by piece type, [0] unused
+        self._mailbox = [0] * 64       # piece type on each square, 0 = empty
+        self.occupied_co = [0, 0]      # indexed by color (BLACK, WHITE)
+        self.occupied = 0
+        self.turn = chess.WHITE
+        self.castling_rights = 0
+        self.ep_square: int | None = None
+        self.halfmove_clock = 0
+        self.fullmove_number = 1
+        self.key = 0
+
+        self._undo: list[tuple | None] = [None] * MAX_UNDO
+        self._ply = 0
+        # Keys of the positions since the last irreversible move, the
+        # current one at _keys[_base + _ply]
+        self._keys = [0] * (MAX_UNDO + 1)
+        self._base = 0
+
+    @classmethod
+    def from_board(cls, board: chess.Board) -> "Position":
+        """Position equivalent to 'board', including its repetition history."""
+        # Earlier positions that can still repeat: back to the last
+        # irreversible move (or as many as the game has). Start there and
+        # replay the moves, so their keys are recorded on the way.
+        replay = min(board.halfmove_clock, len(board.move_stack))
+        start = board.copy(stack=replay)
+        for _ in range(replay):
+            start.pop()
+
+        pos = cls._from_board_state(start)
+        pos._keys = [0] * (replay + MAX_UNDO + 1)
+        pos._keys[0] = pos.key
+        for move in board.move_stack[len(board.move_stack) - replay:]:
+            pos.push(move)
+
+        # The replayed moves become history that can't be popped
+        pos._base = replay
+        pos._ply = 0
+        pos.fullmove_number = board.fullmove_number
+        return pos
+
+    @classmethod
+    def _from_board_state(cls, board: chess.Board) -> "Position":
+        """Position equivalent to 'board', without history."""
+        pos = cls()
+        mailbox = pos._mailbox
+        by_type = pos._by_type
+        for piece_type, mask in enumerate(
+            (board.pawns, board.knights, board.bishops, board.rooks, board.queens, board.kings), 1
+        ):
+            by_type[piece_type] = mask
+            for square in scan_reversed(mask):
+                mailbox[square] = piece_type
+        pos.occupied_co = list(board.occupied_co)
+        pos.occupied = board.occupied
+        pos.turn = board.turn
+        pos.castling_rights = board.clean_castling_rights()
+        pos.ep_square = board.ep_square
+        pos.halfmove_clock = board.halfmove_clock
+        pos.fullmove_number = board.fullmove_number
+
+        key = castling_key(pos.castling_rights) ^ pos._ep_key()
+        if pos.turn == chess.WHITE:
+            key ^= TURN_KEY
+        for color in chess.COLORS:
+            piece_keys = PIECE_KEYS[color]
+            for square in scan_reversed(pos.occupied_co[color]):
+                key ^= piece_keys[mailbox[square]][square]
+        pos.key = key
+        return pos
+
+    def to_board(self) -> chess.Board:
+        """chess.Board of the current position (without move history)."""
+        board = chess.Board(None)
+        board.set_piece_map(self.piece_map())
+        board.turn = self.turn
+        board.castling_rights = self.castling_rights
+        board.ep_square = self.ep_square
+        board.halfmove_clock = self.halfmove_clock
+        board.fullmove_number = self.fullmove_number
+        return board
+
+    def fen(self) -> str:
+        return self.to_board().fen()
+
+    def __repr__(self) -> str:
+        return f"Position('{self.fen()}')"
+
+    ##########
+    # PIECES #
+    ##########
+
+    @property
+    def pawns(self) -> chess.Bitboard:
+        return self._by_type[chess.PAWN]
+
+    @property
+    def knights(self) -> chess.Bitboard:
+        return self._by_type[chess.KNIGHT]
+
+    @property
+    def bishops(self) -> chess.Bitboard:
+        return self._by_type[chess.BISHOP]
+
+    @property
+    def rooks(self) -> chess.Bitboard:
+        return self._by_type[chess.ROOK]
+
+    @property
+    def queens(self) -> chess.Bitboard:
+        return self._by_type[chess.QUEEN]
+
+    @property
+    def kings(self) -> chess.Bitboard:
+        return self._by_type[chess.KING]
+
+    def pieces_mask(self, piece_type: chess.PieceType, color: chess.Color) -> chess.Bitboard:
+        return self._by_type[piece_type] & self.occupied_co[color]
+
+    def pieces(self, piece_type: chess.PieceType, color: chess.Color) -> chess.SquareSet:
+        return chess.SquareSet(self.pieces_mask(piece_type, color))
+
+    def piece_type_at(self, square: chess.Square) -> chess.PieceType | None:
+        return self._mailbox[square] or None
+
+    def color_at(self, square: chess.Square) -> chess.Color | None:
+        mask = BB_SQUARES[square]
+        if self.occupied_co[chess.WHITE] & mask:
+            return chess.WHITE
+        if self.occupied_co[chess.BLACK] & mask:
+            return chess.BLACK
+        return None
+
+    def piece_map(self) -> dict[chess.Square, chess.Piece]:
+        white = self.occupied_co[chess.WHITE]
+        return {
+            square: chess.Piece(self._mailbox[square], bool(white & BB_SQUARES[square]))
+            for square in scan_reversed(self.occupied)
+        }
+
+    def king(self, color: chess.Color) -> chess.Square | None:
+        mask = self._by_type[chess.KING] & self.occupied_co[color]
+        return msb(mask) if mask else None
+
+    def _put(self, piece_type: int, color: bool, square: int) -> None:
+        mask = BB_SQUARES[square]
+        self._by_type[piece_type] |= mask
+        self.occupied_co[color] |= mask
+        self.occupied |= mask
+        self._mailbox[square] = piece_type
+
+    def _remove(self, piece_type: int, color: bool, square: int) -> None:
+        mask = ~BB_SQUARES[square]
+        self._by_type[piece_type] &= mask
+        self.occupied_co[color] &= mask
+        self.occupied &= mask
+        self._mailbox[square] = 0
+
+    ###########
+    # ATTACKS #
+    ###########
+
+    def attacks_mask(self, square: chess.Square) -> chess.Bitboard:
+        """Squares attacked by the piece on 'square'."""
+        piece_type = self._mailbox[square]
+        if piece_type == chess.KNIGHT:
+            return KNIGHT_ATTACKS[square]
+        if piece_type == chess.BISHOP:
+            return BISHOP_ATTACKS[square][self.occupied & BISHOP_MASKS[square]]
+        if piece_type == chess.ROOK:
+            return ROOK_ATTACKS[square][self.occupied & ROOK_MASKS[square]]
+        if piece_type == chess.QUEEN:
+            occupied = self.occupied
+            return (
+                ROOK_ATTACKS[square][occupied & ROOK_MASKS[square]]
+                | BISHOP_ATTACKS[square][occupied & BISHOP_MASKS[square]]
+            )
+        if piece_type == chess.KING:
+            return KING_ATTACKS[square]
+        if piece_type == chess.PAWN:
+            return PAWN_ATTACKS[bool(self.occupied_co[chess.WHITE] & BB_SQUARES[square])][square]
+        return 0
+
+    def attackers_mask(
+        self,
+        color: chess.Color,
+        square: chess.Square,
+        occupied: chess.Bitboard | None = None,
+    ) -> chess.Bitboard:
+        """Pieces of 'color' attacking 'square' (with the given occupancy)."""
+        if occupied is None:
+            occupied = self.occupied
+        by_type = self._by_type
+        queens_and_rooks = by_type[chess.QUEEN] | by_type[chess.ROOK]
+        queens_and_bishops = by_type[chess.QUEEN] | by_type[chess.BISHOP]
+
+        attackers = (
+            (KING_ATTACKS[square] & by_type[chess.KING])
+            | (KNIGHT_ATTACKS[square] & by_type[chess.KNIGHT])
+            | (ROOK_ATTACKS[square][occupied & ROOK_MASKS[square]] & queens_and_rooks)
+            | (BISHOP_ATTACKS[square][occupied & BISHOP_MASKS[square]] & queens_and_bishops)
+            | (PAWN_ATTACKS[not color][square] & by_type[chess.PAWN])
+        )
+        return attackers & self.occupied_co[color]
+
+    def is_attacked_by(self, color: chess.Color, square: chess.Square) -> bool:
+        return bool(self.attackers_mask(color, square))
+
+    def checkers_mask(self) -> chess.Bitboard:
+        king = self.king(self.turn)
+        return 0 if king is None else self.attackers_mask(not self.turn, king)
+
+    def is_check(self) -> bool:
+        return bool(self.checkers_mask())
+
+    def _slider_blockers(self, king: int) -> chess.Bitboard:
+        """Our pieces pinned to 'king' (the only piece between it and a slider)."""
+        by_type = self._by_type
+        rooks_and_queens = by_type[chess.ROOK] | by_type[chess.QUEEN]
+        bishops_and_queens = by_type[chess.BISHOP] | by_type[chess.QUEEN]
+
+        snipers = (ROOK_RAYS[king] & rooks_and_queens) | (BISHOP_RAYS[king] & bishops_and_queens)
+
+        blockers = 0
+        occupied = self.occupied
+        between = BETWEEN[king]
+        for sniper in scan_reversed(snipers & self.occupied_co[not self.turn]):
+            b = between[sniper] & occupied
+            if b and BB_SQUARES[msb(b)] == b:
+                blockers |= b
+
+        return blockers & self.occupied_co[self.turn]
+
+    ####################
+    # MOVE GENERATION  #
+    ####################
+
+    @property
+    def legal_moves(self) -> Iterator[chess.Move]:
+        return self.generate_legal_moves()
+
+    def generate_pseudo_legal_moves(
+        self,
+        from_mask: chess.Bitboard = BB_ALL,
+        to_mask: chess.Bitboard = BB_ALL,
+    ) -> Iterator[chess.Move]:
+        """Moves that are legal except possibly for leaving the king in check."""
+        turn = self.turn
+        ours = self.occupied_co[turn]
+        occupied = self.occupied
+        pawns = self._by_type[chess.PAWN] & ours & from_mask
+
+        # Piece moves
+        for from_square in scan_reversed(ours & ~pawns & from_mask):
+            moves = _MOVES[from_square]
+            for to_square in scan_reversed(self.attacks_mask(from_square) & ~ours & to_mask):
+                yield moves[to_square]
+
+        if from_mask & self._by_type[chess.KING]:
+            yield from self._generate_castling_moves(from_mask, to_mask)
+
+        if not pawns:
+            return
+
+        # Pawn captures
+        theirs = self.occupied_co[not turn] & to_mask
+        attacks = PAWN_ATTACKS[turn]
+        for from_square in scan_reversed(pawns):
+            for to_square in scan_reversed(attacks[from_square] & theirs):
+                if to_square < 8 or to_square >= 56:
+                    yield from _PROMOTIONS[from_square, to_square]
+                else:
+                    yield _MOVES[from_square][to_square]
+
+        # Pawn pushes
+        if turn == chess.WHITE:
+            single_moves = pawns << 8 & ~occupied
+            double_moves = single_moves << 8 & ~occupied & chess.BB_RANK_4
+            step = -8
+        else:
+            single_moves = pawns >> 8 & ~occupied
+            double_moves = single_moves >> 8 & ~occupied & chess.BB_RANK_5
+            step = 8
+
+        for to_square in scan_reversed(single_moves & to_mask):
+            from_square = to_square + step
+            if to_square < 8 or to_square >= 56:
+                yield from _PROMOTIONS[from_square, to_square]
+            else:
+                yield _MOVES[from_square][to_square]
+
+        for to_square in scan_reversed(double_moves & to_mask):
+            yield _MOVES[to_square + 2 * step][to_square]
+
+        if self.ep_square is not None:
+            yield from self._generate_ep(from_mask, to_mask)
+
+    def _generate_ep(
+        self,
+        from_mask: chess.Bitboard = BB_ALL,
+        to_mask: chess.Bitboard = BB_ALL,
+    ) -> Iterator[chess.Move]:
+        ep_square = self.ep_square
+        if ep_square is None or not BB_SQUARES[ep_square] & to_mask:
+            return
+        if BB_SQUARES[ep_square] & self.occupied:
+            return
+
+        capturers = (
+            self._by_type[chess.PAWN]
+            & self.occupied_co[self.turn]
+            & from_mask
+            & PAWN_ATTACKS[not self.turn][ep_square]
+            & chess.BB_RANKS[4 if self.turn else 3]
+        )
+        for capturer in scan_reversed(capturers):
+            yield _MOVES[capturer][ep_square]
+
+    def _generate_castling_moves(
+        self,
+        from_mask: chess.Bitboard = BB_ALL,
+        to_mask: chess.Bitboard = BB_ALL,
+    ) -> Iterator[chess.Move]:
+        """
+        Standard castling, king two squares towards the rook ('to_mask'
+        applies to the king's destination). Only generated out of check.
+        """
+        turn = self.turn
+        backrank = _BACKRANK[turn]
+        rights = self.castling_rights & backrank
+        if not rights:
+            return
+
+        king = chess.E1 if turn == chess.WHITE else chess.E8
+        if not BB_SQUARES[king] & from_mask:
+            return
+        occupied = self.occupied
+        them = not turn
+        attackers_mask = self.attackers_mask
+
+        if attackers_mask(them, king):
+            return
+
+        # Kingside: f and g empty and not attacked
+        if rights & BB_SQUARES[king + 3] and BB_SQUARES[king + 2] & to_mask:
+            if not occupied & (BB_SQUARES[king + 1] | BB_SQUARES[king + 2]):
+                if not attackers_mask(them, king + 1) and not attackers_mask(them, king + 2):
+                    yield _MOVES[king][king + 2]
+
+        # Queenside: b, c and d empty, c and d not attacked
+        if rights & BB_SQUARES[king - 4] and BB_SQUARES[king - 2] & to_mask:
+            if not occupied & (BB_SQUARES[king - 1] | BB_SQUARES[king - 2] | BB_SQUARES[king - 3]):
+                if not attackers_mask(them, king - 1) and not attackers_mask(them, king - 2):
+                    yield _MOVES[king][king - 2]
+
+    def _generate_evasions(
+        self,
+        king: int,
+        checkers: chess.Bitboard,
+        from_mask: chess.Bitboard = BB_ALL,
+        to_mask: chess.Bitboard = BB_ALL,
+    ) -> Iterator[chess.Move]:
+        by_type = self._by_type
+        sliders = checkers & (by_type[chess.BISHOP] | by_type[chess.ROOK] | by_type[chess.QUEEN])
+
+        # Squares behind the king on a checking slider's line
+        attacked = 0
+        for checker in scan_reversed(sliders):
+            attacked |= LINE[king][checker] & ~BB_SQUARES[checker]
+
+        if BB_SQUARES[king] & from_mask:
+            moves = _MOVES[king]
+            targets = KING_ATTACKS[king] & ~self.occupied_co[self.turn] & ~attacked & to_mask
+            for to_square in scan_reversed(targets):
+                yield moves[to_square]
+
+        checker = msb(checkers)
+        if BB_SQUARES[checker] == checkers:
+            # Capture or block a single checker
+            target = BETWEEN[king][checker] | checkers
+            yield from self.generate_pseudo_legal_moves(
+                ~by_type[chess.KING] & from_mask, target & to_mask
+            )
+
+            # Capture the checking pawn en passant
+            ep_square = self.ep_square
+            if ep_square is not None and not BB_SQUARES[ep_square] & target:
+                last_double = ep_square + (-8 if self.turn == chess.WHITE else 8)
+                if last_double == checker:
+                    yield from self._generate_ep(from_mask, to_mask)
+
+    def _is_safe(self, king: int, blockers: chess.Bitboard, move: chess.Move) -> bool:
+        """Whether a pseudo-legal move keeps our king out of check."""
+        from_square = move.from_square
+        if from_square == king:
+            if abs(move.to_square - from_square) == 2:
+                return True  # castling, checked when generated
+            return not self.attackers_mask(not self.turn, move.to_square)
+        if self.is_en_passant(move):
+            return not self._ep_exposes_king(king, move)
+        return bool(
+            not blockers & BB_SQUARES[from_square]
+            or LINE[from_square][move.to_square] & BB_SQUARES[king]
+        )
+
+    def _ep_exposes_king(self, king: int, move: chess.Move) -> bool:
+        # Both pawns leave their squares, so check the position after it
+        captured = self.ep_square + (-8 if self.turn == chess.WHITE else 8)
+        occupied = (
+            self.occupied
+            & ~BB_SQUARES[move.from_square]
+            & ~BB_SQUARES[captured]
+            | BB_SQUARES[move.to_square]
+        )
+        attackers = self.attackers_mask(not self.turn, king, occupied)
+        return bool(attackers & ~BB_SQUARES[captured])
+
+    def generate_legal_moves(
+        self,
+        from_mask: chess.Bitboard = BB_ALL,
+        to_mask: chess.Bitboard = BB_ALL,
+    ) -> Iterator[chess.Move]:
+        king = self.king(self.turn)
+        if king is None:
+            yield from self.generate_pseudo_legal_moves(from_mask, to_mask)
+            return
+
+        blockers = self._slider_blockers(king)
+        checkers = self.attackers_mask(not self.turn, king)
+        if checkers:
+            moves = self._generate_evasions(king, checkers, from_mask, to_mask)
+        else:
+            moves = self.generate_pseudo_legal_moves(from_mask, to_mask)
+
+        is_safe = self._is_safe
+        for move in moves:
+            if is_safe(king, blockers, move):
+                yield move
+
+    def generate_legal_captures(
+        self,
+        from_mask: chess.Bitboard = BB_ALL,
+        to_mask: chess.Bitboard = BB_ALL,
+    ) -> Iterator[chess.Move]:
+        yield from self.generate_legal_moves(from_mask, to_mask & self.occupied_co[not self.turn])
+        king = self.king(self.turn)
+        for move in self._generate_ep(from_mask, to_mask):
+            if king is None or not self._ep_exposes_king(king, move):
+                yield move
+
+    def random_legal_move(self, rng: random.Random) -> chess.Move | None:
+        """
+        A uniformly random legal move, or None if there are none. Only the
+        sampled moves are checked for legality, which makes this much
+        cheaper than generating every legal move (e.g. for playouts).
+        """
+        king = self.king(self.turn)
+        if king is None or self.checkers_mask():
+            moves = list(self.generate_legal_moves())
+            return rng.choice(moves) if moves else None
+
+        blockers = self._slider_blockers(king)
+        moves = list(self.generate_pseudo_legal_moves())
+        while moves:
+            i = rng.randrange(len(moves))
+            move = moves[i]
+            if self._is_safe(king, blockers, move):
+                return move
+            moves[i] = moves[-1]
+            moves.pop()
+        return None
+
+    def is_legal(self, move: chess.Move) -> bool:
+        """Whether 'move' (from anywhere, e.g. the transposition table) is legal here."""
+        from_mask = BB_SQUARES[move.from_square]
+        if not self.occupied_co[self.turn] & from_mask:
+            return False
+        for legal in self.generate_legal_moves(from_mask, BB_SQUARES[move.to_square]):
+            if legal == move:
+                return True
+        return False
+
+    ###############
+    # MOVE CHECKS #
+    ###############
+
+    def is_en_passant(self, move: chess.Move) -> bool:
+        return (
+            self.ep_square == move.to_square
+            and self._mailbox[move.from_square] == chess.PAWN
+            and abs(move.to_square - move.from_square) in (7, 9)
+            and not self.occupied & BB_SQUARES[move.to_square]
+        )
+
+    def is_capture(self, move: chess.Move) -> bool:
+        return bool(
+            self.occupied_co[not self.turn] & BB_SQUARES[move.to_square]
+        ) or self.is_en_passant(move)
+
+    def is_castling(self, move: chess.Move) -> bool:
+        return (
+            self._mailbox[move.from_square] == chess.KING
+            and abs(move.to_square - move.from_square) == 2
+        )
+
+    def is_kingside_castling(self, move: chess.Move) -> bool:
+        return self.is_castling(move) and move.to_square > move.from_square
+
+    def is_zeroing(self, move: chess.Move) -> bool:
+        return self._mailbox[move.from_square] == chess.PAWN or bool(
+            self.occupied_co[not self.turn] & BB_SQUARES[move.to_square]
+        )
+
+    #########
+    # DRAWS #
+    #########
+
+    def has_insufficient_material(self, color: chess.Color) -> bool:
+        # Same rules as chess.Board.has_insufficient_material
+        by_type = self._by_type
+        ours = self.occupied_co[color]
+        if ours & (by_type[chess.PAWN] | by_type[chess.ROOK] | by_type[chess.QUEEN]):
+            return False
+        if ours & by_type[chess.KNIGHT]:
+            return (
+                chess.popcount(ours) <= 2
+                and not (self.occupied_co[not color] & ~by_type[chess.KING] & ~by_type[chess.QUEEN])
+            )
+        if ours & by_type[chess.BISHOP]:
+            bishops = by_type[chess.BISHOP]
+            same_color = not bishops & chess.BB_DARK_SQUARES or not bishops & chess.BB_LIGHT_SQUARES
+            return bool(same_color) and not by_type[chess.PAWN] and not by_type[chess.KNIGHT]
+        return True
+
+    def is_insufficient_material(self) -> bool:
+        return self.has_insufficient_material(chess.WHITE) and self.has_insufficient_material(chess.BLACK)
+
+    def is_repetition(self, count: int = 3) -> bool:
+        """Whether the current position occurred 'count' times since the last irreversible move."""
+        keys = self._keys
+        index = self._base + self._ply
+        key = keys[index]
+        oldest = max(0, index - self.halfmove_clock)
+
+        seen = 1
+        for i in range(index - 2, oldest - 1, -2):
+            if keys[i] == key:
+                seen += 1
+                if seen >= count:
+                    return True
+        return False
+
+    ###############
+    # MAKE/UNMAKE #
+    ###############
+
+    def _ep_key(self) -> int:
+        """Zobrist contribution of the en passant square (Polyglot rules)."""
+        ep_square = self.ep_square
+        if ep_square is None:
+            return 0
+        # Only hashed when a pawn of the side to move stands next to it
+        if self.turn == chess.WHITE:
+            adjacent = PAWN_ATTACKS[chess.BLACK][ep_square]
+        else:
+            adjacent = PAWN_ATTACKS[chess.WHITE][ep_square]
+        if adjacent & self._by_type[chess.PAWN] & self.occupied_co[self.turn]:
+            return EP_KEYS[ep_square & 7]
+        return 0
+
+    def peek(self) -> chess.Move:
+        """The last pushed move."""
+        if not self._ply:
+            raise IndexError("no move pushed")
+        return self._undo[self._ply - 1][0]
+
+    def push(self, move: chess.Move) -> None:
+        """Make a legal move (or a null move)."""
+        ply = self._ply
+        if ply >= MAX_UNDO:
+            raise IndexError(f"more than {MAX_UNDO} moves pushed")
+
+        turn = self.turn
+        key = self.key ^ self._ep_key() ^ TURN_KEY
+        castling_rights = self.castling_rights
+        ep_square = self.ep_square
+        halfmove_clock = self.halfmove_clock
+
+        self.ep_square = None
+        self.halfmove_clock += 1
+        if turn == chess.BLACK:
+            self.fullmove_number += 1
+
+        if not move:
+            self._undo[ply] = (move, 0, 0, castling_rights, ep_square, halfmove_clock, self.key)
+            self.turn = not turn
+            self.key = key
+            self._ply = ply + 1
+            self._keys[self._base + self._ply] = key
+            return
+
+        them = not turn
+        from_square = move.from_square
+        to_square = move.to_square
+        mailbox = self._mailbox
+        moved = piece_type = mailbox[from_square]
+        captured = mailbox[to_square]
+        piece_keys = PIECE_KEYS[turn]
+
+        self._remove(piece_type, turn, from_square)
+        key ^= piece_keys[piece_type][from_square]
+
+        if captured:
+            self._remove(captured, them, to_square)
+            key ^= PIECE_KEYS[them][captured][to_square]
+            self.halfmove_clock = 0
+
+        if piece_type == chess.PAWN:
+            self.halfmove_clock = 0
+            diff = to_square - from_square
+            if diff == 16 or diff == -16:
+                self.ep_square = from_square + diff // 2
+            elif to_square == ep_square and not captured:
+                # En passant: the captured pawn is behind the target square
+                captured_square = to_square - 8 if turn == chess.WHITE else to_square + 8
+                self._remove(chess.PAWN, them, captured_square)
+                key ^= PIECE_KEYS[them][chess.PAWN][captured_square]
+                captured = chess.PAWN
+            if move.promotion:
+                piece_type = move.promotion
+        elif piece_type == chess.KING and abs(to_square - from_square) == 2:
+            # Castling: move the rook too
+            if to_square > from_square:
+                rook_from, rook_to = from_square + 3, from_square + 1
+            else:
+                rook_from, rook_to = from_square - 4, from_square - 1
+            self._remove(chess.ROOK, turn, rook_from)
+            self._put(chess.ROOK, turn, rook_to)
+            rook_keys = piece_keys[chess.ROOK]
+            key ^= rook_keys[rook_from] ^ rook_keys[rook_to]
+
+        self._put(piece_type, turn, to_square)
+        key ^= piece_keys[piece_type][to_square]
+
+        new_rights = castling_rights & _CASTLING_MASK[from_square] & _CASTLING_MASK[to_square]
+        if new_rights != castling_rights:
+            key ^= castling_key(castling_rights) ^ castling_key(new_rights)
+            self.castling_rights = new_rights
+
+        self.turn = them
+        key ^= self._ep_key()
+
+        self._undo[ply] = (
+            move,
+            moved,
+            captured,
+            castling_rights,
+            ep_square,
+            halfmove_clock,
+            self.key,
+        )
+        self.key = key
+        self._ply = ply + 1
+        self._keys[self._base + self._ply] = key
+
+    def pop(self) -> chess.Move:
+        """Take back the last pushed move and return it."""
+        self._ply -= 1
+        move, piece_type, captured, castling_rights, ep_square, halfmove_clock, key = self._undo[self._ply]
+
+        turn = not self.turn
+        self.turn = turn
+        self.castling_rights = castling_rights
+        self.ep_square = ep_square
+        self.halfmove_clock = halfmove_clock
+        self.key = key
+        if turn == chess.BLACK:
+            self.fullmove_number -= 1
+
+        if not move:
+            return move
+
+        from_square = move.from_square
+        to_square = move.to_square
+        them = not turn
+
+        self._remove(self._mailbox[to_square], turn, to_square)
+        self._put(piece_type, turn, from_square)
+
+        if piece_type == chess.KING and abs(to_square - from_square) == 2:
+            if to_square > from_square:
+                rook_from, rook_to = from_square + 3, from_square + 1
+            else:
+                rook_from, rook_to = from_square - 4, from_square - 1
+            self._remove(chess.ROOK, turn, rook_to)
+            self._put(chess.ROOK, turn, rook_from)
+        elif captured:
+            if piece_type == chess.PAWN and to_square == ep_square:
+                captured_square = to_square - 8 if turn == chess.WHITE else to_square + 8
+                self._put(chess.PAWN, them, captured_square)
+            else:
+                self._put(captured, them, to_square)
+
+        return move
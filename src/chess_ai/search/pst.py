@@ -0,0 +1,155 @@
+"""
+Piece-Square Tables
+-------------------
+
+Middlegame and endgame bonuses per piece and square, in centipawns, for the
+tapered evaluator. Based on Tomasz Michniewski's "Simplified Evaluation
+Function", with separate endgame tables for the king (centralise instead of
+hiding) and pawns (advance instead of guarding the king).
+
+Tables are written the way a board is drawn: White's point of view, rank 8
+on the first row and a-file on the left. to_square_order() converts them to
+python-chess square order (a1 = 0, h8 = 63).
+"""
+
+from __future__ import annotations
+
+import chess
+
+def to_square_order(table: list[int]) -> list[int]:
+    """Reorder a rank-8-first table to python-chess square indices."""
+    return [table[chess.square_mirror(square)] for square in chess.SQUARES]
+
+# Piece values per game phase
+MG_VALUES = {
+    chess.PAWN:   100,
+    chess.KNIGHT: 320,
+    chess.BISHOP: 330,
+    chess.ROOK:   500,
+    chess.QUEEN:  900,
+    chess.KING:   0,
+}
+
+EG_VALUES = {
+    chess.PAWN:   120,
+    chess.KNIGHT: 300,
+    chess.BISHOP: 320,
+    chess.ROOK:   530,
+    chess.QUEEN:  950,
+    chess.KING:   0,
+}
+
+# Game phase contributed by each piece: 24 with all minor and major pieces
+# on the board (middlegame), 0 with only kings and pawns left (endgame).
+PHASE_WEIGHTS = {
+    chess.PAWN:   0,
+    chess.KNIGHT: 1,
+    chess.BISHOP: 1,
+    chess.ROOK:   2,
+    chess.QUEEN:  4,
+    chess.KING:   0,
+}
+TOTAL_PHASE = 24
+
+PAWN_MG = [
+      0,   0,   0,   0,   0,   0,   0,   0,
+     50,  50,  50,  50,  50,  50,  50,  50,
+     10,  10,  20,  30,  30,  20,  10,  10,
+      5,   5,  10,  25,  25,  10,   5,   5,
+      0,   0,   0,  20,  20,   0,   0,   0,
+      5,  -5, -10,   0,   0, -10,  -5,   5,
+      5,  10,  10, -20, -20,  10,  10,   5,
+      0,   0,   0,   0,   0,   0,   0,   0,
+]
+
+PAWN_EG = [
+      0,   0,   0,   0,   0,   0,   0,   0,
+     80,  80,  80,  80,  80,  80,  80,  80,
+     50,  50,  50,  50,  50,  50,  50,  50,
+     30,  30,  30,  30,  30,  30,  30,  30,
+     15,  15,  15,  15,  15,  15,  15,  15,
+      5,   5,   5,   5,   5,   5,   5,   5,
+      0,   0,   0,   0,   0,   0,   0,   0,
+      0,   0,   0,   0,   0,   0,   0,   0,
+]
+
+KNIGHT = [
+    -50, -40, -30, -30, -30, -30, -40, -50,
+    -40, -20,   0,   0,   0,   0, -20, -40,
+    -30,   0,  10,  15,  15,  10,   0, -30,
+    -30,   5,  15,  20,  20,  15,   5, -30,
+    -30,   0,  15,  20,  20,  15,   0, -30,
+    -30,   5,  10,  15,  15,  10,   5, -30,
+    -40, -20,   0,   5,   5,   0, -20, -40,
+    -50, -40, -30, -30, -30, -30, -40, -50,
+]
+
+BISHOP = [
+    -20, -10, -10, -10, -10, -10, -10, -20,
+    -10,   0,   0,   0,   0,   0,   0, -10,
+    -10,   0,   5,  10,  10,   5,   0, -10,
+    -10,   5,   5,  10,  10,   5,   5, -10,
+    -10,   0,  10,  10,  10,  10,   0, -10,
+    -10,  10,  10,  10,  10,  10,  10, -10,
+    -10,   5,   0,   0,   0,   0,   5, -10,
+    -20, -10, -10, -10, -10, -10, -10, -20,
+]
+
+ROOK = [
+      0,   0,   0,   0,   0,   0,   0,   0,
+      5,  10,  10,  10,  10,  10,  10,   5,
+     -5,   0,   0,   0,   0,   0,   0,  -5,
+     -5,   0,   0,   0,   0,   0,   0,  -5,
+     -5,   0,   0,   0,   0,   0,   0,  -5,
+     -5,   0,   0,   0,   0,   0,   0,  -5,
+     -5,   0,   0,   0,   0,   0,   0,  -5,
+      0,   0,   0,   5,   5,   0,   0,   0,
+]
+
+QUEEN = [
+    -20, -10, -10,  -5,  -5, -10, -10, -20,
+    -10,   0,   0,   0,   0,   0,   0, -10,
+    -10,   0,   5,   5,   5,   5,   0, -10,
+     -5,   0,   5,   5,   5,   5,   0,  -5,
+      0,   0,   5,   5,   5,   5,   0,  -5,
+    -10,   5,   5,   5,   5,   5,   0, -10,
+    -10,   0,   5,   0,   0,   0,   0, -10,
+    -20, -10, -10,  -5,  -5, -10, -10, -20,
+]
+
+KING_MG = [
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -20, -30, -30, -40, -40, -30, -30, -20,
+    -10, -20, -20, -20, -20, -20, -20, -10,
+     20,  20,   0,   0,   0,   0,  20,  20,
+     20,  30,  10,   0,   0,  10,  30,  20,
+]
+
+KING_EG = [
+    -50, -40, -30, -20, -20, -30, -40, -50,
+    -30, -20, -10,   0,   0, -10, -20, -30,
+    -30, -10,  20,  30,  30,  20, -10, -30,
+    -30, -10,  30,  40,  40,  30, -10, -30,
+    -30, -10,  30,  40,  40,  30, -10, -30,
+    -30, -10,  20,  30,  30,  20, -10, -30,
+    -30, -30,   0,   0,   0,   0, -30, -30,
+    -50, -30, -30, -30, -30, -30, -30, -50,
+]
+
+MG_PST = {
+    chess.PAWN:   to_square_order(PAWN_MG),
+    chess.KNIGHT: to_square_order(KNIGHT),
+    chess.BISHOP: to_square_order(BISHOP),
+    chess.ROOK:   to_square_order(ROOK),
+    chess.QUEEN:  to_square_order(QUEEN),
+    chess.KING:   to_square_order(KING_MG),
+}
+
+EG_PST = {
+    **MG_PST,
+    chess.PAWN: to_square_order(PAWN_EG),
+    chess.KING: to_square_order(KING_EG),
+}
@@ -0,0 +1,90 @@
+"""
+Static Exchange Evaluation
+--------------------------
+
+Estimates the material outcome of a capture sequence on one square, assuming
+both sides keep recapturing with their least valuable attacker and may stop
+whenever continuing would lose material. No moves are pushed: attackers are
+found with python-chess attack masks against a shrinking occupancy, so
+x-ray attackers (a rook behind a rook, a bishop behind a queen) join in as
+the pieces in front of them are traded off.
+"""
+
+from __future__ import annotations
+
+import chess
+
+# Centipawns. The king is "priceless" so it only ever captures last.
+SEE_VALUES = {
+    chess.PAWN:   100,
+    chess.KNIGHT: 320,
+    chess.BISHOP: 330,
+    chess.ROOK:   500,
+    chess.QUEEN:  900,
+    chess.KING:   20_000,
+}
+
+def _least_valuable_attacker(
+    board: chess.Board, attackers: chess.Bitboard, color: chess.Color
+) -> tuple[chess.PieceType, chess.Bitboard] | None:
+    for piece_type in chess.PIECE_TYPES:  # pawn .. king
+        subset = attackers & board.pieces_mask(piece_type, color)
+        if subset:
+            return piece_type, subset & -subset  # lowest set bit
+    return None
+
+def see(board: chess.Board, move: chess.Move) -> int:
+    """
+    Static exchange value of 'move' for the side making it, in centipawns.
+
+    Positive: the exchange wins material, 0: even trade (or quiet move),
+    negative: the moving piece is lost for less than it is worth.
+    """
+    from_sq = move.from_square
+    to_sq = move.to_square
+
+    mover = board.piece_type_at(from_sq)
+    if mover is None:
+        return 0
+
+    occupied = board.occupied ^ chess.BB_SQUARES[from_sq]
+
+    if board.is_en_passant(move):
+        captured_value = SEE_VALUES[chess.PAWN]
+        occupied ^= chess.BB_SQUARES[chess.square(chess.square_file(to_sq), chess.square_rank(from_sq))]
+    else:
+        victim = board.piece_type_at(to_sq)
+        captured_value = SEE_VALUES[victim] if victim else 0
+
+    # Value of the piece now standing on the target square
+    on_square = SEE_VALUES[mover]
+    if move.promotion:
+        captured_value += SEE_VALUES[move.promotion] - SEE_VALUES[chess.PAWN]
+        on_square = SEE_VALUES[move.promotion]
+
+    gains = [captured_value]
+    side = not board.turn
+
+    while True:
+        attackers = board.attackers_mask(side, to_sq, occupied) & occupied
+        found = _least_valuable_attacker(board, attackers, side)
+        if found is None:
+            break
+        piece_type, bb = found
+
+        if piece_type == chess.KING:
+            # The king may only recapture if the square is no longer defended
+            defenders = board.attackers_mask(not side, to_sq, occupied) & occupied
+            if defenders:
+                break
+
+        gains.append(on_square - gains[-1])
+        on_square = SEE_VALUES[piece_type]
+        occupied ^= bb
+        side = not side
+
+    # Each side may decline to continue the exchange: fold back from the end
+    for i in range(len(gains) - 1, 0, -1):
+        gains[i - 1] = -max(-gains[i - 1], gains[i])
+
+    return gains[0]
@@ -0,0 +1,196 @@
+"""
+Shared Transposition Table
+--------------------------
+
+A transposition table that lives in a multiprocessing.shared_memory block,
+so several search processes can read and write the same entries. It has
+the same interface and replacement scheme as TranspositionTable (two slots
+per bucket: depth-preferred and always-replace).
+
+Every slot is two uint64 words: (key XOR data, data). Writers don't take a
+lock; a reader accepts a slot only if its two words still XOR back to the
+probed key, so a slot torn by two processes writing at once just reads as
+a miss instead of returning another position's data.
+
+data layout (low bit first):
+    bits  0-31  value + 2**31
+    bits 32-39  depth
+    bits 40-41  bound flag
+    bits 42-56  move (from square, to square, promotion piece; 0 = none)
+    bits 57-63  generation (mod 128)
+"""
+
+from __future__ import annotations
+
+from multiprocessing import shared_memory
+
+import chess
+import numpy as np
+
+from chess_ai.core.moves import decode_move, encode_move
+from chess_ai.search.transposition import TTEntry
+
+_VALUE_OFFSET = 2**31
+
+class SharedTranspositionTable:
+    """
+    Transposition table in shared memory.
+
+    Create it once in the parent with SharedTranspositionTable(size) and
+    open it in workers with SharedTranspositionTable.attach(name, size).
+    The creator owns the block and frees it with unlink().
+
+    Counters are per process.
+    """
+
+    def __init__(self, size: int = 2**18, name: str | None = None):
+        """
+        Parameters
+        ----------
+        size : int
+            Maximum number of entries (rounded down to a power of two,
+            at least two).
+        name : str or None
+            Attach to an existing block instead of creating one.
+        """
+        num_buckets = 1
+        while num_buckets * 4 <= size:
+            num_buckets *= 2
+        self._mask = num_buckets - 1
+        slots = 2 * num_buckets
+
+        nbytes = slots * 2 * 8
+        if name is None:
+            self._shm = shared_memory.SharedMemory(create=True, size=nbytes)
+            self.owner = True
+        else:
+            self._shm = shared_memory.SharedMemory(name=name)
+            self.owner = False
+
+        self._words = np.ndarray((slots, 2), dtype=np.uint64, buffer=self._shm.buf)
+        if self.owner:
+            self._words.fill(0)
+
+        self.size = size
+        self.generation = 0
+        self.reset_stats()
+
+    @classmethod
+    def attach(cls, name: str, size: int) -> "SharedTranspositionTable":
+        """Open a table created by another process."""
+        return cls(size, name=name)
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    @property
+    def capacity(self) -> int:
+        return len(self._words)
+
+    def reset_stats(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.collisions = 0
+        self.stores = 0
+
+    def new_search(self) -> None:
+        self.generation += 1
+
+    def clear(self) -> None:
+        self._words.fill(0)
+
+    def close(self) -> None:
+        """Detach this process from the block."""
+        self._words = None
+        self._shm.close()
+
+    def unlink(self) -> None:
+        """Detach and free the block (creator only)."""
+        self.close()
+        if self.owner:
+            self._shm.unlink()
+
+    def _read(self, slot: int) -> tuple[int, int]:
+        words = self._words[slot]
+        data = int(words[1])
+        return int(words[0]) ^ data, data
+
+    def probe(self, key: int) -> TTEntry | None:
+        i = (key & self._mask) << 1
+
+        occupied = False
+        for slot in (i, i + 1):
+            slot_key, data = self._read(slot)
+            if not data:
+                continue
+            if slot_key == key:
+                self.hits += 1
+                return self._unpack(key, data)
+            occupied = True
+
+        self.misses += 1
+        if occupied:
+            self.collisions += 1
+        return None
+
+    def store(
+        self,
+        key: int,
+        depth: int,
+        flag: int,
+        value: float,
+        move: chess.Move | None,
+    ) -> None:
+        i = (key & self._mask) << 1
+        deep_key, deep_data = self._read(i)
+
+        if move is None:
+            for slot_key, data in ((deep_key, deep_data), self._read(i + 1)):
+                if data and slot_key == key:
+                    move = decode_move((data >> 42) & 0x7FFF) or None
+                    break
+
+        generation = self.generation & 0x7F
+        data = (
+            (int(value) + _VALUE_OFFSET)
+            | (min(depth, 255) << 32)
+            | (flag << 40)
+            | (encode_move(move) << 42)
+            | (generation << 57)
+        )
+
+        if (
+            not deep_data
+            or depth >= (deep_data >> 32) & 0xFF
+            or deep_data >> 57 != generation
+        ):
+            slot = i
+        else:
+            slot = i + 1
+
+        self._words[slot] = (key ^ data, data)
+        self.stores += 1
+
+    def _unpack(self, key: int, data: int) -> TTEntry:
+        return TTEntry(
+            key,
+            (data >> 32) & 0xFF,
+            (data >> 40) & 0x3,
+            (data & 0xFFFFFFFF) - _VALUE_OFFSET,
+            decode_move((data >> 42) & 0x7FFF) or None,
+            data >> 57,
+        )
+
+    def stats(self) -> dict[str, int | float]:
+        probes = self.hits + self.misses
+        used = int(np.count_nonzero(self._words[:, 1]))
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "collisions": self.collisions,
+            "stores": self.stores,
+            "hit_rate": self.hits / probes if probes else 0.0,
+            "used": used,
+            "capacity": self.capacity,
+        }
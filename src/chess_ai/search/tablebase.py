@@ -0,0 +1,156 @@
+"""
+Endgame Tablebases
+------------------
+
+Perfect play in positions with few pieces, from Syzygy tablebase files
+(probed through chess.syzygy).
+
+- Inside the search, WDL tables (win/draw/loss) settle a node outright. They
+  are probed only right after a capture or pawn move (halfmove clock 0,
+  where the WDL value is exact with respect to the 50-move rule) and
+  without castling rights, which Syzygy tables don't cover.
+- At the root, DTZ tables (distance to the next capture or pawn move) pick
+  the move: the fastest win, else a draw, else the longest resistance.
+
+A probe needs a table for the exact material on the board and for every
+material reachable from it by captures and promotions. Positions with
+more pieces than 'max_pieces' (by default the largest table found) or
+whose tables are missing are left to the search.
+
+WDL results are cached by Zobrist key in an LRU cache, since the search
+reaches the same endgame positions many times over.
+"""
+
+from __future__ import annotations
+
+import os
+from collections import OrderedDict
+
+import chess
+import chess.syzygy
+
+from chess_ai.search.position import Position
+from chess_ai.search.transposition import position_key
+
+# Score of a tablebase win: far above any material balance, but below mate
+# scores, so the search still prefers an actual mate
+TB_WIN = 50_000
+
+def tb_score(wdl: int, ply: int = 0) -> int:
+    """
+    Search score of a WDL value (2 win, 1 win spoiled by the 50-move rule,
+    0 draw, ...) for the side to move, 'ply' plies from the root. Sooner
+    wins and later losses score higher.
+    """
+    if wdl == 2:
+        return TB_WIN - ply
+    if wdl == -2:
+        return -TB_WIN + ply
+    return wdl  # cursed win / blessed loss: a draw, but a slightly better one
+
+class TablebaseProber:
+    """
+    Syzygy probing with a piece-count threshold and an LRU cache of WDL
+    results. 'tablebase' is a directory of Syzygy files or an open
+    chess.syzygy.Tablebase.
+    """
+
+    def __init__(
+        self,
+        tablebase: str | os.PathLike | chess.syzygy.Tablebase,
+        max_pieces: int | None = None,
+        cache_size: int = 2**16,
+    ):
+        if isinstance(tablebase, (str, os.PathLike)):
+            tablebase = chess.syzygy.open_tablebase(os.fspath(tablebase))
+        self.tablebase = tablebase
+
+        # Table names are the material, e.g. "KRPvKR"
+        largest = max((len(name) - 1 for name in tablebase.wdl), default=0)
+        self.max_pieces = largest if max_pieces is None else min(max_pieces, largest)
+        self.cache_size = cache_size
+        self._cache: OrderedDict[int, int | None] = OrderedDict()
+
+        self.hits = 0    # WDL probes answered by the cache
+        self.misses = 0  # WDL probes that read the tables
+
+    def close(self) -> None:
+        self.tablebase.close()
+        self._cache.clear()
+
+    def stats(self) -> dict[str, int | float]:
+        probes = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / probes if probes else 0.0,
+            "cached": len(self._cache),
+        }
+
+    def can_probe(self, board: chess.Board | Position) -> bool:
+        """Whether 'board' is small enough for the tables and has no castling rights."""
+        return (
+            chess.popcount(board.occupied) <= self.max_pieces
+            and not board.castling_rights
+        )
+
+    def probe_wdl(self, board: chess.Board | Position) -> int | None:
+        """
+        WDL value of 'board' for the side to move (-2..2), or None if its
+        tables are missing. Call can_probe() first.
+        """
+        key = position_key(board)
+        cache = self._cache
+        if key in cache:
+            cache.move_to_end(key)
+            self.hits += 1
+            return cache[key]
+
+        self.misses += 1
+        if isinstance(board, Position):
+            board = board.to_board()
+        try:
+            wdl = self.tablebase.probe_wdl(board)
+        except KeyError:  # chess.syzygy.MissingTableError
+            wdl = None
+
+        cache[key] = wdl
+        if len(cache) > self.cache_size:
+            cache.popitem(last=False)
+        return wdl
+
+    def root_move(self, board: chess.Board) -> tuple[chess.Move, int] | None:
+        """
+        Best move of 'board' by DTZ and its WDL value for the side to move,
+        or None if the position can't be probed.
+
+        Winning moves are ranked by how soon the opponent has to make a
+        capture or pawn move (progress towards mate), losing moves by how
+        late.
+        """
+        if not self.can_probe(board):
+            return None
+
+        board = board.copy(stack=False)
+        best = None
+        best_rank = None
+        for move in board.legal_moves:
+            board.push(move)
+            try:
+                wdl = self.tablebase.probe_wdl(board)
+                dtz = self.tablebase.probe_dtz(board)
+            except KeyError:
+                return None
+            finally:
+                board.pop()
+
+            # The child is from the opponent's view: lower WDL is better for
+            # us, and of two wins (negative DTZ) the one closer to zero is
+            # sooner, of two losses (positive DTZ) the larger is longer.
+            rank = (-wdl, dtz)
+            if best_rank is None or rank > best_rank:
+                best, best_rank = move, rank
+
+        if best is None:
+            return None
+        return best, -best_rank[0]
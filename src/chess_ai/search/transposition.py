@@ -0,0 +1,166 @@
+"""
+Transposition Table
+-------------------
+
+A bounded cache of already-searched positions, keyed by the 64-bit Zobrist
+hash python-chess computes for a board (see chess.polyglot.zobrist_hash).
+
+The table is split into buckets of two slots:
+- a depth-preferred slot, which only gives way to an equal-or-deeper search
+  of any position (or to anything once its entry belongs to an older search),
+- an always-replace slot, which takes whatever the depth-preferred slot refused.
+
+Each entry remembers the score, what kind of bound that score is (exact,
+lower or upper), the depth it was searched to and the best move found. The
+search uses the first three to cut off early and the move to search the
+previously best line first.
+"""
+
+from __future__ import annotations
+
+from typing import NamedTuple
+
+import chess
+import chess.polyglot
+
+from chess_ai.search.position import Position
+
+# Bound flags
+EXACT = 0  # score is the true negamax value
+LOWER = 1  # search failed high: true value >= score
+UPPER = 2  # search failed low: true value <= score
+
+def position_key(board: chess.Board | Position) -> int:
+    """Zobrist hash of the position (side to move, castling and en passant included)."""
+    if isinstance(board, Position):
+        return board.key  # kept up to date incrementally
+    return chess.polyglot.zobrist_hash(board)
+
+class TTEntry(NamedTuple):
+    key: int
+    depth: int
+    flag: int
+    value: float
+    move: chess.Move | None
+    generation: int
+
+class TranspositionTable:
+    """
+    Fixed-size two-slot-per-bucket transposition table.
+
+    Counters (reset with reset_stats):
+    - hits       : probes that found the position
+    - misses     : probes that did not
+    - collisions : misses where the bucket was occupied by other positions
+    - stores     : entries written
+    """
+
+    def __init__(self, size: int = 2**18):
+        """
+        Parameters
+        ----------
+        size : int
+            Maximum number of entries. Rounded down to a power of two
+            (at least two, i.e. one bucket).
+        """
+        num_buckets = 1
+        while num_buckets * 4 <= size:
+            num_buckets *= 2
+
+        self._mask = num_buckets - 1
+        self._slots: list[TTEntry | None] = [None] * (2 * num_buckets)
+        self.generation = 0
+        self.used = 0
+        self.reset_stats()
+
+    @property
+    def capacity(self) -> int:
+        """Total number of entries the table can hold."""
+        return len(self._slots)
+
+    def reset_stats(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.collisions = 0
+        self.stores = 0
+
+    def new_search(self) -> None:
+        """
+        Mark the start of a new search. Entries from earlier searches stay
+        usable, but no longer protect their depth-preferred slot.
+        """
+        self.generation += 1
+
+    def clear(self) -> None:
+        """Drop every entry (counters are left alone)."""
+        self._slots = [None] * len(self._slots)
+        self.used = 0
+
+    def probe(self, key: int) -> TTEntry | None:
+        """Return the entry stored for 'key', or None."""
+        i = (key & self._mask) << 1
+        slots = self._slots
+
+        occupied = False
+        for entry in (slots[i], slots[i + 1]):
+            if entry is None:
+                continue
+            if entry.key == key:
+                self.hits += 1
+                return entry
+            occupied = True
+
+        self.misses += 1
+        if occupied:
+            self.collisions += 1
+        return None
+
+    def store(
+        self,
+        key: int,
+        depth: int,
+        flag: int,
+        value: float,
+        move: chess.Move | None,
+    ) -> None:
+        """Record a search result for 'key'."""
+        i = (key & self._mask) << 1
+        slots = self._slots
+        deep = slots[i]
+
+        # Keep a previously found best move if this search didn't produce one
+        # (e.g. a fail-low node where every move was refuted).
+        if move is None:
+            for old in (deep, slots[i + 1]):
+                if old is not None and old.key == key:
+                    move = old.move
+                    break
+
+        entry = TTEntry(key, depth, flag, value, move, self.generation)
+
+        if (
+            deep is None
+            or depth >= deep.depth
+            or deep.generation != self.generation
+        ):
+            slot = i
+        else:
+            slot = i + 1
+
+        if slots[slot] is None:
+            self.used += 1
+        slots[slot] = entry
+        self.stores += 1
+
+    def stats(self) -> dict[str, int | float]:
+        """Counters plus occupancy, handy for sizing the table."""
+        probes = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "collisions": self.collisions,
+            "stores": self.stores,
+            "hit_rate": self.hits / probes if probes else 0.0,
+            "used": self.used,
+            "capacity": self.capacity,
+        }
@@ -7,11 +7,17 @@ Initial Goals:
   - see the current board,
   - submit a UCI move (e.g. "e2e4"),
   - get an agent reply.
+
+Agent replies are computed off the request thread by a bounded worker pool
+(see chess_ai.web.jobs): a move submission answers at once with a job ID,
+and the page (or any JSON client) long-polls /move/<job_id> for the reply.
 """
 
 from __future__ import annotations
 
 import os
+import threading
+import time
 import uuid
 
 import chess
@@ -19,6 +25,7 @@ import chess.pgn
 
 from flask import (
     Flask,
+    jsonify,
     request,
     render_template_string,
     redirect,
@@ -27,11 +34,14 @@ from flask import (
 )
 
 from chess_ai.core.game import ChessGame
-from chess_ai.agents.registry import get_agent
+from chess_ai.agents.pool import AgentConfig, AgentPool
 from chess_ai.cli.app import board_to_ascii
+from chess_ai.web.jobs import FAILED, Job, MoveJobs, QueueFull
+from chess_ai.web.sqlite_store import SQLiteGameStore
+from chess_ai.web.store import GameStore, MemoryGameStore
 
-# Global app + single game/agent (for now). Later on, we'll replace this
-# with per-session game state.
+# One app per process. Each browser session has its own game in the game
+# store below, and agents are leased from a shared pool for each move.
 
 app = Flask(
     __name__,
@@ -46,20 +56,167 @@ app.secret_key = os.environ.get("FLASK_SECRET_KEY", "dev-secret-key-change-me")
 # Per-session game store #
 ##########################
 
-# In-memory mapping: session "game_id" -> ChessGame instance
-games: dict[str, ChessGame] = {}
+# Session "game_id" -> ChessGame, bounded by session count, idle time and an
+# optional memory budget (see chess_ai.web.store). Evicted sessions start a
+# new game on their next request.
+#
+# CHESS_AI_STORE=sqlite keeps the games in an SQLite file instead (see
+# chess_ai.web.sqlite_store), shared by every process that opens it, so the
+# app can run under several gunicorn workers or containers.
+GAME_STORE = os.environ.get("CHESS_AI_STORE", "memory")
+STORE_PATH = os.environ.get("CHESS_AI_STORE_PATH", "games.db")
+MAX_SESSIONS = int(os.environ.get("CHESS_AI_MAX_SESSIONS", 10_000))
+SESSION_TTL = float(os.environ.get("CHESS_AI_SESSION_TTL", 24 * 3600))
+STORE_MAX_MB = os.environ.get("CHESS_AI_STORE_MAX_MB")
+
+# Seconds after which an idle game is held compactly (start FEN + 2 bytes
+# per move) until its session comes back; unset keeps every game live.
+COMPACT_AFTER = os.environ.get("CHESS_AI_COMPACT_AFTER")
+
+games: GameStore
+if GAME_STORE == "sqlite":
+    games = SQLiteGameStore(STORE_PATH, max_sessions=MAX_SESSIONS, ttl=SESSION_TTL)
+else:
+    games = MemoryGameStore(
+        max_sessions=MAX_SESSIONS,
+        ttl=SESSION_TTL,
+        max_bytes=int(float(STORE_MAX_MB) * 2**20) if STORE_MAX_MB else None,
+        compact_after=float(COMPACT_AFTER) if COMPACT_AFTER else None,
+    )
+
+# Guards moves played on the games above (request threads and agent workers)
+games_lock = threading.Lock()
 
 # Choose which agent to use via env var.
 # Defaults to "random" so the app works even if MinimaxAgent is not wired yet.
 AGENT_NAME = os.environ.get("CHESS_AI_AGENT", "random")
 
-# You can pass kwargs for certain agents if you like, e.g. for minimax:
-AGENT_KWARGS: dict[str, object] = {}
-if AGENT_NAME == "minimax":
-    # Adjust depth, pruning, etc. as you wish
-    AGENT_KWARGS = {"depth": 2, "use_alpha_beta": True, "use_quiescence": False}
+# Agents a session may switch to (comma-separated registry names)
+SESSION_AGENTS = [
+    name.strip()
+    for name in os.environ.get("CHESS_AI_SESSION_AGENTS", AGENT_NAME).split(",")
+    if name.strip()
+]
+if AGENT_NAME not in SESSION_AGENTS:
+    SESSION_AGENTS.insert(0, AGENT_NAME)
+
+# Budgets a session may pick, and their upper limits
+MAX_SESSION_DEPTH = int(os.environ.get("CHESS_AI_MAX_DEPTH", 4))
+MAX_SESSION_TIME_MS = int(os.environ.get("CHESS_AI_MAX_TIME_MS", 2000))
+
+def agent_kwargs(name: str) -> dict[str, object]:
+    """Constructor kwargs the web app uses for agent 'name'."""
+    kwargs: dict[str, object] = {}
+    if name == "minimax":
+        # Adjust depth, pruning, etc. as you wish
+        kwargs = {"depth": 2, "use_alpha_beta": True, "use_quiescence": False}
+        # Optional Polyglot opening book (see chess_ai.search.book)
+        if os.environ.get("CHESS_AI_BOOK"):
+            kwargs["book"] = os.environ["CHESS_AI_BOOK"]
+    return kwargs
+
+
+#####################
+# Agent worker pool #
+#####################
+
+# Agent moves are computed by a bounded pool of worker threads, each leasing
+# an agent for the session's configuration from a shared AgentPool. Past
+# AGENT_WORKERS running plus AGENT_MAX_QUEUE waiting moves, new moves are
+# turned away with a 503 until the queue drains.
+AGENT_WORKERS = int(os.environ.get("CHESS_AI_WORKERS", 2))
+AGENT_MAX_QUEUE = int(os.environ.get("CHESS_AI_MAX_QUEUE", 32))
+
+# Longest a poll for an agent move may be held open, in seconds
+LONG_POLL_MAX = float(os.environ.get("CHESS_AI_LONG_POLL", 25))
+
+# Seconds a client is asked to wait before retrying a rejected move
+RETRY_AFTER = 1
+
+# Seconds an agent move submitted by another process (or before a restart)
+# is waited for before it is asked for again
+AGENT_JOB_TIMEOUT = float(os.environ.get("CHESS_AI_JOB_TIMEOUT", 60))
+
+# At most one agent per worker thread and configuration is ever in use
+agents = AgentPool(max_idle=AGENT_WORKERS)
+
+jobs = MoveJobs(agents, workers=AGENT_WORKERS, max_queue=AGENT_MAX_QUEUE)
+
+def session_agent() -> AgentConfig:
+    """The agent configuration and budget the current session plays against."""
+    name = session.get("agent", AGENT_NAME)
+    if name not in SESSION_AGENTS:
+        name = AGENT_NAME
+    return AgentConfig(name, agent_kwargs(name), session.get("budget") or None)
+
+def play_agent_move(job, move) -> None:
+    """
+    Play the agent's move on its game (called on the worker thread), unless
+    the game moved on while the agent was thinking (e.g. a resignation).
+    """
+    if move is None:
+        return
+    with games_lock:
+        game = games.get(job.game_id)
+        if game is None:
+            return
+        board = game.board
+        if len(board.move_stack) == job.ply and board.fen() == job.fen:
+            board.push(move)
+            games.put(job.game_id, game)
+
+# The human plays White; the agent answers as Black
+AGENT_COLOR = chess.BLACK
+
+def agent_to_move(game: ChessGame) -> bool:
+    """Whether the game waits for the agent's move."""
+    board = game.board
+    return board.turn == AGENT_COLOR and not board.is_game_over()
+
+def submit_agent_job(game: ChessGame) -> Job:
+    """
+    Queue the agent's move for the current session's game and remember the
+    job on the session. Raises QueueFull if the queue is full.
+    """
+    job = jobs.submit(game, session_agent(), session["game_id"], on_move=play_agent_move)
+    session["job_id"] = job.id
+    session["job_submitted"] = time.time()
+    return job
 
-ai = get_agent(AGENT_NAME, **AGENT_KWARGS)
+def agent_job(game: ChessGame) -> tuple[Job | None, bool, str | None]:
+    """
+    The agent's progress on the current session's game, as (job, thinking,
+    error):
+
+    - job: the session's job while it is queued or running in this process;
+    - thinking: whether the agent is still to answer, here or, for up to
+      AGENT_JOB_TIMEOUT seconds after the job was submitted, in another
+      process sharing the game store;
+    - error: why the session's job failed. The player's move is then taken
+      back so it can be played (or replaced) again.
+
+    A game that waits for the agent with no live job (its job was lost in a
+    restart, or timed out elsewhere) gets a new one, so it never waits
+    forever. Raises QueueFull if that job can't be queued.
+    """
+    job = jobs.get(session.get("job_id", ""))
+    if job is not None and not job.is_finished:
+        return job, True, None
+    if not agent_to_move(game):
+        return None, False, None
+
+    if job is not None and job.status == FAILED:
+        with games_lock:
+            board = game.board
+            if len(board.move_stack) == job.ply and board.fen() == job.fen:
+                board.pop()
+                save_game(game)
+        session.pop("job_id", None)
+        return None, False, f"The agent could not move: {job.error}. Your move was taken back."
+
+    if job is None and time.time() - session.get("job_submitted", 0) < AGENT_JOB_TIMEOUT:
+        return None, True, None
+    return submit_agent_job(game), True, None
 
 def get_or_create_game() -> ChessGame:
     """
@@ -67,11 +224,17 @@ def get_or_create_game() -> ChessGame:
     If none exists yet, create one and remember its ID on the session.
     """
     game_id = session.get("game_id")
-    if game_id is None or game_id not in games:
+    game = games.get(game_id) if game_id is not None else None
+    if game is None:
         game_id = str(uuid.uuid4())
         session["game_id"] = game_id
-        games[game_id] = ChessGame()
-    return games[game_id]
+        game = ChessGame()
+        games.put(game_id, game)
+    return game
+
+def save_game(game: ChessGame) -> None:
+    """Store the current session's game again after changing it."""
+    games.put(session["game_id"], game)
 
 def game_to_pgn(game: ChessGame) -> str:
     """
@@ -113,6 +276,11 @@ PAGE_TEMPLATE = """
     <title>chess-ai!</title>
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <link rel="stylesheet" href="{{ url_for('static', filename='css/style.css') }}">
+    {% if job_id %}
+    <noscript><meta http-equiv="refresh" content="2"></noscript>
+    {% elif refresh %}
+    <meta http-equiv="refresh" content="2">
+    {% endif %}
   </head>
   <body>
     <div class="wrapper">
@@ -147,6 +315,28 @@ PAGE_TEMPLATE = """
             Tip: Enter <code>q</code> to resign and start a new game.
           </p>
 
+          <form class="move-form" action="{{ url_for('update_settings') }}" method="post">
+            <div class="field-group">
+              <label for="agent">Opponent</label>
+              <select id="agent" name="agent">
+                {% for name in agent_names %}
+                <option value="{{ name }}" {% if name == settings.agent %}selected{% endif %}>{{ name }}</option>
+                {% endfor %}
+              </select>
+            </div>
+            <div class="field-group">
+              <label for="depth">Depth (1-{{ max_depth }})</label>
+              <input type="number" id="depth" name="depth" min="1" max="{{ max_depth }}" value="{{ settings.budget.depth or '' }}">
+            </div>
+            <div class="field-group">
+              <label for="time_limit_ms">Time per move, ms (max {{ max_time_ms }})</label>
+              <input type="number" id="time_limit_ms" name="time_limit_ms" min="1" max="{{ max_time_ms }}" value="{{ settings.budget.time_limit_ms or '' }}">
+            </div>
+            <div class="button-group">
+              <button type="submit">Apply</button>
+            </div>
+          </form>
+
           <p class="small-note">
             <a href="{{ url_for('show_pgn') }}" style="color: #9effa8; text-decoration: none;">
               View current game as PGN
@@ -155,6 +345,23 @@ PAGE_TEMPLATE = """
         </div>
       </div>
     </div>
+    {% if job_id %}
+    <script>
+      // Long-poll for the agent's reply, then reload to show it
+      (function poll() {
+        fetch("{{ url_for('move_status', job_id=job_id) }}?wait=20", {headers: {"Accept": "application/json"}})
+          .then(function (resp) { return resp.json(); })
+          .then(function (job) {
+            if (job.status === "queued" || job.status === "running") {
+              poll();
+            } else {
+              window.location.reload();
+            }
+          })
+          .catch(function () { setTimeout(poll, 2000); });
+      })();
+    </script>
+    {% endif %}
   </body>
 </html>
 """
@@ -302,27 +509,69 @@ def index():
         return redirect(url_for("access"))
 
     game = get_or_create_game()
-    board_ascii = board_to_ascii(game)
-
+    try:
+        job, thinking, error = agent_job(game)
+    except QueueFull:
+        return render_page(game, "The server is busy. The agent will move shortly.", True, refresh=True)
+    if error is not None:
+        return render_page(game, error, True)
+    if thinking:
+        return render_page(game, "Agent is thinking...", False, job, refresh=job is None)
+    return render_page(game, message=None, is_error=False)
+
+def wants_json() -> bool:
+    """Whether the client asked for a JSON response rather than a page."""
+    if request.is_json:
+        return True
+    best = request.accept_mimetypes.best_match(["text/html", "application/json"])
+    return best == "application/json"
+
+def render_page(game: ChessGame, message: str | None, is_error: bool, job=None, refresh=False):
     return render_template_string(
         PAGE_TEMPLATE,
-        board_ascii=board_ascii,
-        message=None,
-        is_error=False,
+        board_ascii=board_to_ascii(game),
+        message=message,
+        is_error=is_error,
+        job_id=job.id if job else None,
+        refresh=refresh,
+        settings=session_settings(),
+        agent_names=SESSION_AGENTS,
+        max_depth=MAX_SESSION_DEPTH,
+        max_time_ms=MAX_SESSION_TIME_MS,
     )
 
+def move_response(game: ChessGame, message: str | None, is_error: bool, status: int = 200, job=None):
+    """The page, or its JSON equivalent, for the outcome of a move submission."""
+    if wants_json():
+        body = {"fen": game.board.fen(), "message": message}
+        if job is not None:
+            body.update(job.as_dict())
+            body["poll"] = url_for("move_status", job_id=job.id)
+        response = jsonify(body)
+    else:
+        response = render_page(game, message, is_error, job)
+    response = app.make_response((response, status))
+    if status == 503:
+        response.headers["Retry-After"] = str(RETRY_AFTER)
+    return response
+
 @app.post("/move")
 def make_move():
     """
-    Handle a move submitted from the form.
+    Handle a move submitted from the form (or as JSON: {"move": "e2e4"}).
 
     Behavior:
     - Empty input -> ask user to enter something.
     - 'q'         -> treat as resign, reset the game.
+    - Agent still thinking about the last move -> 409. If its job failed,
+                    the previous move is taken back (also 409); if it
+                    was lost, the agent's move is queued again.
     - Invalid UCI -> show error.
     - Illegal move-> show error.
-    - Legal move  -> apply human move, then let AI respond (if game not over),
-                    then redirect back to index.
+    - Legal move  -> apply human move, then queue the AI's reply (if game
+                    not over) and redirect back to index, which polls for
+                    it. JSON clients get 202 and the job to poll instead.
+    - Queue full  -> undo the human move and answer 503 with Retry-After.
     """
     # Access-gate check
     if ACCESS_KEY and not session.get("access_granted"):
@@ -331,70 +580,158 @@ def make_move():
     game = get_or_create_game()
     board = game.board
 
-    move_str = (request.form.get("move") or "").strip()
+    payload = request.get_json(silent=True) or {}
+    move_str = str(payload.get("move") or request.form.get("move") or "").strip()
 
     # 1. No input
     if not move_str:
-        msg = "Please enter a move."
-        board_ascii = board_to_ascii(game)
-        return render_template_string(
-            PAGE_TEMPLATE,
-            board_ascii=board_ascii,
-            message=msg,
-            is_error=True,
-        )
+        return move_response(game, "Please enter a move.", True, 400)
 
     # 2. Resign / reset on 'q'
     if move_str.lower() == "q":
-        msg = "You resigned. Starting a new game."
-        board.reset()
+        with games_lock:
+            board.reset()
+            save_game(game)
         if hasattr(game, "move_history"):
             game.move_history = []
+        session.pop("job_id", None)
+        session.pop("job_submitted", None)
+        return move_response(game, "You resigned. Starting a new game.", False)
 
-        board_ascii = board_to_ascii(game)
-        return render_template_string(
-            PAGE_TEMPLATE,
-            board_ascii=board_ascii,
-            message=msg,
-            is_error=False,
-        )
-
-    # 3. Parse UCI move
+    # 3. Wait for the agent's reply to the previous move
+    try:
+        job, thinking, error = agent_job(game)
+    except QueueFull:
+        msg = "The server is busy. Please try your move again in a moment."
+        return move_response(game, msg, True, 503)
+    if error is not None:
+        return move_response(game, error, True, 409)
+    if thinking:
+        return move_response(game, "Agent is still thinking.", True, 409, job)
+
+    # 4. Parse UCI move
     try:
         move = chess.Move.from_uci(move_str)
     except ValueError:
-        msg = f"Invalid UCI move: {move_str}"
-        board_ascii = board_to_ascii(game)
-        return render_template_string(
-            PAGE_TEMPLATE,
-            board_ascii=board_ascii,
-            message=msg,
-            is_error=True,
-        )
-
-    # 4. Check legality
+        return move_response(game, f"Invalid UCI move: {move_str}", True, 400)
+
+    # 5. Check legality
     if move not in board.legal_moves:
-        msg = f"Illegal move: {move_str}"
-        board_ascii = board_to_ascii(game)
-        return render_template_string(
-            PAGE_TEMPLATE,
-            board_ascii=board_ascii,
-            message=msg,
-            is_error=True,
-        )
-
-    # 5. Apply human move
-    board.push(move)
-
-    # 6. Let the AI respond if the game is not over
+        return move_response(game, f"Illegal move: {move_str}", True, 400)
+
+    # 6. Apply human move
+    with games_lock:
+        board.push(move)
+        save_game(game)
+
+    # 7. Queue the AI's reply if the game is not over
+    job = None
     if not board.is_game_over():
-        ai_move = ai.choose_move(game)
-        if ai_move is not None:
-            board.push(ai_move)
+        try:
+            job = submit_agent_job(game)
+        except QueueFull:
+            with games_lock:
+                board.pop()
+                save_game(game)
+            msg = "The server is busy. Please try your move again in a moment."
+            return move_response(game, msg, True, 503)
+
+    # 8. Redirect back to main page (Post/Redirect/Get pattern)
+    if wants_json():
+        return move_response(game, None, False, 202 if job else 200, job)
+    return redirect(url_for("index"))
+
+@app.get("/move/<job_id>")
+def move_status(job_id: str):
+    """
+    JSON status of an agent move: {"job_id", "status", "move", "error", "fen"}.
 
-    # 7. Redirect back to main page (Post/Redirect/Get pattern)
+    With ?wait=N the request is held until the move is ready or N seconds
+    (at most LONG_POLL_MAX) have passed.
+    """
+    if ACCESS_KEY and not session.get("access_granted"):
+        return jsonify({"error": "Access key required."}), 403
+
+    job = jobs.get(job_id)
+    if job is None or job.game_id != session.get("game_id"):
+        return jsonify({"error": f"Unknown job: {job_id}"}), 404
+
+    wait = min(max(request.args.get("wait", 0.0, type=float), 0.0), LONG_POLL_MAX)
+    if wait:
+        job.wait(wait)
+
+    body = job.as_dict()
+    game = games.get(job.game_id)
+    body["fen"] = game.board.fen() if game else None
+    return jsonify(body)
+
+def session_settings() -> dict[str, object]:
+    config = session_agent()
+    return {"agent": config.name, "budget": config.budget or {}}
+
+# Budgets a session may set, with their upper limits
+SESSION_BUDGETS = {
+    "depth": MAX_SESSION_DEPTH,
+    "time_limit_ms": MAX_SESSION_TIME_MS,
+}
+
+@app.get("/settings")
+def show_settings():
+    """JSON of the agent and budget the current session plays against."""
+    if ACCESS_KEY and not session.get("access_granted"):
+        return jsonify({"error": "Access key required."}), 403
+    return jsonify(session_settings())
+
+@app.post("/settings")
+def update_settings():
+    """
+    Choose the session's opponent and its budget (form or JSON fields
+    "agent", "depth", "time_limit_ms"; an empty budget field drops it).
+    Agent instances are pooled per configuration, so changing budgets
+    doesn't build new agents.
+    """
+    if ACCESS_KEY and not session.get("access_granted"):
+        return redirect(url_for("access"))
+
+    fields = request.get_json(silent=True) or request.form
+    error = None
+
+    name = str(fields.get("agent") or session.get("agent", AGENT_NAME))
+    if name not in SESSION_AGENTS:
+        error = f"Unknown agent: {name}"
+
+    budget = {}
+    for key, limit in SESSION_BUDGETS.items():
+        value = fields.get(key)
+        if value in (None, ""):
+            continue
+        try:
+            value = int(value)
+        except (TypeError, ValueError):
+            value = 0
+        if not 1 <= value <= limit:
+            error = f"{key} must be between 1 and {limit}"
+        budget[key] = value
+
+    if error is None:
+        session["agent"] = name
+        session["budget"] = budget
+
+    if wants_json():
+        if error is not None:
+            return jsonify({"error": error}), 400
+        return jsonify(session_settings())
+    if error is not None:
+        return move_response(get_or_create_game(), error, True, 400)
     return redirect(url_for("index"))
 
+@app.get("/stats")
+def show_stats():
+    """JSON counters of the game store and the agent worker pool."""
+    if ACCESS_KEY and not session.get("access_granted"):
+        return jsonify({"error": "Access key required."}), 403
+    return jsonify({"games": games.stats(), "jobs": jobs.stats(), "agents": agents.stats()})
+
 @app.get("/pgn")
 def show_pgn():
     """
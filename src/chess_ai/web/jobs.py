@@ -0,0 +1,215 @@
+"""
+Agent Move Jobs
+---------------
+
+Runs agent moves off the request thread. A request hands the position to
+MoveJobs.submit, gets a Job back straight away and answers with its ID;
+the client then polls (or long-polls) for the reply while a bounded pool
+of worker threads does the thinking.
+
+Each job leases an agent for its configuration from an AgentPool (see
+chess_ai.agents.pool) for as long as it thinks, so no agent ever runs two
+searches at once, while agents and their search tables are reused from
+one job to the next.
+
+The number of jobs queued or running is capped. Past the cap, submit
+raises QueueFull and the web tier answers with a back-pressure response
+instead of queueing work it can't get to, which keeps request latency flat
+and memory bounded under load.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+import uuid
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+import chess
+
+from chess_ai.agents.pool import AgentConfig, AgentPool
+from chess_ai.core.game import ChessGame
+
+logger = logging.getLogger(__name__)
+
+# Job states; a job moves forward through them exactly once
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+class QueueFull(Exception):
+    """Raised by MoveJobs.submit when the queue-depth limit is reached."""
+
+class Job:
+    """One agent move being computed for a game."""
+
+    __slots__ = ("id", "game_id", "fen", "ply", "status", "move", "error",
+                 "submitted", "finished", "_done")
+
+    def __init__(self, game_id: str | None, board: chess.Board):
+        self.id = uuid.uuid4().hex
+        self.game_id = game_id
+        self.fen = board.fen()               # position the agent was asked about
+        self.ply = len(board.move_stack)
+        self.status = QUEUED
+        self.move: chess.Move | None = None
+        self.error: str | None = None
+        self.submitted = time.monotonic()
+        self.finished: float | None = None
+        self._done = threading.Event()
+
+    @property
+    def is_finished(self) -> bool:
+        return self._done.is_set()
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Block until the job is finished or 'timeout' seconds passed."""
+        return self._done.wait(timeout)
+
+    def as_dict(self) -> dict[str, object]:
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "move": self.move.uci() if self.move else None,
+            "error": self.error,
+        }
+
+class MoveJobs:
+    """
+    Bounded pool of agent worker threads.
+
+    At most 'workers' jobs run at once and at most 'max_queue' more wait
+    for a worker. The last 'keep_finished' finished jobs stay around for
+    clients to collect.
+
+    Call close() to stop the workers when the pool is no longer needed.
+    """
+
+    def __init__(
+        self,
+        agents: AgentPool,
+        workers: int = 2,
+        max_queue: int = 32,
+        keep_finished: int = 1024,
+    ):
+        self.agents = agents
+        self.workers = max(1, workers)
+        self.max_queue = max(0, max_queue)
+        self.keep_finished = keep_finished
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.workers,
+            thread_name_prefix="chess-ai-agent",
+        )
+        self._finalizer = weakref.finalize(
+            self, self._executor.shutdown, wait=False, cancel_futures=True
+        )
+        self._lock = threading.Lock()
+        self._jobs: OrderedDict[str, Job] = OrderedDict()
+        self._pending = 0
+
+        # Counters, see stats()
+        self.submitted = 0
+        self.rejected = 0
+        self.failed = 0
+
+    def close(self) -> None:
+        """Stop the worker threads; queued jobs are dropped."""
+        self._finalizer()
+
+    @property
+    def depth(self) -> int:
+        """Jobs queued or running."""
+        return self._pending
+
+    @property
+    def limit(self) -> int:
+        """Most jobs that may be queued or running at once."""
+        return self.workers + self.max_queue
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "workers": self.workers,
+            "depth": self._pending,
+            "limit": self.limit,
+            "submitted": self.submitted,
+            "rejected": self.rejected,
+            "failed": self.failed,
+        }
+
+    def submit(
+        self,
+        game: ChessGame,
+        config: AgentConfig,
+        game_id: str | None = None,
+        on_move: Callable[[Job, chess.Move | None], None] | None = None,
+    ) -> Job:
+        """
+        Queue a move by an agent of 'config' for the current position of
+        'game' and return its Job.
+
+        The agent works on a copy of the board, so 'game' can change while
+        it thinks. 'on_move(job, move)' is called on the worker thread with
+        the agent's move before the job is marked done, e.g. to play it on
+        the game if the game is still where the job left it.
+
+        Raises QueueFull if the queue-depth limit is reached.
+        """
+        with self._lock:
+            if self._pending >= self.limit:
+                self.rejected += 1
+                raise QueueFull(f"{self._pending} agent moves already queued or running")
+            self._pending += 1
+            self.submitted += 1
+            job = Job(game_id, game.board)
+            self._jobs[job.id] = job
+            self._trim()
+
+        snapshot = ChessGame(board=game.board.copy())
+        self._executor.submit(self._run, job, snapshot, config, on_move)
+        return job
+
+    def get(self, job_id: str) -> Job | None:
+        return self._jobs.get(job_id)
+
+    def wait(self, job_id: str, timeout: float | None = None) -> Job | None:
+        """The job, once finished or after 'timeout' seconds (long-poll)."""
+        job = self._jobs.get(job_id)
+        if job is not None:
+            job.wait(timeout)
+        return job
+
+    def _run(self, job: Job, game: ChessGame, config: AgentConfig, on_move) -> None:
+        job.status = RUNNING
+        try:
+            with self.agents.lease(config) as agent:
+                move = agent.choose_move(game)
+            if on_move is not None:
+                on_move(job, move)
+            job.move = move
+            job.status = DONE
+        except Exception as exc:
+            logger.exception("agent job %s failed", job.id)
+            job.error = str(exc) or type(exc).__name__
+            job.status = FAILED
+            with self._lock:
+                self.failed += 1
+        finally:
+            job.finished = time.monotonic()
+            with self._lock:
+                self._pending -= 1
+            job._done.set()
+
+    def _trim(self) -> None:
+        """Forget the oldest finished jobs beyond 'keep_finished' (lock held)."""
+        jobs = self._jobs
+        while len(jobs) > self.keep_finished:
+            oldest = next(iter(jobs.values()))
+            if not oldest.is_finished:
+                break
+            jobs.popitem(last=False)
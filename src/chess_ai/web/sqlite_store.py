@@ -0,0 +1,271 @@
+"""
+SQLite Game Store
+-----------------
+
+A GameStore in an SQLite file, so every web process (gunicorn workers,
+containers sharing a volume) sees the same games, keyed by game_id.
+
+Games are stored as CompactGame rows (start FEN plus packed moves), so a
+row is a few hundred bytes and a get() replays the moves into a ChessGame.
+
+- WAL journal: readers never block the writer and vice versa.
+- Connection pool: up to 'pool_size' connections, opened on demand and
+  handed to one thread at a time.
+- Batched writes (group commit): a put() waits for its row to be
+  committed, but all puts that arrive while a commit is in progress go
+  into the next commit together, as one transaction.
+- TTL and session cap: every 'sweep_every' written rows, games not written
+  for 'ttl' seconds and the oldest games beyond 'max_sessions' are deleted
+  in the same transaction.
+
+A game's age counts from its last put(), i.e. its last move; page views
+alone don't keep it alive.
+"""
+
+from __future__ import annotations
+
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+from chess_ai.core.game import ChessGame
+from chess_ai.web.store import CompactGame, GameStore
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    game_id TEXT PRIMARY KEY,
+    fen     TEXT NOT NULL,
+    moves   BLOB NOT NULL,
+    touched REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS games_touched ON games (touched);
+"""
+
+UPSERT = """
+INSERT INTO games (game_id, fen, moves, touched) VALUES (?, ?, ?, ?)
+ON CONFLICT (game_id) DO UPDATE SET
+    fen = excluded.fen, moves = excluded.moves, touched = excluded.touched
+"""
+
+class _Batch:
+    """Rows committed together; 'done' once the commit has been attempted."""
+
+    __slots__ = ("done", "error")
+
+    def __init__(self):
+        self.done = False
+        self.error: BaseException | None = None
+
+class SQLiteGameStore(GameStore):
+    """Game store in an SQLite database file, shared between processes."""
+
+    def __init__(
+        self,
+        path: str = "games.db",
+        max_sessions: int = 100_000,
+        ttl: float | None = 24 * 3600,
+        pool_size: int = 4,
+        sweep_every: int = 256,
+        timeout: float = 5.0,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Parameters
+        ----------
+        path : str
+            Database file; created (with its table) if missing.
+        max_sessions : int
+            Most games kept; the least recently written go first.
+        ttl : float or None
+            Seconds since its last put() after which a game is deleted
+            (None: no limit).
+        pool_size : int
+            Most connections open at once.
+        sweep_every : int
+            Rows written between two TTL / session cap sweeps.
+        timeout : float
+            Seconds to wait for a free connection or a database lock.
+        clock : callable
+            Wall-clock time source, in seconds (shared between processes).
+        """
+        self.path = path
+        self.max_sessions = max(1, max_sessions)
+        self.ttl = ttl
+        self.pool_size = max(1, pool_size)
+        self.sweep_every = sweep_every
+        self.timeout = timeout
+        self.clock = clock
+
+        self._idle: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue()
+        self._connections: list[sqlite3.Connection] = []
+        self._pool_lock = threading.Lock()
+
+        # Group commit: puts add rows to _pending (latest per game_id) and
+        # belong to _batch; whoever holds _write_lock commits them all
+        self._pending: dict[str, tuple] = {}
+        self._batch = _Batch()
+        self._pending_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._since_sweep = 0
+
+        # Counters for this process, see stats()
+        self.reads = 0
+        self.writes = 0
+        self.commits = 0
+        self.evictions = {"capacity": 0, "ttl": 0}
+
+        with self._connection() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.path,
+            timeout=self.timeout,
+            isolation_level=None,       # transactions are explicit
+            check_same_thread=False,    # pooled, one thread at a time
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        """Lease a pooled connection, opening one if the pool isn't full."""
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            with self._pool_lock:
+                opened = len(self._connections) < self.pool_size
+                if opened:
+                    conn = self._connect()
+                    self._connections.append(conn)
+            if not opened:
+                conn = self._idle.get(timeout=self.timeout)
+        try:
+            yield conn
+        finally:
+            self._idle.put(conn)
+
+    def close(self) -> None:
+        """Commit outstanding writes and close every connection."""
+        self._commit(self._batch)
+        with self._pool_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+            self._idle = queue.LifoQueue()
+
+    ##########
+    # ACCESS #
+    ##########
+
+    def get(self, game_id: str) -> ChessGame | None:
+        with self._pending_lock:
+            row = self._pending.get(game_id)
+        if row is None:
+            with self._connection() as conn:
+                row = conn.execute(
+                    "SELECT game_id, fen, moves, touched FROM games WHERE game_id = ?",
+                    (game_id,),
+                ).fetchone()
+        self.reads += 1
+        if row is None:
+            return None
+        _, fen, moves, touched = row
+        if self.ttl is not None and self.clock() - touched > self.ttl:
+            return None  # expired, deleted by the next sweep
+        return CompactGame(fen, moves).to_game()
+
+    def put(self, game_id: str, game: ChessGame) -> None:
+        compact = CompactGame.from_game(game)
+        with self._pending_lock:
+            self._pending[game_id] = (game_id, compact.fen, compact.moves, self.clock())
+            batch = self._batch
+        self._commit(batch)
+
+    def delete(self, game_id: str) -> None:
+        with self._write_lock:
+            with self._pending_lock:
+                self._pending.pop(game_id, None)
+            with self._connection() as conn:
+                conn.execute("DELETE FROM games WHERE game_id = ?", (game_id,))
+
+    def stats(self) -> dict[str, object]:
+        with self._connection() as conn:
+            sessions, nbytes = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(LENGTH(fen) + LENGTH(moves)), 0) FROM games"
+            ).fetchone()
+        return {
+            "sessions": sessions,
+            "max_sessions": self.max_sessions,
+            "bytes": nbytes,
+            "reads": self.reads,
+            "writes": self.writes,
+            "commits": self.commits,
+            "rows_per_commit": self.writes / self.commits if self.commits else 0.0,
+            "connections": len(self._connections),
+            "evictions": dict(self.evictions),
+        }
+
+    ##########
+    # WRITES #
+    ##########
+
+    def _commit(self, batch: _Batch) -> None:
+        """
+        Return once 'batch' is committed: either another thread committed
+        it while this one waited for the write lock, or this thread commits
+        it, together with every row pending by then.
+        """
+        with self._write_lock:
+            if not batch.done:
+                with self._pending_lock:
+                    rows = list(self._pending.values())
+                    self._pending.clear()
+                    current, self._batch = self._batch, _Batch()
+                try:
+                    if rows:
+                        self._write(rows)
+                except BaseException as exc:
+                    current.error = exc
+                    raise
+                finally:
+                    current.done = True
+            elif batch.error is not None:
+                raise batch.error
+
+    def _write(self, rows: list[tuple]) -> None:
+        """Upsert 'rows' in one transaction, sweeping when due (write lock held)."""
+        self._since_sweep += len(rows)
+        sweep = self._since_sweep >= self.sweep_every
+        with self._connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.executemany(UPSERT, rows)
+                if sweep:
+                    self._sweep(conn)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        self.writes += len(rows)
+        self.commits += 1
+        if sweep:
+            self._since_sweep = 0
+
+    def _sweep(self, conn: sqlite3.Connection) -> None:
+        """Delete expired games and the oldest beyond the session cap."""
+        if self.ttl is not None:
+            cursor = conn.execute(
+                "DELETE FROM games WHERE touched < ?", (self.clock() - self.ttl,)
+            )
+            self.evictions["ttl"] += cursor.rowcount
+        cursor = conn.execute(
+            "DELETE FROM games WHERE game_id IN "
+            "(SELECT game_id FROM games ORDER BY touched DESC LIMIT -1 OFFSET ?)",
+            (self.max_sessions,),
+        )
+        self.evictions["capacity"] += cursor.rowcount
@@ -0,0 +1,300 @@
+"""
+Game Store
+----------
+
+Where the web app keeps each session's game, keyed by game_id.
+
+GameStore is the interface the app talks to: get a game, put it back
+after changing it, delete it. MemoryGameStore keeps live ChessGame objects
+in this process, bounded three ways:
+
+- max_sessions: past it, the least recently used game is evicted,
+- ttl: games not touched for that many seconds are evicted,
+- max_bytes: past it (by the estimate below), least recently used games
+  are evicted until the store fits again.
+
+Sizes are estimates from the length of the move stack: a python-chess
+Board keeps a Move and a board state snapshot per move played, which
+dominate once a game is under way. Every eviction is counted by reason.
+
+With compact_after set, games idle for that many seconds are held as a
+CompactGame instead (start FEN plus two bytes per move, ~100x smaller than
+a live Board mid-game) and replayed into a ChessGame when next accessed.
+"""
+
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from typing import Callable, NamedTuple
+
+import chess
+
+from chess_ai.core.game import ChessGame
+from chess_ai.core.moves import decode_move, encode_move
+
+# Approximate heap bytes of a ChessGame and of each move on its stack
+# (measured with tracemalloc on CPython 3.11)
+GAME_BYTES = 800
+MOVE_BYTES = 490
+
+def game_nbytes(game: ChessGame) -> int:
+    """Estimated memory held by 'game'."""
+    return GAME_BYTES + MOVE_BYTES * len(game.board.move_stack)
+
+class CompactGame(NamedTuple):
+    """A game as its start position and its moves, 16 bits each."""
+
+    fen: str
+    moves: bytes  # little-endian uint16 chess_ai.core.moves codes
+
+    @classmethod
+    def from_game(cls, game: ChessGame) -> CompactGame:
+        board = game.board
+        fen = board.root().fen() if board.move_stack else board.fen()
+        if fen == chess.STARTING_FEN:
+            fen = chess.STARTING_FEN  # shared, not one copy per game
+        moves = array("H", [encode_move(move) for move in board.move_stack])
+        if sys.byteorder == "big":
+            moves.byteswap()
+        return cls(fen, moves.tobytes())
+
+    def to_game(self) -> ChessGame:
+        """The game, replayed with its full move stack (repetitions included)."""
+        board = chess.Board(self.fen)
+        moves = array("H")
+        moves.frombytes(self.moves)
+        if sys.byteorder == "big":
+            moves.byteswap()
+        for code in moves:
+            board.push(decode_move(code))
+        return ChessGame(board=board)
+
+    def to_bytes(self) -> bytes:
+        """One blob, for key-value stores: FEN, newline, moves."""
+        return self.fen.encode() + b"\n" + self.moves
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> CompactGame:
+        fen, _, moves = data.partition(b"\n")
+        fen = fen.decode()
+        if fen == chess.STARTING_FEN:
+            fen = chess.STARTING_FEN
+        return cls(fen, moves)
+
+    @property
+    def nbytes(self) -> int:
+        size = sys.getsizeof(self) + sys.getsizeof(self.moves)
+        if self.fen is not chess.STARTING_FEN:
+            size += sys.getsizeof(self.fen)
+        return size
+
+class GameStore:
+    """
+    Base class for session game stores.
+
+    A store shared between processes (see chess_ai.web.sqlite_store) hands
+    out a fresh ChessGame from every get(), so changes only count once they
+    are put back. A key-value backend (Redis and the like) can implement
+    the three methods with GET / SET with expiry / DEL on
+    CompactGame.to_bytes blobs.
+    """
+
+    def get(self, game_id: str) -> ChessGame | None:
+        """The game stored under 'game_id' (None if unknown or evicted)."""
+        raise NotImplementedError
+
+    def put(self, game_id: str, game: ChessGame) -> None:
+        """Store 'game' under 'game_id'. Call again after changing the game."""
+        raise NotImplementedError
+
+    def delete(self, game_id: str) -> None:
+        """Forget 'game_id' (no error if it isn't stored)."""
+        raise NotImplementedError
+
+    def stats(self) -> dict[str, object]:
+        return {}
+
+    def close(self) -> None:
+        pass
+
+    # Dict-style access, as when the store was a plain dict
+    def __contains__(self, game_id: str) -> bool:
+        return self.get(game_id) is not None
+
+    def __getitem__(self, game_id: str) -> ChessGame:
+        game = self.get(game_id)
+        if game is None:
+            raise KeyError(game_id)
+        return game
+
+    def __setitem__(self, game_id: str, game: ChessGame) -> None:
+        self.put(game_id, game)
+
+    def __delitem__(self, game_id: str) -> None:
+        self.delete(game_id)
+
+class _Entry:
+    __slots__ = ("game", "nbytes", "touched")
+
+    def __init__(self, game: ChessGame | CompactGame, nbytes: int, touched: float):
+        self.game = game
+        self.nbytes = nbytes
+        self.touched = touched
+
+class MemoryGameStore(GameStore):
+    """In-process game store with LRU, TTL and memory bounds."""
+
+    def __init__(
+        self,
+        max_sessions: int = 10_000,
+        ttl: float | None = 24 * 3600,
+        max_bytes: int | None = None,
+        compact_after: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Parameters
+        ----------
+        max_sessions : int
+            Most games kept at once.
+        ttl : float or None
+            Seconds a game may go untouched before it is evicted (None: no limit).
+        max_bytes : int or None
+            Memory budget for all games, by game_nbytes (None: no limit).
+        compact_after : float or None
+            Seconds a game may go untouched before it is held as a
+            CompactGame (None: games stay live).
+        clock : callable
+            Time source, in seconds.
+        """
+        self.max_sessions = max(1, max_sessions)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.compact_after = compact_after
+        self.clock = clock
+
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()  # least recently used first
+        self._live: OrderedDict[str, None] = OrderedDict()       # ids of live games, same order
+        self._lock = threading.RLock()
+        self.nbytes = 0
+
+        # Counters, see stats()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = {"capacity": 0, "ttl": 0, "memory": 0}
+        self.compactions = 0
+        self.rehydrations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, game_id: str) -> ChessGame | None:
+        with self._lock:
+            now = self.clock()
+            self._expire(now)
+            entry = self._entries.get(game_id)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            entry.touched = now
+            self._entries.move_to_end(game_id)
+            if isinstance(entry.game, CompactGame):
+                self._set(entry, entry.game.to_game())
+                self.rehydrations += 1
+            self._live[game_id] = None
+            self._live.move_to_end(game_id)
+            self._compact(now)
+            return entry.game
+
+    def put(self, game_id: str, game: ChessGame) -> None:
+        with self._lock:
+            now = self.clock()
+            entry = self._entries.get(game_id)
+            if entry is None:
+                entry = self._entries[game_id] = _Entry(game, 0, now)
+            else:
+                entry.touched = now
+                self._entries.move_to_end(game_id)
+            self._set(entry, game)
+            self._live[game_id] = None
+            self._live.move_to_end(game_id)
+
+            self._expire(now)
+            self._compact(now)
+            while len(self._entries) > self.max_sessions:
+                self._evict("capacity")
+            if self.max_bytes is not None:
+                while self.nbytes > self.max_bytes and len(self._entries) > 1:
+                    self._evict("memory")
+
+    def delete(self, game_id: str) -> None:
+        with self._lock:
+            entry = self._entries.pop(game_id, None)
+            if entry is not None:
+                self.nbytes -= entry.nbytes
+                self._live.pop(game_id, None)
+
+    def entry_nbytes(self, game_id: str) -> int | None:
+        """Estimated memory of one stored game, as of its last put."""
+        entry = self._entries.get(game_id)
+        return entry.nbytes if entry else None
+
+    def stats(self) -> dict[str, object]:
+        with self._lock:
+            probes = self.hits + self.misses
+            return {
+                "sessions": len(self._entries),
+                "live": len(self._live),
+                "max_sessions": self.max_sessions,
+                "bytes": self.nbytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / probes if probes else 0.0,
+                "evictions": dict(self.evictions),
+                "compactions": self.compactions,
+                "rehydrations": self.rehydrations,
+            }
+
+    def _set(self, entry: _Entry, game: ChessGame | CompactGame) -> None:
+        """Point 'entry' at 'game' and account for its size (lock held)."""
+        nbytes = game.nbytes if isinstance(game, CompactGame) else game_nbytes(game)
+        self.nbytes += nbytes - entry.nbytes
+        entry.game, entry.nbytes = game, nbytes
+
+    def _evict(self, reason: str) -> None:
+        """Drop the least recently used game (lock held)."""
+        game_id, entry = self._entries.popitem(last=False)
+        self._live.pop(game_id, None)
+        self.nbytes -= entry.nbytes
+        self.evictions[reason] += 1
+
+    def _expire(self, now: float) -> None:
+        """Drop games idle for longer than the TTL (lock held)."""
+        if self.ttl is None:
+            return
+        entries = self._entries
+        while entries:
+            oldest = next(iter(entries.values()))
+            if now - oldest.touched <= self.ttl:
+                break
+            self._evict("ttl")
+
+    def _compact(self, now: float) -> None:
+        """Hold games idle for longer than compact_after compactly (lock held)."""
+        if self.compact_after is None:
+            return
+        live = self._live
+        while live:
+            game_id = next(iter(live))
+            entry = self._entries[game_id]
+            if now - entry.touched <= self.compact_after:
+                break
+            del live[game_id]
+            self._set(entry, CompactGame.from_game(entry.game))
+            self.compactions += 1
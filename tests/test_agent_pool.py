@@ -0,0 +1,107 @@
+import chess
+import pytest
+
+from chess_ai.core.game import ChessGame
+from chess_ai.agents.minimax_agent import MinimaxAgent
+from chess_ai.agents.pool import AgentConfig, AgentPool
+from chess_ai.web import app as web_app
+
+class ClosingAgent:
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+def test_instances_are_reused_per_configuration():
+    pool = AgentPool()
+    shallow = AgentConfig("minimax", {"depth": 1})
+
+    with pool.lease(shallow) as first:
+        pass
+    with pool.lease(AgentConfig("minimax", {"depth": 1})) as again:
+        assert again is first
+    with pool.lease(AgentConfig("minimax", {"depth": 2})) as other:
+        assert other is not first
+
+    assert pool.stats()["created"] == 2 and pool.stats()["reused"] == 1
+
+def test_concurrent_leases_get_their_own_instances():
+    pool = AgentPool()
+    config = AgentConfig("random")
+    with pool.lease(config) as first, pool.lease(config) as second:
+        assert first is not second
+        assert pool.stats()["leased"] == 2
+    assert pool.stats()["idle"] == 2
+
+def test_budget_applies_for_the_lease_only():
+    pool = AgentPool()
+    config = AgentConfig("minimax", {"depth": 3, "workers": 1})
+
+    with pool.lease(config._replace(budget={"depth": 1, "time_limit_ms": 200})) as agent:
+        assert isinstance(agent, MinimaxAgent)
+        assert agent.depth == 1 and agent.time_limit_ms == 200
+        assert agent.search_kwargs["depth"] == 1
+        assert agent.choose_move(ChessGame()) in chess.Board().legal_moves
+
+    with pool.lease(config) as again:
+        assert again is agent
+        assert again.depth == 3 and again.time_limit_ms is None
+        assert again.search_kwargs["depth"] == 3
+
+    # Budgets an agent doesn't have are skipped, unknown ones are errors
+    with pool.lease(AgentConfig("random", budget={"depth": 5})):
+        pass
+    with pytest.raises(KeyError):
+        with pool.lease(AgentConfig("random", budget={"width": 5})):
+            pass
+    assert pool.stats()["leased"] == 0
+
+def test_extra_and_stale_instances_are_closed():
+    made = []
+
+    def factory(name, **kwargs):
+        made.append(ClosingAgent())
+        return made[-1]
+
+    pool = AgentPool(factory, max_idle=1, max_configs=1)
+    with pool.lease(AgentConfig("a")), pool.lease(AgentConfig("a")):
+        pass
+    assert [agent.closed for agent in made] == [True, False]  # one "a" kept idle
+
+    with pool.lease(AgentConfig("b")):
+        pass
+    assert made[1].closed  # config "a" fell out of the idle pool
+    assert pool.stats()["configs"] == 1
+
+    pool.close()
+    assert all(agent.closed for agent in made)
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(web_app, "ACCESS_KEY", None)
+    monkeypatch.setattr(web_app, "SESSION_AGENTS", ["random", "minimax"])
+    monkeypatch.setattr(web_app, "agents", AgentPool())
+    monkeypatch.setattr(web_app.jobs, "agents", web_app.agents)
+    web_app.app.config["TESTING"] = True
+    return web_app.app.test_client()
+
+def test_session_picks_agent_and_budget_without_new_instances(client):
+    resp = client.post("/settings", json={"agent": "minimax", "depth": 1})
+    assert resp.get_json() == {"agent": "minimax", "budget": {"depth": 1}}
+    assert client.post("/settings", json={"agent": "nope"}).status_code == 400
+    assert client.post("/settings", json={"depth": 99}).status_code == 400
+    assert client.get("/settings").get_json()["agent"] == "minimax"
+
+    for uci in ("e2e4", "d2d4"):
+        job = client.post("/move", json={"move": uci}).get_json()
+        assert client.get(f"{job['poll']}?wait=10").get_json()["status"] == "done"
+
+    stats = client.get("/stats").get_json()["agents"]
+    assert stats["created"] == 1 and stats["reused"] == 1
+
+    client.post("/settings", json={"depth": 2})
+    board = chess.Board(client.get(f"{job['poll']}").get_json()["fen"])
+    job = client.post("/move", json={"move": next(iter(board.legal_moves)).uci()}).get_json()
+    client.get(f"{job['poll']}?wait=10")
+    assert client.get("/stats").get_json()["agents"]["created"] == 1
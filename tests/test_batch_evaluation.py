@@ -0,0 +1,59 @@
+import math
+import random
+
+import chess
+
+from chess_ai.agents.minimax_agent import SearchContext, negamax
+from chess_ai.search.evaluation import (
+    IncrementalEvaluator,
+    TaperedEvaluator,
+    child_bitboards,
+    pack_bitboards,
+)
+
+# Castling, en passant and promotions (with and without capture) all available
+SPECIAL_MOVES_FEN = "r3k2r/1P6/8/3pP3/8/8/6p1/R3K2R w KQkq d6 0 1"
+
+def _white_score(evaluator, board):
+    evaluator.reset(board)
+    score = evaluator.evaluate(board)
+    return score if board.turn == chess.WHITE else -score
+
+def test_batch_matches_single_position_scores():
+    rng = random.Random(7)
+    boards = []
+    board = chess.Board()
+    for _ in range(60):
+        board.push(rng.choice(list(board.legal_moves)))
+        boards.append(board.copy())
+
+    packed = pack_bitboards(boards)
+    for evaluator in (IncrementalEvaluator(), TaperedEvaluator()):
+        expected = [_white_score(evaluator, b) for b in boards]
+        assert evaluator.evaluate_batch(packed).tolist() == expected
+
+def test_child_bitboards_match_pushed_children():
+    board = chess.Board(SPECIAL_MOVES_FEN)
+    moves = list(board.legal_moves)
+    evaluator = TaperedEvaluator()
+
+    children = []
+    for move in moves:
+        board.push(move)
+        children.append(board.copy())
+        board.pop()
+
+    assert (child_bitboards(board, moves) == pack_bitboards(children)).all()
+    assert evaluator.evaluate_batch(child_bitboards(board, moves)).tolist() == [
+        _white_score(evaluator, child) for child in children
+    ]
+
+def test_batched_frontier_gives_same_root_value():
+    board = chess.Board("r1bq1rk1/pp2bppp/2n1pn2/3p4/2PP4/2N1PN2/PP2BPPP/R2QKB1R w KQ - 0 8")
+    values = []
+    for batch in (False, True):
+        ctx = SearchContext(evaluator=TaperedEvaluator(), batch_leaves=batch)
+        ctx.evaluator.reset(board)
+        values.append(negamax(board, 3, -math.inf, math.inf, True, False, ctx))
+
+    assert values[0] == values[1]
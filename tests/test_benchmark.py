@@ -0,0 +1,52 @@
+import json
+
+import chess
+
+from chess_ai.search import benchmark
+from chess_ai.search.benchmark import BENCH_FENS, compare, run_benchmark
+
+def test_benchmark_fens_are_valid():
+    assert len(BENCH_FENS) >= 50
+    for fen in BENCH_FENS:
+        board = chess.Board(fen)
+        assert board.is_valid(), fen
+        assert not board.is_game_over(), fen
+
+def test_run_benchmark_reports_metrics_and_round_trips_json(tmp_path):
+    results = run_benchmark(configs=["default"], depth=2, perft_depth=2, fens=BENCH_FENS[:3])
+
+    assert all(row["ok"] for row in results["perft"])
+    summary = results["search"]["default"]
+    assert summary["positions"] == 3
+    assert summary["nodes"] > 0 and summary["nps"] > 0
+    assert set(summary["time_to_depth_ms"]) == {"1", "2"}
+
+    path = tmp_path / "bench.json"
+    path.write_text(json.dumps(results))
+    assert compare(json.loads(path.read_text()), results) == []
+
+def test_compare_flags_slower_and_larger_searches():
+    baseline = run_benchmark(configs=["default"], depth=1, perft_depth=1, fens=BENCH_FENS[:1])
+    current = json.loads(json.dumps(baseline))
+    search = current["search"]["default"]
+    search["nps"] = baseline["search"]["default"]["nps"] * 0.5
+    search["nodes"] = baseline["search"]["default"]["nodes"] * 2
+    current["perft"][0]["ok"] = False
+
+    metrics = {r.metric for r in compare(current, baseline, threshold=0.10)}
+
+    assert "search.default.nps" in metrics
+    assert "search.default.nodes" in metrics
+    assert f"perft.{current['perft'][0]['name']}.board.nodes" in metrics
+
+def test_main_exits_nonzero_on_regression(tmp_path, monkeypatch):
+    baseline = run_benchmark(configs=["default"], depth=1, perft_depth=0, fens=BENCH_FENS[:1])
+    baseline["search"]["default"]["nodes"] = 1
+    path = tmp_path / "baseline.json"
+    path.write_text(json.dumps(baseline))
+
+    status = benchmark.main([
+        "--config", "default", "--depth", "1", "--perft-depth", "0",
+        "--positions", "1", "--baseline", str(path),
+    ])
+    assert status == 1
@@ -0,0 +1,100 @@
+import random
+
+import chess
+import pytest
+
+from chess_ai.core.game import ChessGame
+from chess_ai.agents.minimax_agent import MinimaxAgent
+from chess_ai.search.evaluation import (
+    IncrementalEvaluator,
+    TaperedEvaluator,
+    evaluate_board,
+    make_evaluator,
+)
+from chess_ai.search.pst import TOTAL_PHASE
+
+def test_incremental_score_matches_full_rescan_through_random_games():
+    rng = random.Random(1234)
+    for _ in range(20):
+        board = chess.Board()
+        evaluator = IncrementalEvaluator()
+        evaluator.reset(board)
+
+        for _ in range(120):
+            moves = list(board.legal_moves)
+            if not moves:
+                break
+            evaluator.push(board, rng.choice(moves))
+            if not board.is_checkmate():
+                assert evaluator.evaluate(board) == evaluate_board(board)
+
+        # Unwinding restores every intermediate score
+        while board.move_stack:
+            evaluator.pop(board)
+        assert evaluator.score == 0
+
+def test_special_moves_update_score():
+    evaluator = IncrementalEvaluator()
+
+    # En passant: White wins a pawn
+    board = chess.Board("4k3/8/8/3pP3/8/8/8/4K3 w - d6 0 1")
+    evaluator.reset(board)
+    evaluator.push(board, chess.Move.from_uci("e5d6"))
+    assert evaluator.score == 100
+
+    # Promotion with capture
+    board = chess.Board("3rk3/4P3/8/8/8/8/8/4K3 w - - 0 1")
+    evaluator.reset(board)
+    evaluator.push(board, chess.Move.from_uci("e7d8q"))
+    assert evaluator.score == 900
+
+def test_search_detects_mate_without_static_mate_check():
+    # Back-rank mate in one: Ra8#
+    board = chess.Board("6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1")
+    agent = MinimaxAgent(depth=2)
+
+    assert agent.choose_move(ChessGame(board=board)) == chess.Move.from_uci("a1a8")
+
+def test_tapered_incremental_matches_reset_through_random_games():
+    rng = random.Random(99)
+    for _ in range(10):
+        board = chess.Board()
+        evaluator = TaperedEvaluator()
+        evaluator.reset(board)
+        fresh = TaperedEvaluator()
+
+        for _ in range(150):
+            moves = list(board.legal_moves)
+            if not moves:
+                break
+            evaluator.push(board, rng.choice(moves))
+            fresh.reset(board)
+            assert (evaluator.score, evaluator.eg_score, evaluator.phase) == (
+                fresh.score, fresh.eg_score, fresh.phase
+            )
+
+def test_tapered_tables_are_mirrored_for_black():
+    board = chess.Board("r1bqkb1r/pppp1ppp/2n2n2/4p3/2B1P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 4 4")
+    evaluator = TaperedEvaluator()
+
+    evaluator.reset(board)
+    white_view = evaluator.evaluate(board)
+    evaluator.reset(board.mirror())
+
+    assert evaluator.evaluate(board.mirror()) == white_view
+    assert evaluator.phase == TOTAL_PHASE
+
+def test_tapered_endgame_prefers_central_king():
+    evaluator = TaperedEvaluator()
+    central = chess.Board("8/8/8/4k3/8/8/8/K7 w - - 0 1")
+    evaluator.reset(central)
+
+    assert evaluator.phase == 0
+    assert evaluator.evaluate(central) < 0  # Black's king is better placed
+
+def test_minimax_accepts_tapered_evaluator_and_rejects_unknown():
+    agent = MinimaxAgent(depth=2, evaluator="tapered")
+    assert agent.choose_move(ChessGame()) in ChessGame().legal_moves()
+
+    with pytest.raises(KeyError):
+        make_evaluator("nonsense")
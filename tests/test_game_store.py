@@ -0,0 +1,118 @@
+import chess
+
+from chess_ai.core.game import ChessGame
+from chess_ai.web import app as web_app
+from chess_ai.web.store import GAME_BYTES, MOVE_BYTES, CompactGame, MemoryGameStore, game_nbytes
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def test_least_recently_used_game_is_evicted_past_the_cap():
+    store = MemoryGameStore(max_sessions=2, ttl=None)
+    store.put("a", ChessGame())
+    store.put("b", ChessGame())
+    store.get("a")
+    store.put("c", ChessGame())
+
+    assert store.get("b") is None
+    assert store.get("a") is not None and store.get("c") is not None
+    assert store.stats()["evictions"]["capacity"] == 1
+
+def test_idle_games_expire_after_the_ttl():
+    clock = FakeClock()
+    store = MemoryGameStore(ttl=60, clock=clock)
+    store.put("old", ChessGame())
+    clock.now = 30
+    store.put("new", ChessGame())
+    clock.now = 61
+
+    assert store.get("old") is None
+    assert store.get("new") is not None
+    assert store.stats()["evictions"]["ttl"] == 1
+    assert len(store) == 1
+
+def test_memory_is_accounted_per_entry_and_bounded():
+    game = ChessGame()
+    for uci in ("e2e4", "e7e5", "g1f3"):
+        game.apply_move(chess.Move.from_uci(uci))
+    assert game_nbytes(game) == GAME_BYTES + 3 * MOVE_BYTES
+
+    store = MemoryGameStore(max_bytes=2 * GAME_BYTES + 3 * MOVE_BYTES, ttl=None)
+    store.put("a", ChessGame())
+    store.put("b", game)
+    assert store.entry_nbytes("b") == game_nbytes(game)
+    assert store.nbytes == GAME_BYTES + game_nbytes(game)
+
+    game.apply_move(chess.Move.from_uci("b8c6"))
+    store.put("b", game)  # grew past the budget: "a" goes
+
+    assert store.get("a") is None
+    assert store.nbytes == game_nbytes(game)
+    assert store.stats()["evictions"]["memory"] == 1
+
+    store.delete("b")
+    assert store.nbytes == 0 and len(store) == 0
+
+def test_web_app_starts_a_new_game_for_an_evicted_session(monkeypatch):
+    monkeypatch.setattr(web_app, "ACCESS_KEY", None)
+    monkeypatch.setattr(web_app, "games", MemoryGameStore(max_sessions=1, ttl=None))
+    web_app.app.config["TESTING"] = True
+    first, second = web_app.app.test_client(), web_app.app.test_client()
+
+    first.get("/")
+    second.get("/")  # evicts the first session's game
+    first.get("/")
+
+    stats = first.get("/stats").get_json()
+    assert stats["games"]["sessions"] == 1
+    assert stats["games"]["evictions"]["capacity"] == 2
+    assert "depth" in stats["jobs"]
+
+def test_compact_game_round_trips_with_its_history():
+    board = chess.Board("r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1")
+    for uci in ("e1g1", "e8c8", "f1f2", "d8d7", "f2f1", "d7d8", "f1f2", "d8d7", "f2f1", "d7d8"):
+        board.push_uci(uci)
+    board_with_promotion = chess.Board("8/4P1k1/8/8/8/8/8/4K3 w - - 0 1")
+    board_with_promotion.push_uci("e7e8n")
+
+    for original in (board, board_with_promotion):
+        compact = CompactGame.from_game(ChessGame(board=original))
+        restored = compact.to_game().board
+        assert restored.move_stack == original.move_stack
+        assert restored.fen() == original.fen()
+        assert restored.is_repetition(3) == original.is_repetition(3)
+
+    assert CompactGame.from_game(ChessGame(board=board)).nbytes < game_nbytes(ChessGame(board=board)) / 20
+
+def test_idle_games_are_compacted_and_rehydrated_on_access():
+    clock = FakeClock()
+    store = MemoryGameStore(ttl=None, compact_after=10, clock=clock)
+    game = ChessGame()
+    for uci in ("e2e4", "e7e5", "g1f3", "b8c6"):
+        game.apply_move(chess.Move.from_uci(uci))
+    store.put("idle", game)
+    live_bytes = store.nbytes
+
+    clock.now = 11
+    store.put("busy", ChessGame())  # sweeps "idle" into compact form
+
+    stats = store.stats()
+    assert stats["live"] == 1 and stats["compactions"] == 1
+    assert store.nbytes - store.entry_nbytes("busy") < live_bytes / 10
+
+    restored = store.get("idle")
+    assert restored.board.move_stack == game.board.move_stack
+    assert store.stats()["rehydrations"] == 1 and store.stats()["live"] == 2
+    assert store.entry_nbytes("idle") == live_bytes
+
+def test_compact_game_bytes_round_trip():
+    game = ChessGame(board=chess.Board("8/4P1k1/8/8/8/8/8/4K3 w - - 0 1"))
+    game.apply_move(chess.Move.from_uci("e7e8q"))
+    compact = CompactGame.from_game(game)
+
+    assert CompactGame.from_bytes(compact.to_bytes()) == compact
+    assert CompactGame.from_bytes(CompactGame.from_game(ChessGame()).to_bytes()).fen is chess.STARTING_FEN
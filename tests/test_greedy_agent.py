@@ -0,0 +1,70 @@
+import chess
+
+from chess_ai.core.game import ChessGame
+from chess_ai.agents.greedy_agent import GreedyAgent
+from chess_ai.agents.registry import get_agent
+
+MATE_IN_ONE_FEN = "6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1"
+
+def test_registry_builds_greedy_agent_that_returns_legal_move():
+    agent = get_agent("greedy")
+    game = ChessGame()
+    move = agent.choose_move(game)
+    assert isinstance(agent, GreedyAgent)
+    assert move in game.legal_moves()
+
+def test_takes_an_undefended_piece():
+    board = chess.Board("4k3/8/8/3q4/8/8/3R4/4K3 w - - 0 1")
+    move = GreedyAgent().choose_move(ChessGame(board=board))
+    assert move == chess.Move.from_uci("d2d5")
+
+def test_see_keeps_it_from_grabbing_a_defended_pawn_with_the_queen():
+    # Qxd5 wins a pawn by material but the pawn is defended by the e6 pawn
+    board = chess.Board("4k3/8/4p3/3p4/8/8/8/3QK3 w - - 0 1")
+    assert GreedyAgent().choose_move(ChessGame(board=board)) != chess.Move.from_uci("d1d5")
+    assert GreedyAgent(use_see=False).choose_move(ChessGame(board=board)) == chess.Move.from_uci("d1d5")
+
+def test_plays_mate_in_one():
+    move = GreedyAgent().choose_move(ChessGame(board=chess.Board(MATE_IN_ONE_FEN)))
+    assert move == chess.Move.from_uci("a1a8")
+
+def test_does_not_take_a_piece_into_stalemate():
+    # Qxb6 wins the knight but leaves the lone black king without a move
+    board = chess.Board("k7/8/1n6/4K3/8/8/8/6Q1 w - - 0 1")
+    move = GreedyAgent().choose_move(ChessGame(board=board))
+    board.push(move)
+    assert not board.is_stalemate()
+
+def test_repeated_position_is_answered_from_the_cache():
+    agent = GreedyAgent()
+    first = agent.choose_move(ChessGame())
+    second = agent.choose_move(ChessGame())
+    assert first == second
+    assert agent.cache_stats()["hits"] == 1
+    assert agent.cache_stats()["misses"] == 1
+
+def test_cache_is_bounded():
+    agent = GreedyAgent(cache_size=2)
+    board = chess.Board()
+    for _ in range(4):
+        agent.choose_move(ChessGame(board=board))
+        board.push(next(iter(board.legal_moves)))
+    assert len(agent.cache) == 2
+
+def test_reply_costs_one_incremental_evaluation_per_move(monkeypatch):
+    agent = GreedyAgent(cache_size=0)
+    board = chess.Board("r1bqkb1r/pppp1ppp/2n2n2/4p3/2B1P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 4 4")
+    calls = {"reset": 0, "evaluate": 0}
+    for name in calls:
+        method = getattr(agent.evaluator, name)
+
+        def counted(*args, _name=name, _method=method):
+            calls[_name] += 1
+            return _method(*args)
+
+        monkeypatch.setattr(agent.evaluator, name, counted)
+
+    move = agent.choose_move(ChessGame(board=board))
+
+    assert move in board.legal_moves
+    assert calls == {"reset": 1, "evaluate": board.legal_moves.count()}
@@ -0,0 +1,44 @@
+import time
+
+import chess
+
+from chess_ai.core.game import ChessGame
+from chess_ai.agents.minimax_agent import MinimaxAgent
+
+MIDDLEGAME_FEN = "r1bq1rk1/pp2bppp/2n1pn2/3p4/2PP4/2N1PN2/PP2BPPP/R2QKB1R w KQ - 0 8"
+
+def test_time_limit_returns_legal_move_within_budget():
+    board = chess.Board(MIDDLEGAME_FEN)
+    game = ChessGame(board=board)
+    agent = MinimaxAgent(time_limit_ms=300)
+
+    start = time.perf_counter()
+    move = agent.choose_move(game)
+    elapsed = time.perf_counter() - start
+
+    assert move in game.legal_moves()
+    assert agent.completed_depth >= 1
+    # Generous bound: the budget plus time to unwind the aborted iteration
+    assert elapsed < 1.5
+
+def test_node_limit_aborts_and_leaves_board_untouched():
+    board = chess.Board(MIDDLEGAME_FEN)
+    fen_before = board.fen()
+    game = ChessGame(board=board)
+    agent = MinimaxAgent(node_limit=2_000)
+
+    move = agent.choose_move(game)
+
+    assert move in game.legal_moves()
+    assert board.fen() == fen_before
+    assert len(board.move_stack) == 0
+    assert agent.completed_depth < agent.max_depth
+
+def test_fixed_depth_completes_every_iteration():
+    agent = MinimaxAgent(depth=3)
+
+    move = agent.choose_move(ChessGame())
+
+    assert move in ChessGame().legal_moves()
+    assert agent.completed_depth == 3
+    assert agent.nodes > 0
@@ -0,0 +1,97 @@
+import chess
+import pytest
+
+from chess_ai.core.game import ChessGame
+from chess_ai.agents.mcts_agent import MonteCarloTreeSearchAgent, NodePool, decode_move
+from chess_ai.agents.registry import get_agent
+
+MATE_IN_ONE_FEN = "6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1"
+
+def test_registry_builds_mcts_agent_that_returns_legal_move():
+    agent = get_agent("mcts", playouts=200, seed=0)
+    game = ChessGame()
+
+    move = agent.choose_move(game)
+
+    assert isinstance(agent, MonteCarloTreeSearchAgent)
+    assert move in game.legal_moves()
+    assert agent.last_playouts == 200
+    assert agent.pool.visits[0] == 200
+
+@pytest.mark.parametrize("rollout", ["random", "captures", "eval"])
+def test_each_rollout_policy_finds_mate_in_one(rollout):
+    agent = MonteCarloTreeSearchAgent(playouts=400, rollout=rollout, seed=1)
+    move = agent.choose_move(ChessGame(board=chess.Board(MATE_IN_ONE_FEN)))
+    assert move == chess.Move.from_uci("a1a8")
+
+def test_time_budget_without_playout_limit():
+    agent = MonteCarloTreeSearchAgent(playouts=None, time_limit_ms=100, rollout="eval")
+    agent.choose_move(ChessGame())
+    assert agent.last_playouts > 0
+    assert agent.elapsed_ms < 1000
+
+def test_zero_time_limit_still_runs_one_playout():
+    agent = MonteCarloTreeSearchAgent(playouts=None, time_limit_ms=0, seed=0)
+    game = ChessGame()
+
+    assert agent.choose_move(game) in game.legal_moves()
+    assert agent.last_playouts == 1
+
+def test_zero_playouts_are_rejected():
+    with pytest.raises(ValueError):
+        MonteCarloTreeSearchAgent(playouts=0)
+
+def test_tree_is_reused_after_our_move_and_the_reply():
+    agent = MonteCarloTreeSearchAgent(playouts=600, rollout="eval", seed=2)
+    game = ChessGame()
+    ours = agent.choose_move(game)
+
+    pool = agent.pool
+    node = pool.child_for(0, ours)
+    reply_node = max(pool.children(node), key=lambda c: pool.visits[c])
+    reply = decode_move(int(pool.move[reply_node]))
+    carried = int(pool.visits[reply_node])
+
+    game.apply_move(ours)
+    game.apply_move(reply)
+    agent.choose_move(game)
+
+    assert agent.reused_visits == carried > 0
+    assert agent.pool.visits[0] == carried + 600
+
+def test_unrelated_position_starts_a_fresh_tree():
+    agent = MonteCarloTreeSearchAgent(playouts=100, rollout="eval", seed=3)
+    agent.choose_move(ChessGame())
+    agent.choose_move(ChessGame(board=chess.Board(MATE_IN_ONE_FEN)))
+    assert agent.reused_visits == 0
+
+def test_subtree_copy_keeps_statistics_and_shape():
+    agent = MonteCarloTreeSearchAgent(playouts=300, rollout="eval", seed=4)
+    agent.choose_move(ChessGame())
+    pool = agent.pool
+    node = max(pool.children(0), key=lambda c: pool.visits[c])
+
+    copy = pool.subtree(node)
+
+    assert copy.visits[0] == pool.visits[node]
+    assert copy.child_count[0] == pool.child_count[node]
+    old = sorted((int(pool.move[c]), pool.visits[c]) for c in pool.children(node))
+    new = sorted((int(copy.move[c]), copy.visits[c]) for c in copy.children(0))
+    assert old == new
+
+def test_full_pool_stops_expanding_but_keeps_playing():
+    agent = MonteCarloTreeSearchAgent(playouts=300, rollout="eval", max_nodes=64, seed=5)
+    move = agent.choose_move(ChessGame())
+    assert move in chess.Board().legal_moves
+    assert agent.pool.size <= 64
+
+def test_node_pool_reports_memory():
+    pool = NodePool(capacity=1024)
+    assert pool.nbytes == 1024 * (8 + 8 + 4 + 4 + 2)
+
+@pytest.mark.parametrize("budget", [{"playouts": 50}, {"playouts": None, "time_limit_ms": 50}])
+def test_claimable_fifty_move_draw_still_gets_a_move(budget):
+    # The game isn't over until the draw is claimed, so the root is searched
+    board = chess.Board("4k3/8/8/8/8/8/4R3/4K3 w - - 100 80")
+    agent = MonteCarloTreeSearchAgent(seed=0, **budget)
+    assert agent.choose_move(ChessGame(board=board)) in board.legal_moves
@@ -35,4 +35,21 @@ def test_minimax_prefers_simple_capture():
     assert move is not None
     # Still use the original board for is_capture (Minimax should not modify it)
     assert board.is_capture(move), f"Expected a capture move, got {move.uci()}"
-    assert move in game.legal_moves()
\ No newline at end of file
+    assert move in game.legal_moves()
+
+def test_minimax_does_not_allow_mate_in_one_at_depth_two():
+    """
+    With Black to move, Ne4xd2 wins a bishop but allows Qf7-e7 mate; the
+    mate sits at the depth-2 horizon, so it must be seen there.
+    """
+    fen = "2rr4/3knQ2/p1pppPp1/P7/1Pb1n3/3PPP1P/3B4/1R2K1NR b K - 2 29"
+    board = chess.Board(fen)
+    agent = MinimaxAgent(depth=2, use_alpha_beta=True, use_quiescence=False)
+
+    move = agent.choose_move(ChessGame(board=board))
+
+    board.push(move)
+    for reply in board.legal_moves:
+        board.push(reply)
+        assert not board.is_checkmate(), f"{move.uci()} allows {reply.uci()} mate"
+        board.pop()
@@ -0,0 +1,18 @@
+import chess
+
+from chess_ai.core.moves import decode_move, encode_move
+
+def test_every_move_round_trips_through_16_bits():
+    board = chess.Board("r3k2r/1P6/8/3pP3/8/8/6p1/R3K2R w KQkq d6 0 1")
+    moves = list(board.legal_moves) + list(board.mirror().legal_moves)
+    assert any(move.promotion for move in moves)
+
+    for move in moves:
+        code = encode_move(move)
+        assert 0 < code < 2**16
+        assert decode_move(code) == move
+
+def test_none_encodes_as_the_null_move():
+    assert encode_move(None) == 0
+    assert decode_move(0) == chess.Move.null()
+    assert not decode_move(0)
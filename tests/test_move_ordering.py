@@ -0,0 +1,40 @@
+import chess
+
+from chess_ai.core.game import ChessGame
+from chess_ai.agents.minimax_agent import MinimaxAgent
+from chess_ai.search.ordering import MoveOrderer
+
+MIDDLEGAME_FEN = "r1bq1rk1/pp2bppp/2n1pn2/3p4/2PP4/2N1PN2/PP2BPPP/R2QKB1R w KQ - 0 8"
+
+def test_hash_move_then_mvv_lva_captures():
+    # White can take the queen on d5 with the pawn or the queen, or take a pawn
+    board = chess.Board("4k3/8/8/3q4/4P3/8/6p1/3QK3 w - - 0 1")
+    orderer = MoveOrderer()
+    hash_move = chess.Move.from_uci("e1f2")
+
+    ordered = orderer.order(board, list(board.legal_moves), 0, hash_move)
+
+    assert ordered[0] == hash_move
+    assert ordered[1] == chess.Move.from_uci("e4d5")  # PxQ
+    assert ordered[2] == chess.Move.from_uci("d1d5")  # QxQ
+
+def test_killer_and_history_promote_quiet_moves():
+    board = chess.Board()
+    orderer = MoveOrderer()
+    killer = chess.Move.from_uci("b1c3")
+
+    orderer.record_cutoff(board, killer, depth=3, ply=2)
+
+    assert orderer.order(board, list(board.legal_moves), 2)[0] == killer
+    # At another ply it is not a killer, but the history table still ranks it first
+    assert orderer.order(board, list(board.legal_moves), 5)[0] == killer
+
+def test_move_ordering_reduces_nodes_at_fixed_depth():
+    ordered = MinimaxAgent(depth=3)
+    unordered = MinimaxAgent(depth=3, use_move_ordering=False)
+
+    for agent in (ordered, unordered):
+        agent.choose_move(ChessGame(board=chess.Board(MIDDLEGAME_FEN)))
+        assert agent.completed_depth == 3
+
+    assert ordered.nodes < unordered.nodes
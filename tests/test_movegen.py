@@ -0,0 +1,70 @@
+import random
+
+import chess
+
+from chess_ai.search import attacks, movegen
+from chess_ai.search.movegen import staged_moves
+from chess_ai.search.ordering import MoveOrderer
+from chess_ai.search.position import Position
+
+def test_attack_tables_match_python_chess():
+    rng = random.Random(7)
+    board = chess.Board(None)
+    for _ in range(200):
+        occupied = rng.getrandbits(64) & rng.getrandbits(64)
+        for square in chess.SQUARES:
+            assert attacks.rook_attacks(square, occupied) == (
+                chess.BB_RANK_ATTACKS[square][chess.BB_RANK_MASKS[square] & occupied]
+                | chess.BB_FILE_ATTACKS[square][chess.BB_FILE_MASKS[square] & occupied]
+            )
+            assert attacks.bishop_attacks(square, occupied) == (
+                chess.BB_DIAG_ATTACKS[square][chess.BB_DIAG_MASKS[square] & occupied]
+            )
+
+    for a in chess.SQUARES:
+        assert attacks.KNIGHT_ATTACKS[a] == chess.BB_KNIGHT_ATTACKS[a]
+        assert attacks.KING_ATTACKS[a] == chess.BB_KING_ATTACKS[a]
+        for color in chess.COLORS:
+            assert attacks.PAWN_ATTACKS[color][a] == chess.BB_PAWN_ATTACKS[color][a]
+        for b in chess.SQUARES:
+            assert attacks.BETWEEN[a][b] == chess.between(a, b)
+            assert attacks.LINE[a][b] == chess.ray(a, b)
+
+def test_staged_order_matches_full_sort_on_both_boards():
+    rng = random.Random(11)
+    orderer = MoveOrderer()
+    for _ in range(40):
+        board = chess.Board()
+        for _ in range(rng.randrange(4, 60)):
+            moves = list(board.legal_moves)
+            if not moves:
+                break
+            board.push(rng.choice(moves))
+        moves = list(board.legal_moves)
+        if not moves:
+            continue
+
+        quiet = [m for m in moves if not board.is_capture(m) and not m.promotion]
+        if quiet:
+            orderer.record_cutoff(board, rng.choice(quiet), 3, 1)
+        hash_move = rng.choice(moves)
+        expected = orderer.order(board, moves, 1, hash_move)
+
+        assert list(staged_moves(board, orderer, 1, hash_move)) == expected
+        assert list(staged_moves(Position.from_board(board), orderer, 1, hash_move)) == expected
+
+def test_cutoff_on_hash_move_skips_move_generation(monkeypatch):
+    calls = []
+    monkeypatch.setattr(movegen, "noisy_moves", lambda board: calls.append("noisy") or [])
+    monkeypatch.setattr(movegen, "quiet_moves", lambda board: calls.append("quiet") or [])
+    position = Position.from_board(chess.Board())
+
+    moves = staged_moves(position, MoveOrderer(), 0, chess.Move.from_uci("e2e4"))
+
+    assert next(moves) == chess.Move.from_uci("e2e4")
+    assert calls == []
+
+    # An illegal hash move (e.g. from a hash collision) is skipped
+    moves = staged_moves(position, MoveOrderer(), 0, chess.Move.from_uci("e2e5"))
+    assert list(moves) == []
+    assert calls == ["noisy", "quiet"]
@@ -0,0 +1,82 @@
+import io
+
+import chess
+import chess.pgn
+import chess.polyglot
+
+from chess_ai.core.game import ChessGame
+from chess_ai.agents.registry import get_agent
+from chess_ai.search.book import OpeningBook, build_book, decode_move, encode_move
+
+PGN = """
+[Event "a"]
+[Result "1-0"]
+
+1. e4 e5 2. Nf3 Nc6 3. Bb5 a6 4. O-O Nf6 1-0
+
+[Event "b"]
+[Result "1/2-1/2"]
+
+1. e4 c5 2. Nf3 d6 1/2-1/2
+
+[Event "c"]
+[Result "0-1"]
+
+1. d4 d5 2. c4 e6 0-1
+"""
+
+def _book(tmp_path, **kwargs):
+    pgn = tmp_path / "games.pgn"
+    pgn.write_text(PGN)
+    path = tmp_path / "book.bin"
+    build_book([pgn], path, **kwargs)
+    return path
+
+def test_book_is_readable_by_python_chess_polyglot(tmp_path):
+    path = _book(tmp_path)
+
+    with chess.polyglot.open_reader(path) as reader:
+        start = {entry.move: entry.weight for entry in reader.find_all(chess.Board())}
+    assert start == {chess.Move.from_uci("e2e4"): 2, chess.Move.from_uci("d2d4"): 1}
+
+    with OpeningBook(path) as book:
+        assert {(e.move, e.weight) for e in book.entries(chess.Board())} == set(start.items())
+
+def test_castling_round_trips_through_move_codes():
+    board = chess.Board("r1bqkb1r/1ppp1ppp/p1n2n2/4p3/B3P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 2 5")
+    castle = chess.Move.from_uci("e1g1")
+    code = encode_move(board, castle)
+    assert code & 0x3F == chess.H1
+    assert decode_move(board, code) == castle
+
+    with io.StringIO(PGN) as pgn:
+        game = chess.pgn.read_game(pgn)
+    assert castle in game.mainline_moves()
+
+def test_book_lookup_and_max_ply(tmp_path):
+    path = _book(tmp_path, max_ply=2)
+    with OpeningBook(path) as book:
+        assert len(book) == 5  # e4, d4 / e5, c5 / d5
+        assert book.choose(chess.Board(), weighted=False) == chess.Move.from_uci("e2e4")
+
+        after_e4_e5 = chess.Board()
+        for uci in ("e2e4", "e7e5"):
+            after_e4_e5.push_uci(uci)
+        assert book.entries(after_e4_e5) == []
+        assert book.choose(after_e4_e5) is None
+
+def test_agent_plays_from_book_then_searches(tmp_path):
+    agent = get_agent("minimax", depth=2, book=str(_book(tmp_path)), book_weighted=False)
+    try:
+        game = ChessGame()
+        move, stats = agent.search(game)
+        assert move == chess.Move.from_uci("e2e4")
+        assert stats.book and stats.nodes == 0
+
+        # Out of book
+        game = ChessGame(board=chess.Board("rnbqkbnr/pppppppp/8/8/8/7P/PPPPPPP1/RNBQKBNR b KQkq - 0 1"))
+        move, stats = agent.search(game)
+        assert move in game.legal_moves()
+        assert not stats.book and stats.nodes > 0
+    finally:
+        agent.close()
@@ -0,0 +1,72 @@
+import random
+
+import chess
+
+from chess_ai.core.game import ChessGame
+from chess_ai.agents.mcts_agent import MonteCarloTreeSearchAgent
+from chess_ai.search.evaluation import make_evaluator
+from chess_ai.search.mcts import ROLLOUT_POLICIES, NodePool, SharedNodePool, playout
+from chess_ai.search.position import Position
+
+MATE_IN_ONE_FEN = "6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1"
+
+def test_virtual_loss_is_fully_taken_back():
+    pool = NodePool()
+    board = Position.from_board(chess.Board())
+    evaluator = make_evaluator("material")
+    evaluator.reset(board)
+    rng = random.Random(0)
+    for _ in range(50):
+        playout(pool, board, evaluator, rng, 1.4, ROLLOUT_POLICIES["eval"], 0, virtual_loss=3.0)
+
+    assert pool.visits[0] == 50
+    assert sum(pool.visits[c] for c in pool.children(0)) == 50
+    assert board.fen() == chess.Board().fen()
+
+def test_shared_pool_loads_and_is_visible_through_attach():
+    agent = MonteCarloTreeSearchAgent(playouts=200, rollout="eval", seed=0)
+    agent.choose_move(ChessGame())
+
+    shared = SharedNodePool(max_nodes=4096)
+    try:
+        shared.load(agent.pool)
+        other = SharedNodePool.attach(shared.name, 4096)
+        assert other.size == agent.pool.size
+        assert list(other.visits[:other.size]) == list(agent.pool.visits[:agent.pool.size])
+
+        shared.load(NodePool())
+        assert other.size == 1 and other.first_child[0] == -1 and other.visits[:200].sum() == 0
+        other.close()
+    finally:
+        shared.unlink()
+
+def test_tree_parallel_agent_finds_mate_and_reuses_shared_tree():
+    agent = MonteCarloTreeSearchAgent(playouts=400, rollout="eval", workers=2, parallel="tree", seed=1)
+    try:
+        game = ChessGame(board=chess.Board(MATE_IN_ONE_FEN))
+        move = agent.choose_move(game)
+        assert move == chess.Move.from_uci("a1a8")
+        assert agent.last_playouts == 400
+        assert sum(agent.pool.visits[c] for c in agent.pool.children(0)) > 300
+
+        game = ChessGame()
+        first = agent.choose_move(game)
+        pool = agent._pool
+        game.apply_move(first)
+        game.apply_move(next(iter(game.board.legal_moves)))
+        agent.choose_move(game)
+        assert agent._pool is pool
+    finally:
+        agent.close()
+
+def test_root_parallel_agent_merges_root_statistics():
+    agent = MonteCarloTreeSearchAgent(playouts=300, rollout="eval", workers=2, parallel="root", seed=2)
+    try:
+        move = agent.choose_move(ChessGame(board=chess.Board(MATE_IN_ONE_FEN)))
+
+        assert move == chess.Move.from_uci("a1a8")
+        pool = agent.pool
+        assert sum(pool.visits[c] for c in pool.children(0)) == 300
+        assert {m for m, _, _ in agent.root_stats()} == set(chess.Board(MATE_IN_ONE_FEN).legal_moves)
+    finally:
+        agent.close()
@@ -0,0 +1,82 @@
+import multiprocessing
+
+import chess
+
+from chess_ai.core.game import ChessGame
+from chess_ai.agents.minimax_agent import MinimaxAgent
+from chess_ai.search import parallel
+from chess_ai.search.shared_tt import SharedTranspositionTable
+from chess_ai.search.transposition import LOWER, position_key
+
+def _store_in_child(name, size, key):
+    tt = SharedTranspositionTable.attach(name, size)
+    tt.store(key, 4, LOWER, -250, chess.Move.from_uci("e7e8q"))
+    tt.close()
+
+def test_shared_table_entries_are_visible_across_processes():
+    tt = SharedTranspositionTable(size=1024)
+    key = position_key(chess.Board())
+    try:
+        child = multiprocessing.Process(target=_store_in_child, args=(tt.name, 1024, key))
+        child.start()
+        child.join()
+
+        entry = tt.probe(key)
+        assert entry is not None
+        assert (entry.depth, entry.flag, entry.value) == (4, LOWER, -250)
+        assert entry.move == chess.Move.from_uci("e7e8q")
+        assert tt.probe(key ^ 1) is None
+    finally:
+        tt.unlink()
+
+def test_lazy_smp_agent_returns_legal_move_and_reuses_pool():
+    agent = MinimaxAgent(depth=2, workers=2)
+    try:
+        game = ChessGame()
+        first = agent.choose_move(game)
+        pool = agent._pool
+
+        game.apply_move(first)
+        second = agent.choose_move(game)
+
+        assert first in chess.Board().legal_moves
+        assert second in game.legal_moves()
+        assert agent._pool is pool
+        assert agent.completed_depth >= 2
+        assert agent.nodes > 0
+        assert agent.tt_stats()["stores"] > 0
+        assert agent.last_stats.pv[0] == second
+        assert agent.last_stats.first_move_cutoff_rate > 0
+    finally:
+        agent.close()
+
+def test_root_split_agent_matches_serial_score_and_reuses_pool():
+    # Several moves tie on the best score here
+    board = chess.Board("r1bqkb1r/pppp1ppp/2n2n2/4p3/2B1P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 4 4")
+    serial = MinimaxAgent(depth=3)
+    serial.choose_move(ChessGame(board=board.copy()))
+
+    agent = MinimaxAgent(depth=3, workers=2, parallel="root_split")
+    try:
+        first = agent.choose_move(ChessGame(board=board.copy()))
+        pool = agent._pool
+        repeats = {agent.choose_move(ChessGame(board=board.copy())) for _ in range(3)}
+
+        assert agent.last_stats.value == serial.last_stats.value
+        assert repeats == {first}
+        assert agent._pool is pool
+        assert agent.completed_depth == 3
+        assert agent.nodes > 0
+    finally:
+        agent.close()
+
+def test_worker_agent_is_shared_by_searches_with_different_budgets(monkeypatch):
+    monkeypatch.setattr(parallel, "_worker_agents", {})
+    kwargs = MinimaxAgent(depth=2, workers=2).search_kwargs
+
+    first = parallel._worker_agent(dict(kwargs, depth=2))
+    second = parallel._worker_agent(dict(kwargs, depth=4, time_limit_ms=500))
+
+    assert second is first and len(parallel._worker_agents) == 1
+    assert (second.depth, second.time_limit_ms) == (4, 500)
+    assert parallel._worker_agent(kwargs).depth == 2
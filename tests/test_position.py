@@ -0,0 +1,93 @@
+import random
+
+import chess
+import chess.polyglot
+import pytest
+
+from chess_ai.core.game import ChessGame
+from chess_ai.agents.minimax_agent import MinimaxAgent
+from chess_ai.search.position import Position
+
+PERFT_POSITIONS = [
+    (chess.STARTING_FEN, 3),
+    ("r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1", 2),  # "Kiwipete"
+    ("8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1", 3),
+    ("r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1", 2),
+    ("rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8", 2),
+]
+
+def perft(board, depth):
+    if depth == 0:
+        return 1
+    nodes = 0
+    for move in list(board.legal_moves):
+        board.push(move)
+        nodes += perft(board, depth - 1)
+        board.pop()
+    return nodes
+
+@pytest.mark.parametrize("fen, depth", PERFT_POSITIONS)
+def test_perft_matches_python_chess(fen, depth):
+    position = Position.from_board(chess.Board(fen))
+
+    assert perft(position, depth) == perft(chess.Board(fen), depth)
+    assert position.fen() == chess.Board(fen).fen()  # everything taken back
+
+def test_moves_keys_and_draws_match_python_chess_through_random_games():
+    rng = random.Random(2024)
+    for _ in range(30):
+        board = chess.Board()
+        position = Position.from_board(board)
+
+        for _ in range(150):
+            moves = sorted(board.legal_moves, key=chess.Move.uci)
+            assert sorted(position.legal_moves, key=chess.Move.uci) == moves
+            assert set(position.generate_legal_captures()) == set(board.generate_legal_captures())
+            assert position.key == chess.polyglot.zobrist_hash(board)
+            assert position.is_check() == board.is_check()
+            assert position.is_repetition(3) == board.is_repetition(3)
+            if not moves or board.is_insufficient_material():
+                break
+            move = rng.choice(moves)
+            board.push(move)
+            position.push(move)
+
+        while board.move_stack:
+            board.pop()
+            position.pop()
+            assert position.key == chess.polyglot.zobrist_hash(board)
+
+def test_conversion_keeps_repetition_history():
+    board = chess.Board()
+    for uci in ["g1f3", "g8f6", "f3g1", "f6g8", "g1f3", "g8f6", "f3g1"]:
+        board.push_uci(uci)
+    position = Position.from_board(board)
+
+    position.push(chess.Move.from_uci("f6g8"))
+    assert position.is_repetition(3)
+
+def test_agent_plays_the_same_move_on_either_board():
+    board = chess.Board("r1bqkb1r/pppp1ppp/2n2n2/4p3/2B1P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 4 4")
+    lean = MinimaxAgent(depth=3)
+    full = MinimaxAgent(depth=3, use_bitboard_position=False)
+
+    assert lean.choose_move(ChessGame(board=board.copy())) == full.choose_move(ChessGame(board=board.copy()))
+    assert lean.nodes == full.nodes
+
+def test_random_legal_move_is_legal_and_none_when_game_is_over():
+    rng = random.Random(7)
+    board = chess.Board()
+    position = Position.from_board(board)
+    for _ in range(200):
+        move = position.random_legal_move(rng)
+        if move is None:
+            assert board.is_checkmate() or board.is_stalemate()
+            break
+        assert move in board.legal_moves
+        board.push(move)
+        position.push(move)
+        if board.is_game_over():
+            break
+
+    mated = Position.from_board(chess.Board("rnb1kbnr/pppp1ppp/8/4p3/6Pq/5P2/PPPPP2P/RNBQKBNR w KQkq - 1 3"))
+    assert mated.random_legal_move(rng) is None
@@ -0,0 +1,31 @@
+import chess
+
+from chess_ai.agents.minimax_agent import MinimaxAgent
+
+MIDDLEGAME_FEN = "r1bq1rk1/pp2bppp/2n1pn2/3p4/2PP4/2N1PN2/PP2BPPP/R2QKB1R w KQ - 0 8"
+
+def _search(**kwargs):
+    board = chess.Board(MIDDLEGAME_FEN)
+    agent = MinimaxAgent(depth=4, use_quiescence=True, **kwargs)
+    move, value = agent.iterative_deepening(board, list(board.legal_moves))
+    return agent, move, value
+
+def test_pvs_keeps_the_score_and_searches_fewer_nodes():
+    plain, plain_move, plain_value = _search(use_pvs=False, aspiration_window=None)
+    pvs, pvs_move, pvs_value = _search(use_pvs=True, aspiration_window=None)
+
+    assert pvs_value == plain_value
+    assert pvs_move == plain_move
+    assert pvs.nodes + pvs.qnodes < plain.nodes + plain.qnodes
+
+    stats = pvs.research_stats()
+    assert stats["null_window_searches"] > 0
+    assert 0 <= stats["pvs_research_rate"] < 1
+    assert plain.research_stats()["null_window_searches"] == 0
+
+def test_failed_aspiration_window_is_re_searched_to_the_same_score():
+    _, _, full_value = _search(aspiration_window=None, evaluator="tapered")
+    narrow, _, narrow_value = _search(aspiration_window=1, evaluator="tapered")
+
+    assert narrow_value == full_value
+    assert narrow.research_stats()["aspiration_researches"] > 0
@@ -0,0 +1,40 @@
+import chess
+
+from chess_ai.core.game import ChessGame
+from chess_ai.agents.minimax_agent import MinimaxAgent, SearchContext, quiescence
+from chess_ai.search.see import see
+
+# White queen can grab a d5 pawn that the e6 pawn defends
+POISONED_PAWN_FEN = "4k3/8/4p3/3p4/8/8/8/3QK3 w - - 0 1"
+
+def test_see_scores_winning_and_losing_captures():
+    board = chess.Board(POISONED_PAWN_FEN)
+    assert see(board, chess.Move.from_uci("d1d5")) == 100 - 900
+
+    # Undefended pawn: a clean win
+    board = chess.Board("4k3/8/8/3p4/8/8/8/3QK3 w - - 0 1")
+    assert see(board, chess.Move.from_uci("d1d5")) == 100
+
+def test_see_counts_xray_attackers():
+    # Rooks doubled on the d-file against a single defender
+    board = chess.Board("3rk3/8/8/3p4/8/8/3R4/3RK3 w - - 0 1")
+    assert see(board, chess.Move.from_uci("d2d5")) == 100
+
+def test_quiescence_resolves_capture_sequence():
+    board = chess.Board(POISONED_PAWN_FEN)
+    # Side to move (White) is up a queen for two pawns; the pawn grab doesn't change that
+    ctx = SearchContext.for_board(board)
+    score = quiescence(board, -10**6, 10**6, ctx)
+
+    assert score == 900 - 200
+    assert ctx.qnodes > 0
+    assert ctx.nodes == 0
+
+def test_quiescence_avoids_horizon_blunder():
+    naive = MinimaxAgent(depth=1, use_quiescence=False)
+    careful = MinimaxAgent(depth=1, use_quiescence=True)
+
+    grab = chess.Move.from_uci("d1d5")
+    assert naive.choose_move(ChessGame(chess.Board(POISONED_PAWN_FEN))) == grab
+    assert careful.choose_move(ChessGame(chess.Board(POISONED_PAWN_FEN))) != grab
+    assert careful.qnodes > 0
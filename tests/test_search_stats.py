@@ -0,0 +1,45 @@
+import json
+import logging
+
+import chess
+
+from chess_ai.core.game import ChessGame
+from chess_ai.agents.minimax_agent import MinimaxAgent
+
+MIDDLEGAME_FEN = "r1bqkb1r/pppp1ppp/2n2n2/4p3/2B1P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 4 4"
+
+def test_search_returns_move_with_stats_and_prints_nothing(capsys):
+    agent = MinimaxAgent(depth=3)
+    game = ChessGame(board=chess.Board(MIDDLEGAME_FEN))
+
+    move, stats = agent.search(game)
+
+    assert capsys.readouterr().out == ""
+    assert move in game.legal_moves()
+    assert stats.pv[0] == move
+    assert stats.depth == 3
+    assert stats.nodes == agent.nodes > 0
+    assert stats.elapsed_ms > 0 and stats.nps > 0
+    assert 0.0 < stats.tt_hit_rate <= 1.0
+    assert 0.0 < stats.first_move_cutoff_rate <= 1.0
+    assert agent.last_stats is stats
+    json.dumps(stats.as_dict())
+
+def test_choose_move_reports_stats_to_callback_and_logger(caplog):
+    seen = []
+    agent = MinimaxAgent(depth=2, on_search=seen.append)
+
+    with caplog.at_level(logging.DEBUG, logger="chess_ai.agents.minimax_agent"):
+        move = agent.choose_move(ChessGame())
+
+    assert len(seen) == 1 and seen[0].pv[0] == move
+    assert any("search" in record.getMessage() for record in caplog.records)
+
+def test_search_without_legal_moves_returns_none_and_stats():
+    mated = chess.Board("rnb1kbnr/pppp1ppp/8/4p3/6Pq/5P2/PPPPP2P/RNBQKBNR w KQkq - 1 3")
+    agent = MinimaxAgent(depth=2)
+
+    assert agent.choose_move(ChessGame(board=mated.copy())) is None
+    move, stats = agent.search(ChessGame(board=mated))
+    assert move is None
+    assert stats.depth == 0 and stats.pv == ()
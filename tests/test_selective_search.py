@@ -0,0 +1,42 @@
+import chess
+import pytest
+
+from chess_ai.core.game import ChessGame
+from chess_ai.agents.minimax_agent import MinimaxAgent
+
+MIDDLEGAME_FEN = "r1bq1rk1/pp2bppp/2n1pn2/3p4/2PP4/2N1PN2/PP2BPPP/R2QKB1R w KQ - 0 8"
+ALL_OFF = {"use_null_move": False, "use_lmr": False, "use_futility": False}
+
+def _nodes(**kwargs):
+    agent = MinimaxAgent(depth=4, use_quiescence=True, evaluator="tapered", **kwargs)
+    move = agent.choose_move(ChessGame(board=chess.Board(MIDDLEGAME_FEN)))
+    return agent, move
+
+@pytest.mark.parametrize("technique, counter", [
+    ("use_null_move", "null_move_cutoffs"),
+    ("use_lmr", "reduced_searches"),
+    ("use_futility", "futility_prunes"),
+])
+def test_each_technique_can_be_toggled_and_cuts_nodes(technique, counter):
+    baseline, _ = _nodes(**ALL_OFF)
+    agent, move = _nodes(**{**ALL_OFF, technique: True})
+
+    stats = {**agent.research_stats(), **agent.pruning_stats()}
+    assert stats[counter] > 0
+    assert agent.nodes + agent.qnodes < baseline.nodes + baseline.qnodes
+    assert move in chess.Board(MIDDLEGAME_FEN).legal_moves
+
+def test_no_null_move_pruning_with_only_king_and_pawns():
+    # King and pawn ending: the side to move may be in zugzwang
+    board = chess.Board("8/8/8/2k5/2P5/2K5/8/8 w - - 0 1")
+    agent = MinimaxAgent(depth=6)
+
+    agent.choose_move(ChessGame(board=board))
+
+    assert agent.pruning_stats()["null_move_cutoffs"] == 0
+
+def test_selective_search_still_finds_mate():
+    board = chess.Board("6k1/5ppp/8/8/8/8/5PPP/R5K1 w - - 0 1")
+    agent = MinimaxAgent(depth=5, use_quiescence=True)
+
+    assert agent.choose_move(ChessGame(board=board)) == chess.Move.from_uci("a1a8")
@@ -0,0 +1,103 @@
+import threading
+import time
+
+import chess
+import pytest
+
+from chess_ai.core.game import ChessGame
+from chess_ai.web import app as web_app
+from chess_ai.web.sqlite_store import SQLiteGameStore
+
+def make_game(*ucis):
+    game = ChessGame()
+    for uci in ucis:
+        game.apply_move(chess.Move.from_uci(uci))
+    return game
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "games.db")
+
+def test_games_written_by_one_store_are_read_by_another(path):
+    first, second = SQLiteGameStore(path), SQLiteGameStore(path)
+    try:
+        first.put("g", make_game("e2e4", "e7e5"))
+        game = second.get("g")
+        assert [m.uci() for m in game.board.move_stack] == ["e2e4", "e7e5"]
+        assert second.get("missing") is None
+
+        second.delete("g")
+        assert first.get("g") is None
+    finally:
+        first.close()
+        second.close()
+
+def test_database_uses_wal_journal(path):
+    store = SQLiteGameStore(path)
+    try:
+        with store._connection() as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    finally:
+        store.close()
+
+def test_concurrent_puts_are_committed_in_one_batch(path):
+    store = SQLiteGameStore(path, pool_size=2)
+    try:
+        store._write_lock.acquire()  # a commit is in progress
+        threads = [
+            threading.Thread(target=store.put, args=(f"g{i}", make_game("e2e4")))
+            for i in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        while len(store._pending) < 8:
+            time.sleep(0.001)
+        assert store.get("g3") is not None  # pending writes are visible here already
+        store._write_lock.release()
+        for thread in threads:
+            thread.join()
+
+        stats = store.stats()
+        assert stats["writes"] == 8 and stats["commits"] == 1
+        assert stats["sessions"] == 8
+        assert stats["connections"] <= 2
+    finally:
+        store.close()
+
+def test_sweep_deletes_expired_and_oldest_games(path):
+    now = [0.0]
+    store = SQLiteGameStore(path, max_sessions=2, ttl=100, sweep_every=1, clock=lambda: now[0])
+    try:
+        store.put("expired", make_game())
+        now[0] = 150
+        store.put("old", make_game())
+        now[0] = 160
+        store.put("mid", make_game())
+        assert store.get("expired") is None
+        now[0] = 170
+        store.put("new", make_game())
+
+        stats = store.stats()
+        assert stats["sessions"] == 2
+        assert stats["evictions"] == {"ttl": 1, "capacity": 1}
+        assert store.get("old") is None and store.get("new") is not None
+    finally:
+        store.close()
+
+def test_web_app_games_live_in_the_shared_store(monkeypatch, path):
+    store = SQLiteGameStore(path)
+    monkeypatch.setattr(web_app, "games", store)
+    monkeypatch.setattr(web_app, "ACCESS_KEY", None)
+    web_app.app.config["TESTING"] = True
+    client = web_app.app.test_client()
+    try:
+        job = client.post("/move", json={"move": "e2e4"}).get_json()
+        assert client.get(f"{job['poll']}?wait=5").get_json()["status"] == "done"
+
+        with client.session_transaction() as sess:
+            game_id = sess["game_id"]
+        other_process = SQLiteGameStore(path)
+        assert len(other_process.get(game_id).board.move_stack) == 2
+        other_process.close()
+    finally:
+        store.close()
@@ -0,0 +1,102 @@
+import chess
+import pytest
+
+from chess_ai.core.game import ChessGame
+from chess_ai.agents.minimax_agent import MinimaxAgent
+from chess_ai.search.tablebase import TB_WIN, TablebaseProber
+
+VALUES = {chess.PAWN: 1, chess.KNIGHT: 3, chess.BISHOP: 3, chess.ROOK: 5, chess.QUEEN: 9}
+
+class MaterialTablebase:
+    """Stand-in for chess.syzygy.Tablebase: whoever has more material wins."""
+
+    def __init__(self, *names):
+        self.wdl = dict.fromkeys(names)
+        self.probes = 0
+
+    def _balance(self, board):
+        return sum(
+            VALUES.get(piece.piece_type, 0) * (1 if piece.color == board.turn else -1)
+            for piece in board.piece_map().values()
+        )
+
+    def probe_wdl(self, board):
+        self.probes += 1
+        balance = self._balance(board)
+        return 2 if balance > 0 else -2 if balance < 0 else 0
+
+    def probe_dtz(self, board):
+        return {2: 5, -2: -5, 0: 0}[self.probe_wdl(board)]
+
+    def close(self):
+        pass
+
+def test_prober_respects_piece_threshold_and_caches_results():
+    prober = TablebaseProber(MaterialTablebase("KQvK", "KRvKN"), cache_size=2)
+    assert prober.max_pieces == 4
+
+    kqk = chess.Board("8/8/8/3k4/8/8/3Q4/4K3 w - - 0 1")
+    assert prober.can_probe(kqk)
+    assert not prober.can_probe(chess.Board())
+    assert not prober.can_probe(chess.Board("4k3/8/8/8/8/8/8/R3K3 w Q - 0 1"))  # castling
+
+    assert prober.probe_wdl(kqk) == 2
+    assert prober.probe_wdl(kqk) == 2
+    assert prober.stats()["hits"] == 1 and prober.tablebase.probes == 1
+
+    for fen in ("8/8/8/3k4/8/8/3Q4/5K2 w - - 0 1", "8/8/8/3k4/8/8/3Q4/3K4 w - - 0 1"):
+        prober.probe_wdl(chess.Board(fen))
+    prober.probe_wdl(kqk)  # evicted as least recently used
+    assert prober.tablebase.probes == 4
+
+def test_root_move_takes_the_hanging_queen():
+    prober = TablebaseProber(MaterialTablebase("KQvK"))
+    board = chess.Board("8/8/8/8/8/4k3/3Q4/7K b - - 0 1")
+
+    move, wdl = prober.root_move(board)
+
+    assert move == chess.Move.from_uci("e3d2")
+    assert wdl == 0
+
+def test_agent_plays_tablebase_root_move_without_searching():
+    prober = TablebaseProber(MaterialTablebase("KQvK"))
+    agent = MinimaxAgent(depth=3, tablebase=prober)
+
+    move, stats = agent.search(ChessGame(board=chess.Board("8/8/8/8/8/4k3/3Q4/7K b - - 0 1")))
+
+    assert move == chess.Move.from_uci("e3d2")
+    assert stats.tablebase and stats.nodes == 0
+
+def test_search_probes_positions_after_captures():
+    prober = TablebaseProber(MaterialTablebase("KQvK", "KRvK", "KQvKR"), max_pieces=4)
+    agent = MinimaxAgent(depth=2, tablebase=prober)
+    board = chess.Board("3rk3/8/8/8/8/8/8/K2QR3 w - - 0 1")  # five pieces: searched
+
+    move, stats = agent.search(ChessGame(board=board))
+
+    assert not stats.tablebase
+    assert agent.tb_hits > 0
+    assert move == chess.Move.from_uci("d1d8")
+    assert stats.value >= TB_WIN - 2
+
+def test_missing_tables_leave_everything_to_the_search(tmp_path):
+    agent = MinimaxAgent(depth=2, tablebase=str(tmp_path))
+    board = chess.Board("8/8/8/3k4/8/8/3Q4/4K3 w - - 0 1")
+
+    move, stats = agent.search(ChessGame(board=board))
+
+    assert agent.tablebase.max_pieces == 0
+    assert move in board.legal_moves and not stats.tablebase
+
+def test_parallel_search_only_takes_a_tablebase_directory(tmp_path):
+    prober = TablebaseProber(MaterialTablebase("KQvK"))
+    with pytest.raises(ValueError):
+        MinimaxAgent(depth=2, workers=2, tablebase=prober)
+
+    agent = MinimaxAgent(depth=2, workers=2, tablebase=tmp_path)
+    try:
+        assert agent.search_kwargs["tablebase"] == str(tmp_path)
+        board = chess.Board("8/8/8/3k4/8/8/3Q4/4K3 w - - 0 1")
+        assert agent.choose_move(ChessGame(board=board)) in board.legal_moves
+    finally:
+        agent.close()
@@ -0,0 +1,59 @@
+import chess
+
+from chess_ai.core.game import ChessGame
+from chess_ai.agents.minimax_agent import MinimaxAgent
+from chess_ai.search.transposition import (
+    EXACT,
+    LOWER,
+    TranspositionTable,
+    position_key,
+)
+
+def test_store_then_probe_roundtrip():
+    tt = TranspositionTable(size=64)
+    board = chess.Board()
+    key = position_key(board)
+    move = chess.Move.from_uci("e2e4")
+
+    assert tt.probe(key) is None
+    tt.store(key, 3, EXACT, 25, move)
+
+    entry = tt.probe(key)
+    assert entry is not None
+    assert (entry.depth, entry.flag, entry.value, entry.move) == (3, EXACT, 25, move)
+    assert tt.hits == 1
+    assert tt.misses == 1
+
+def test_depth_preferred_slot_keeps_deeper_entry():
+    """Two keys in the same bucket: the shallow one goes to the always-replace slot."""
+    tt = TranspositionTable(size=2)  # single bucket, every key collides
+    tt.store(1, 5, EXACT, 10, None)
+    tt.store(2, 1, LOWER, 20, None)
+    tt.store(3, 2, LOWER, 30, None)  # evicts key 2, not the deep key 1
+
+    assert tt.probe(1).depth == 5
+    assert tt.probe(3).value == 30
+    assert tt.probe(2) is None
+    assert tt.collisions == 1
+
+def test_minimax_with_tt_reports_hits_and_stays_legal():
+    game = ChessGame()
+    agent = MinimaxAgent(depth=4)
+
+    move = agent.choose_move(game)
+
+    assert move in game.legal_moves()
+    stats = agent.tt_stats()
+    assert stats["stores"] > 0
+    assert stats["hits"] > 0
+    assert stats["used"] <= stats["capacity"]
+
+def test_minimax_without_tt_has_no_stats():
+    agent = MinimaxAgent(depth=1, use_transposition_table=False)
+    fen = "8/8/8/8/8/2p5/8/K1Q5 w - - 0 1"
+    board = chess.Board(fen)
+
+    move = agent.choose_move(ChessGame(board=board))
+
+    assert board.is_capture(move)
+    assert agent.tt_stats() == {}
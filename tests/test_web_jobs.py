@@ -0,0 +1,165 @@
+import threading
+
+import chess
+import pytest
+
+from chess_ai.core.game import ChessGame
+from chess_ai.core.player import Player
+from chess_ai.agents.pool import AgentConfig, AgentPool
+from chess_ai.web import app as web_app
+from chess_ai.web.jobs import DONE, FAILED, MoveJobs, QueueFull
+
+RANDOM = AgentConfig("random")
+
+class BlockingAgent(Player):
+    """Plays the first legal move once 'release' is set."""
+
+    def __init__(self, release: threading.Event):
+        self.release = release
+
+    def choose_move(self, game):
+        self.release.wait(5)
+        return game.legal_moves()[0]
+
+class BrokenAgent(Player):
+    def choose_move(self, game):
+        raise RuntimeError("no move for you")
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(web_app, "ACCESS_KEY", None)
+    web_app.app.config["TESTING"] = True
+    return web_app.app.test_client()
+
+@pytest.fixture
+def blocked_jobs(monkeypatch):
+    release = threading.Event()
+    jobs = MoveJobs(AgentPool(lambda name: BlockingAgent(release)), workers=1, max_queue=0)
+    monkeypatch.setattr(web_app, "jobs", jobs)
+    yield release
+    release.set()
+    jobs.close()
+
+def test_job_runs_off_thread_and_reports_its_move():
+    jobs = MoveJobs(AgentPool(), workers=2)
+    played = []
+    try:
+        game = ChessGame()
+        job = jobs.wait(jobs.submit(game, RANDOM, on_move=lambda job, move: played.append(move)).id, 5)
+
+        assert job.status == DONE
+        assert job.move in game.legal_moves()
+        assert played == [job.move]
+        assert game.board.move_stack == []  # the agent worked on a copy
+        assert jobs.depth == 0
+    finally:
+        jobs.close()
+
+def test_queue_depth_limit_rejects_with_queue_full():
+    release = threading.Event()
+    jobs = MoveJobs(AgentPool(lambda name: BlockingAgent(release)), workers=1, max_queue=1)
+    try:
+        first = jobs.submit(ChessGame(), RANDOM)
+        second = jobs.submit(ChessGame(), RANDOM)
+        with pytest.raises(QueueFull):
+            jobs.submit(ChessGame(), RANDOM)
+        assert jobs.stats()["rejected"] == 1
+
+        release.set()
+        assert first.wait(5) and second.wait(5)
+        jobs.submit(ChessGame(), RANDOM).wait(5)
+        assert jobs.depth == 0
+    finally:
+        release.set()
+        jobs.close()
+
+def test_failing_agent_marks_the_job_failed():
+    jobs = MoveJobs(AgentPool(lambda name: BrokenAgent()), workers=1)
+    try:
+        job = jobs.submit(ChessGame(), RANDOM)
+        job.wait(5)
+        assert job.status == FAILED
+        assert job.error == "no move for you"
+        assert jobs.depth == 0 and jobs.stats()["failed"] == 1
+    finally:
+        jobs.close()
+
+def test_json_move_is_accepted_and_reply_can_be_long_polled(client):
+    resp = client.post("/move", json={"move": "e2e4"})
+    assert resp.status_code == 202
+    job = resp.get_json()
+    assert job["status"] in ("queued", "running", "done")
+
+    resp = client.get(f"{job['poll']}?wait=5")
+    reply = resp.get_json()
+    assert reply["status"] == "done"
+
+    board = chess.Board()
+    board.push_uci("e2e4")
+    board.push_uci(reply["move"])
+    assert reply["fen"] == board.fen()
+
+def test_html_move_redirects_and_page_polls_while_thinking(client, blocked_jobs):
+    resp = client.post("/move", data={"move": "e2e4"})
+    assert resp.status_code in (301, 302)
+
+    page = client.get("/").data
+    assert b"Agent is thinking" in page
+    assert b"/move/" in page
+
+    resp = client.post("/move", data={"move": "d2d4"})
+    assert resp.status_code == 409
+
+def test_full_queue_answers_503_and_takes_the_move_back(client, blocked_jobs):
+    first, second = client, web_app.app.test_client()
+
+    assert first.post("/move", json={"move": "e2e4"}).status_code == 202
+    resp = second.post("/move", json={"move": "e2e4"})
+
+    assert resp.status_code == 503
+    assert resp.headers["Retry-After"] == "1"
+    assert resp.get_json()["fen"] == chess.STARTING_FEN
+
+def test_unknown_or_foreign_job_is_404(client):
+    assert client.get("/move/nope").status_code == 404
+
+    job_id = client.post("/move", json={"move": "e2e4"}).get_json()["job_id"]
+    other = web_app.app.test_client()
+    assert other.get(f"/move/{job_id}").status_code == 404
+
+def test_failed_agent_move_takes_the_players_move_back(client, monkeypatch):
+    jobs = MoveJobs(AgentPool(lambda name: BrokenAgent()), workers=1)
+    monkeypatch.setattr(web_app, "jobs", jobs)
+    try:
+        job_id = client.post("/move", json={"move": "e2e4"}).get_json()["job_id"]
+        assert client.get(f"/move/{job_id}?wait=5").get_json()["status"] == "failed"
+
+        page = client.get("/").data
+        assert b"no move for you" in page
+        assert b"Agent is thinking" not in page
+
+        monkeypatch.setattr(web_app, "jobs", MoveJobs(AgentPool(), workers=1))
+        assert client.post("/move", json={"move": "e2e4"}).status_code == 202
+    finally:
+        jobs.close()
+        web_app.jobs.close()
+
+def test_lost_agent_move_is_queued_again_after_the_timeout(client, monkeypatch, blocked_jobs):
+    assert client.post("/move", json={"move": "e2e4"}).status_code == 202
+
+    # A restart: the job is gone but the game still waits for the agent
+    jobs = MoveJobs(AgentPool(), workers=1)
+    monkeypatch.setattr(web_app, "jobs", jobs)
+    try:
+        assert client.post("/move", json={"move": "d2d4"}).status_code == 409
+
+        monkeypatch.setattr(web_app, "AGENT_JOB_TIMEOUT", 0)
+        resp = client.post("/move", json={"move": "d2d4"})
+        assert resp.status_code == 409
+        job_id = resp.get_json()["job_id"]
+
+        reply = client.get(f"/move/{job_id}?wait=5").get_json()
+        assert reply["status"] == "done"
+        assert client.post("/move", json={"move": "d2d4"}).status_code == 202
+    finally:
+        jobs.close()